@@ -0,0 +1,83 @@
+# answer_templates.py
+# Jawaban template (tanpa AI) untuk pertanyaan harga RAB, material interior, dan paket
+
+import os
+import zlib
+from typing import Mapping
+
+# Mode jawaban untuk intent harga/paket:
+#   llm             - data diformat lalu dirangkai ulang oleh AI (default)
+#   template        - langsung jawab dengan template, tanpa AI
+#   template_polish - jawab dengan template dulu, lalu AI merapikan di background
+ANSWER_MODES = ('llm', 'template', 'template_polish')
+DEFAULT_ANSWER_MODE = os.getenv("PRICE_ANSWER_MODE", "llm")
+
+# Intent yang bisa dijawab dengan template
+TEMPLATE_INTENTS = ('rab_query', 'interior_price', 'package')
+
+# Kalimat pembuka per intent ({topic} = keyword yang ditanyakan)
+INTROS = {
+    'rab_query': [
+        "Berikut estimasi harga {topic} berdasarkan data RAB proyek kami 👇",
+        "Untuk {topic}, ini kisaran harga dari RAB proyek yang pernah kami kerjakan:",
+        "Siap! Ini data harga {topic} dari RAB kami:",
+    ],
+    'interior_price': [
+        "Berikut kisaran harga pasaran {topic} 👇",
+        "Untuk {topic}, harga di pasaran saat ini kurang lebih seperti ini:",
+        "Ini gambaran harga {topic} yang bisa jadi acuan:",
+    ],
+    'package': [
+        "Berikut pilihan paket untuk {topic} 👇",
+        "Untuk {topic}, kami punya beberapa pilihan paket:",
+        "Ini estimasi paket {topic} sesuai tingkat finishing:",
+    ],
+}
+
+# Topik default jika keyword kosong
+DEFAULT_TOPICS = {
+    'rab_query': 'pekerjaan tersebut',
+    'interior_price': 'material tersebut',
+    'package': 'ruangan tersebut',
+}
+
+# Penutup + ajakan konsultasi
+CLOSINGS = [
+    "Harga final tergantung spesifikasi, volume, dan lokasi proyek. Mau kami bantu hitung lebih "
+    "detail? Konsultasi GRATIS via WhatsApp {whatsapp} ({whatsapp_link}) 😊",
+    "Kalau sudah ada ukuran atau gambar, tim kami bisa bantu buatkan penawaran yang lebih akurat. "
+    "Hubungi WhatsApp {whatsapp} ({whatsapp_link}) untuk konsultasi GRATIS 🙌",
+    "Supaya estimasinya pas dengan kebutuhan dan budget Anda, yuk konsultasi GRATIS dengan tim "
+    "PT Intervisual via WhatsApp {whatsapp} ({whatsapp_link}) 😊",
+]
+
+
+def render_price_answer(intent: str, keywords, tool_response: str, message: str,
+                        company_info: Mapping) -> str:
+    """
+    Rangkai jawaban harga dari data yang sudah diformat
+
+    Variasi kalimat dipilih dari hash pesan, jadi pertanyaan yang sama selalu
+    dapat jawaban yang sama, sedangkan pertanyaan berbeda terdengar lebih natural.
+
+    Args:
+        intent: 'rab_query', 'interior_price', atau 'package'
+        keywords: Keyword hasil deteksi intent
+        tool_response: Output format_rab_response / format_price_response / format_package_response
+        message: Pesan user
+        company_info: Data perusahaan (untuk kontak WhatsApp)
+
+    Returns:
+        Jawaban lengkap
+    """
+    variant = zlib.crc32(' '.join(message.lower().split()).encode('utf-8'))
+    intros = INTROS[intent]
+    topic = ' '.join(keywords) if keywords else DEFAULT_TOPICS[intent]
+
+    intro = intros[variant % len(intros)].format(topic=topic)
+    closing = CLOSINGS[(variant // len(intros)) % len(CLOSINGS)].format(
+        whatsapp=company_info['kontak']['whatsapp'],
+        whatsapp_link=company_info['kontak']['whatsapp_link'],
+    )
+
+    return f"{intro}\n\n{tool_response}\n\n{closing}"
@@ -220,8 +220,8 @@ if 'chatbot' not in st.session_state:
         if api_key:
             st.session_state.chatbot = ChatbotIntervisualAI(api_key)
             st.session_state.api_key_set = True
-            # Welcome message
-            welcome_msg = st.session_state.chatbot.chat("Hai, perkenalkan dirimu singkat dan layanan PT Intervisual")
+            # Welcome message (di-generate sekali per proses, tidak panggil Groq per sesi)
+            welcome_msg = st.session_state.chatbot.welcome_message()
             st.session_state.messages = [{"role": "assistant", "content": welcome_msg}]
         else:
             st.session_state.chatbot = None
@@ -285,7 +285,7 @@ with st.sidebar:
                     st.session_state.api_key_set = True
                     
                     # Welcome message
-                    welcome_msg = st.session_state.chatbot.chat("Hai, perkenalkan dirimu singkat dan layanan PT Intervisual")
+                    welcome_msg = st.session_state.chatbot.welcome_message()
                     st.session_state.messages = [{
                         "role": "assistant",
                         "content": welcome_msg
@@ -363,7 +363,7 @@ with st.sidebar:
     if st.session_state.api_key_set and st.button("🔄 Mulai Baru"):
         st.session_state.messages = []
         st.session_state.chatbot.clear_history()
-        welcome_msg = st.session_state.chatbot.chat("Hai, perkenalkan dirimu singkat")
+        welcome_msg = st.session_state.chatbot.welcome_message()
         st.session_state.messages.append({
             "role": "assistant",
             "content": welcome_msg
@@ -380,9 +380,12 @@ st.markdown("""
 
 # Display chat messages
 if st.session_state.api_key_set:
+    # Jawaban template harga yang sudah dirapikan AI di background (PRICE_ANSWER_MODE=template_polish)
+    st.session_state.chatbot.apply_polished()
+    polished = st.session_state.chatbot.polished_replies
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+            st.markdown(polished.get(message["content"], message["content"]))
     
     # Footer
     st.markdown("""
@@ -403,13 +406,9 @@ if st.session_state.api_key_set:
             "content": prompt
         })
         
-        # Get bot response dengan loading indicator
-        with st.spinner("🤖 AI sedang berpikir..."):
-            response = st.session_state.chatbot.chat(prompt)
-        
-        # Display assistant response
+        # Display assistant response (streaming, token tampil begitu diterima)
         with st.chat_message("assistant"):
-            st.markdown(response)
+            response = st.write_stream(st.session_state.chatbot.chat_stream(prompt))
         
         # Add to history
         st.session_state.messages.append({
@@ -0,0 +1,354 @@
+# benchmark.py
+# Benchmark end-to-end chatbot engine tanpa API key (pakai fake Groq client)
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+
+from chatbot_engine_ai import ChatbotIntervisualAI
+from metrics import ChatMetrics
+from response_cache import ResponseCache
+from semantic_cache import SemanticCache
+
+# Folder default untuk hasil benchmark
+DEFAULT_OUTPUT_DIR = "benchmark_results"
+
+# Pertanyaan customer yang realistis (campuran intent, termasuk off-topic)
+QUERY_CORPUS = [
+    # RAB / konstruksi
+    "Berapa harga plafon gypsum per meter?",
+    "Harga pasang bata ringan berapa ya?",
+    "Biaya pondasi rumah 2 lantai kira-kira berapa?",
+    "Harga pekerjaan cat dinding per m2?",
+    "Estimasi biaya pasang keramik lantai 40 m2",
+    "Berapa biaya waterproofing dak beton?",
+    "Harga pemasangan atap baja ringan",
+    "RAB pekerjaan instalasi listrik rumah",
+    # Material interior
+    "Harga granit 60x60 per meter berapa?",
+    "Granit permeter berapa ya",
+    "Harga marmer untuk lantai ruang tamu",
+    "Kitchen set per meter harganya berapa?",
+    "Harga wallpaper dinding kamar",
+    "Berapa harga parket kayu?",
+    "Harga vinyl lantai yang bagus",
+    "Lemari pakaian custom harganya berapa?",
+    # Paket
+    "Paket desain interior kamar tidur berapa?",
+    "Ada paket ruang tamu minimalis?",
+    "Paket dapur lengkap dengan kitchen set",
+    "Paket kamar mandi harganya berapa?",
+    # Info perusahaan
+    "Dimana alamat kantor Intervisual?",
+    "Nomor WA berapa?",
+    "Layanan apa saja?",
+    "Ada promo bulan ini?",
+    "Email Intervisual apa?",
+    # Umum / konsultasi
+    "Halo, apa layanan PT Intervisual?",
+    "Saya mau renovasi rumah, budget minimal berapa?",
+    "Beda granit sama marmer apa ya?",
+    "Berapa lama pengerjaan renovasi rumah 2 lantai?",
+    "Bagaimana cara konsultasi gratis?",
+    "Rekomendasi desain interior rumah minimalis",
+    "Bisa bantu desain kantor kecil?",
+    # Off-topic
+    "Resep nasi goreng yang enak",
+    "Siapa presiden Indonesia sekarang?",
+    "Rekomendasi film horor terbaru",
+    "Cara main gitar untuk pemula",
+]
+
+# Kalimat untuk menyusun response palsu
+_FAKE_WORDS = (
+    "Terima kasih atas pertanyaannya. Untuk pekerjaan tersebut kisaran harganya "
+    "bergantung pada material, luas area, dan tingkat kesulitan. Tim kami siap "
+    "membantu survey dan konsultasi gratis supaya estimasinya lebih akurat."
+).split()
+
+
+class _FakeCompletions:
+    """Pengganti client.chat.completions milik Groq"""
+
+    def __init__(self, client: 'FakeGroqClient'):
+        self._client = client
+
+    def create(self, messages, model, stream=False, **kwargs):
+        client = self._client
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        completion_tokens = client.completion_tokens
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                total_tokens=prompt_tokens + completion_tokens)
+        words = [_FAKE_WORDS[i % len(_FAKE_WORDS)] for i in range(completion_tokens)]
+
+        with client.lock:
+            client.calls += 1
+
+        if stream:
+            return self._stream(words, usage)
+
+        time.sleep(client.latency + completion_tokens / client.tokens_per_sec)
+        message = SimpleNamespace(content=" ".join(words))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    def _stream(self, words: List[str], usage):
+        client = self._client
+        time.sleep(client.latency)
+        for word in words:
+            time.sleep(1.0 / client.tokens_per_sec)
+            delta = SimpleNamespace(content=word + " ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeGroqClient:
+    """
+    Fake Groq client dengan latency dan kecepatan token yang bisa diatur
+
+    Args:
+        latency: Waktu sampai token pertama (detik)
+        tokens_per_sec: Kecepatan generate token
+        completion_tokens: Jumlah token per response
+    """
+
+    def __init__(self, latency: float = 0.3, tokens_per_sec: float = 250.0,
+                 completion_tokens: int = 120):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self))
+
+
+class _RecordingMetrics(ChatMetrics):
+    """ChatMetrics yang juga menyimpan sampel mentah untuk percentile yang akurat"""
+
+    def __init__(self):
+        super().__init__(enabled=True)
+        self.samples: Dict[str, List[float]] = {}
+
+    def observe_stage(self, stage: str, seconds: float):
+        super().observe_stage(stage, seconds)
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+
+def _percentiles(values: List[float]) -> Dict:
+    """p50/p90/p99/max dalam milidetik"""
+    if not values:
+        return {}
+    ms = np.asarray(values) * 1000.0
+    return {
+        'count': len(values),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def _git_commit() -> str:
+    """Commit git saat ini (kosong jika bukan git repo)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_benchmark(turns: int = 200, sessions: int = 10, concurrency: int = 1,
+                  latency: float = 0.3, tokens_per_sec: float = 250.0,
+                  completion_tokens: int = 120, stream: bool = False,
+                  use_cache: bool = False, base_url: str = None) -> Dict:
+    """
+    Jalankan corpus pertanyaan lewat ChatbotIntervisualAI dengan fake Groq client
+
+    Args:
+        turns: Jumlah total giliran chat
+        sessions: Jumlah sesi (masing-masing punya history sendiri)
+        concurrency: Jumlah thread yang memproses sesi bersamaan
+        latency: Latency fake Groq sampai token pertama (detik)
+        tokens_per_sec: Kecepatan token fake Groq
+        completion_tokens: Jumlah token per response fake Groq
+        stream: Pakai chat_stream() alih-alih chat()
+        use_cache: Aktifkan response cache & semantic cache (instance baru per run)
+        base_url: Pakai Groq SDK asli ke endpoint ini (mis. groq_stub_server.py)
+                  alih-alih fake client in-process
+
+    Returns:
+        Hasil benchmark (siap disimpan sebagai JSON)
+    """
+    client = None if base_url else FakeGroqClient(latency, tokens_per_sec, completion_tokens)
+    metrics = _RecordingMetrics()
+
+    tracemalloc.start()
+
+    def make_bot():
+        return ChatbotIntervisualAI(
+            groq_api_key="benchmark",
+            client=client,
+            base_url=base_url,
+            metrics=metrics,
+            response_cache=ResponseCache(disk_dir=None) if use_cache else None,
+            use_response_cache=use_cache,
+            semantic_cache=SemanticCache() if use_cache else None,
+            use_semantic_cache=use_cache,
+        )
+
+    bots = [make_bot() for _ in range(sessions)]
+
+    # Setelah setup (knowledge base sudah ter-load), ukur pertumbuhan memory
+    memory_start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    # Giliran dibagi ke sesi secara round-robin, urutan per sesi tetap
+    plan = [[] for _ in range(sessions)]
+    for i in range(turns):
+        plan[i % sessions].append(QUERY_CORPUS[i % len(QUERY_CORPUS)])
+
+    turn_latencies: List[float] = []
+    lock = threading.Lock()
+
+    def run_session(index: int):
+        bot = bots[index]
+        local = []
+        for question in plan[index]:
+            start = time.perf_counter()
+            if stream:
+                "".join(bot.chat_stream(question))
+            else:
+                bot.chat(question)
+            local.append(time.perf_counter() - start)
+        with lock:
+            turn_latencies.extend(local)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run_session, range(sessions)))
+    wall = time.perf_counter() - wall_start
+
+    memory_end, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    snapshot = metrics.snapshot()
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'config': {
+            'turns': turns,
+            'sessions': sessions,
+            'concurrency': concurrency,
+            'latency': latency,
+            'tokens_per_sec': tokens_per_sec,
+            'completion_tokens': completion_tokens,
+            'stream': stream,
+            'use_cache': use_cache,
+            'base_url': base_url,
+        },
+        'wall_seconds': wall,
+        'turns_per_sec': turns / wall if wall else 0.0,
+        'llm_calls': sum(t['count'] for t in snapshot['turns'] if t['source'] == 'llm'),
+        'turn_latency': _percentiles(turn_latencies),
+        'stages': {stage: _percentiles(values) for stage, values in sorted(metrics.samples.items())},
+        'turns': snapshot['turns'],
+        'token_totals': snapshot['token_totals'],
+        'errors': snapshot['errors'],
+        'memory': {
+            'growth_kb': (memory_end - memory_start) / 1024,
+            'peak_kb': (memory_peak - memory_start) / 1024,
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+    }
+
+
+def print_report(result: Dict, baseline: Dict = None):
+    """Tampilkan ringkasan hasil benchmark (dan perbandingan dengan baseline jika ada)"""
+    print("\n📊 HASIL BENCHMARK")
+    print("=" * 60)
+    print(f"Commit       : {result['commit'] or '-'}")
+    print(f"Turns        : {result['config']['turns']} ({result['config']['sessions']} sesi, "
+          f"concurrency {result['config']['concurrency']})")
+    print(f"Throughput   : {result['turns_per_sec']:.1f} turns/sec")
+    print(f"LLM calls    : {result['llm_calls']}")
+    print(f"Memory growth: {result['memory']['growth_kb']:.1f} KB (peak {result['memory']['peak_kb']:.1f} KB)")
+
+    print("\n⏱️ Latency per tahap (ms)")
+    print(f"{'tahap':<18}{'count':>7}{'p50':>10}{'p90':>10}{'p99':>10}")
+    rows = [('turn', result['turn_latency'])] + list(result['stages'].items())
+    for stage, stats in rows:
+        if stats:
+            print(f"{stage:<18}{stats['count']:>7}{stats['p50_ms']:>10.3f}"
+                  f"{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+    if baseline:
+        print(f"\n🔁 Dibanding baseline ({baseline.get('commit') or '-'})")
+        old, new = baseline['turns_per_sec'], result['turns_per_sec']
+        print(f"Throughput   : {old:.1f} → {new:.1f} turns/sec ({(new - old) / old * 100:+.1f}%)")
+        for stage, stats in result['stages'].items():
+            old_stats = baseline.get('stages', {}).get(stage)
+            if stats and old_stats:
+                print(f"{stage:<18} p50 {old_stats['p50_ms']:.3f} → {stats['p50_ms']:.3f} ms, "
+                      f"p99 {old_stats['p99_ms']:.3f} → {stats['p99_ms']:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chatbot engine dengan fake Groq client")
+    parser.add_argument("--turns", type=int, default=200, help="Jumlah total giliran chat")
+    parser.add_argument("--sessions", type=int, default=10, help="Jumlah sesi")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jumlah thread")
+    parser.add_argument("--latency", type=float, default=0.3, help="Latency fake Groq (detik)")
+    parser.add_argument("--tokens-per-sec", type=float, default=250.0, help="Kecepatan token fake Groq")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="Token per response")
+    parser.add_argument("--stream", action="store_true", help="Pakai chat_stream()")
+    parser.add_argument("--cache", action="store_true", help="Aktifkan response & semantic cache")
+    parser.add_argument("--base-url", help="Endpoint Groq/stub server (default: fake client in-process)")
+    parser.add_argument("--output", help="File JSON hasil (default: benchmark_results/<waktu>_<commit>.json)")
+    parser.add_argument("--compare", help="File JSON hasil run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        turns=args.turns,
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens,
+        stream=args.stream,
+        use_cache=args.cache,
+        base_url=args.base_url,
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_report(result, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d_%H%M%S')}_{result['commit'] or 'nocommit'}.json"
+        output = os.path.join(DEFAULT_OUTPUT_DIR, name)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Hasil disimpan ke {output}")
+
+
+if __name__ == "__main__":
+    main()
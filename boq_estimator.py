@@ -0,0 +1,290 @@
+# boq_estimator.py
+# Estimasi bill of quantities (BoQ): banyak baris item + volume dihitung sekaligus
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from rab_parser import RABParser, format_currency
+from price_scraper import InteriorPriceScraper
+from units import normalize_unit
+
+# Sumber harga, dicoba berurutan untuk setiap item
+SOURCE_RAB = 'rab'
+SOURCE_MARKET = 'pasaran'
+DEFAULT_SOURCES = (SOURCE_RAB, SOURCE_MARKET)
+
+# Jumlah hasil pencarian (item, satuan) yang disimpan
+RESOLVED_CACHE_SIZE = 4096
+
+# Satu baris BoQ: (item, volume, satuan), (item, volume), atau dict dengan key yang sama
+BoQLine = Union[Tuple, Dict]
+
+
+def _normalize_item(item) -> str:
+    return ' '.join(str(item or '').lower().split())
+
+
+def _parse_line(line: BoQLine) -> Tuple[str, float, str]:
+    """Ubah satu baris input jadi (item, volume, satuan)"""
+    if isinstance(line, dict):
+        return str(line.get('item', '')), line.get('volume', 0), line.get('unit') or line.get('satuan') or ''
+    item, volume = line[0], line[1]
+    unit = line[2] if len(line) > 2 else ''
+    return str(item), volume, unit or ''
+
+
+class BoQEstimator:
+    """
+    Estimasi biaya untuk daftar pekerjaan (bill of quantities)
+
+    - Item yang sama (nama + satuan) hanya dicari sekali, berapapun jumlah barisnya
+    - Item dicari di RAB dulu (harga satuan proyek nyata), lalu di database harga pasaran
+    - Harga satuan RAB difilter sesuai satuan yang diminta (tanpa satuan: satuan terbanyak)
+    - Total per baris & grand total (min/rata-rata/maks) dihitung dengan array numpy
+    """
+
+    def __init__(self, rab_parser: RABParser, price_scraper: InteriorPriceScraper,
+                 sources: Sequence[str] = DEFAULT_SOURCES):
+        """
+        Args:
+            rab_parser: Parser RAB yang sudah di-load
+            price_scraper: Database harga pasaran
+            sources: Urutan sumber harga ('rab', 'pasaran')
+        """
+        self.rab_parser = rab_parser
+        self.price_scraper = price_scraper
+        self.sources = tuple(sources)
+
+        # Hasil pencarian per (item, satuan), dipakai ulang antar quote
+        self._resolved: Dict[Tuple[str, str], Optional[Dict]] = {}
+        self._unit_codes = None
+        self._data_size = -1
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        """Reset cache jika data RAB bertambah"""
+        frame = self.rab_parser.get_frame()
+        if len(frame) == self._data_size:
+            return
+
+        with self._lock:
+            if len(frame) != self._data_size:
+                # Satuan baku per baris RAB, dihitung per kategori satuan (bukan per baris)
+                satuan = frame['satuan']
+                units = np.asarray([normalize_unit(cat) for cat in satuan.cat.categories] + [''], dtype=object)
+                self._unit_codes = units[satuan.cat.codes.to_numpy()]
+                self._prices = frame['harga_satuan'].to_numpy(dtype=np.float64)
+                self._items = frame['item_pekerjaan'].to_numpy()
+                self._resolved = {}
+                self._data_size = len(frame)
+
+    def _resolve(self, item: str, unit: str) -> Optional[Dict]:
+        """Cari harga satuan untuk satu item (None jika tidak ditemukan di sumber manapun)"""
+        key = (item, unit)
+        resolved = self._resolved.get(key, False)
+        if resolved is not False:
+            return resolved
+
+        data_size = self._data_size
+        resolved = None
+        for source in self.sources:
+            if source == SOURCE_RAB:
+                resolved = self._resolve_rab(item, unit)
+            elif source == SOURCE_MARKET:
+                resolved = self._resolve_market(item, unit)
+            if resolved is not None:
+                break
+
+        with self._lock:
+            # Hasil dari data lama tidak disimpan ke cache yang baru di-reset
+            if data_size == self._data_size:
+                if len(self._resolved) >= RESOLVED_CACHE_SIZE:
+                    self._resolved.pop(next(iter(self._resolved)), None)
+                self._resolved[key] = resolved
+        return resolved
+
+    def _resolve_rab(self, item: str, unit: str) -> Optional[Dict]:
+        if not self._data_size:
+            return None
+
+        row_ids = self.rab_parser.search_rows(item)
+        if not len(row_ids):
+            return None
+
+        prices = self._prices[row_ids]
+        valid = prices > 0
+        units = self._unit_codes[row_ids]
+        if unit:
+            valid &= units == unit
+        elif valid.any():
+            # Tanpa satuan: pakai satuan terbanyak (seri → satuan baris paling cocok),
+            # supaya harga m2 tidak dicampur dengan harga m', titik, atau ls
+            values, first, counts = np.unique(units[valid], return_index=True, return_counts=True)
+            valid &= units == values[np.lexsort((first, -counts))[0]]
+        if not valid.any():
+            return None
+
+        prices = prices[valid]
+        return {
+            'source': SOURCE_RAB,
+            'matched_to': str(self._items[row_ids[valid][0]]),
+            'unit': unit or str(units[valid][0]),
+            'prices': (float(prices.min()), float(prices.mean()), float(prices.max())),
+            'count': int(len(prices)),
+        }
+
+    def _resolve_market(self, item: str, unit: str) -> Optional[Dict]:
+        data = self.price_scraper.get_price_estimate(item)
+        if not data['found']:
+            return None
+
+        market_unit = normalize_unit(data['satuan'])
+        if unit and market_unit != unit:
+            return None
+
+        return {
+            'source': SOURCE_MARKET,
+            'matched_to': data.get('matched_to', item),
+            'unit': market_unit,
+            'prices': (float(data['min_price']), float(data['avg_price']), float(data['max_price'])),
+            'count': 1,
+        }
+
+    def estimate(self, lines: Sequence[BoQLine]) -> Dict:
+        """
+        Hitung estimasi biaya untuk semua baris BoQ
+
+        Args:
+            lines: Daftar (item, volume, satuan); satuan boleh kosong
+
+        Returns:
+            {
+                'lines': per baris {'no', 'item', 'volume', 'unit', 'found', 'source',
+                         'matched_to', 'unit_price', 'total'} (harga: {'min', 'avg', 'max'}),
+                'totals': grand total {'min', 'avg', 'max'},
+                'count' / 'resolved': jumlah baris / baris yang ditemukan harganya,
+                'unresolved': nama item yang tidak ditemukan / volumenya tidak valid
+            }
+        """
+        self._refresh()
+
+        parsed = [_parse_line(line) for line in lines]
+        count = len(parsed)
+
+        # Satu id per kombinasi (item, satuan) unik; -1 = tidak ditemukan.
+        # Teks yang persis sama tidak dinormalisasi ulang.
+        raw_ids: Dict[Tuple[str, str], int] = {}
+        key_ids: Dict[Tuple[str, str], int] = {}
+        resolutions: List[Dict] = []
+        line_keys = np.empty(count, dtype=np.int64)
+
+        for i, (item, _, unit) in enumerate(parsed):
+            key_id = raw_ids.get((item, unit))
+            if key_id is None:
+                key = (_normalize_item(item), normalize_unit(unit))
+                key_id = key_ids.get(key)
+                if key_id is None:
+                    resolved = self._resolve(*key) if key[0] else None
+                    key_id = len(resolutions) if resolved is not None else -1
+                    if resolved is not None:
+                        resolutions.append(resolved)
+                    key_ids[key] = key_id
+                raw_ids[(item, unit)] = key_id
+            line_keys[i] = key_id
+
+        # Volume bukan angka / negatif → NaN (baris tidak dihitung)
+        volumes = pd.to_numeric(pd.Series([line[1] for line in parsed], dtype=object),
+                                errors='coerce').to_numpy(dtype=np.float64, copy=True)
+        volumes[~(np.isfinite(volumes) & (volumes >= 0))] = np.nan
+
+        # Tabel harga satuan (min, avg, max) per item unik; baris terakhir NaN untuk id -1
+        price_table = np.full((len(resolutions) + 1, 3), np.nan)
+        if resolutions:
+            price_table[:-1] = [resolved['prices'] for resolved in resolutions]
+
+        unit_prices = price_table[line_keys]
+        line_totals = unit_prices * volumes[:, None]
+        found = ~np.isnan(line_totals[:, 0])
+        totals = line_totals[found].sum(axis=0) if found.any() else np.zeros(3)
+
+        result_lines = []
+        for i, ((item, _, unit), key_id, volume, prices, subtotal, ok) in enumerate(zip(
+                parsed, line_keys.tolist(), volumes.tolist(), unit_prices.tolist(),
+                line_totals.tolist(), found.tolist()), 1):
+            resolved = resolutions[key_id] if key_id >= 0 else None
+            line = {
+                'no': i,
+                'item': item,
+                'volume': volume,
+                'unit': resolved['unit'] if resolved else unit,
+                'found': ok,
+                'source': resolved['source'] if resolved else None,
+                'matched_to': resolved['matched_to'] if resolved else None,
+            }
+            if ok:
+                line['unit_price'] = {'min': prices[0], 'avg': prices[1], 'max': prices[2]}
+                line['total'] = {'min': subtotal[0], 'avg': subtotal[1], 'max': subtotal[2]}
+            result_lines.append(line)
+
+        return {
+            'lines': result_lines,
+            'totals': {'min': float(totals[0]), 'avg': float(totals[1]), 'max': float(totals[2])},
+            'count': count,
+            'resolved': int(found.sum()),
+            'unresolved': [line['item'] for line in result_lines if not line['found']],
+        }
+
+
+def format_boq_response(quote: Dict, max_lines: int = 10) -> str:
+    """Format quote BoQ jadi response yang readable"""
+    if not quote['resolved']:
+        return "Tidak ada item yang ditemukan harganya. Silakan hubungi kami untuk konsultasi harga."
+
+    response = f"🧾 Estimasi Biaya ({quote['resolved']} dari {quote['count']} item):\n\n"
+
+    shown = [line for line in quote['lines'] if line['found']][:max_lines]
+    for line in shown:
+        response += f"{line['no']}. {line['item']} — {line['volume']:g} {line['unit']}\n"
+        response += (f"   {format_currency(line['total']['min'])} - {format_currency(line['total']['max'])}"
+                     f" (rata-rata {format_currency(line['total']['avg'])})\n")
+
+    if quote['resolved'] > len(shown):
+        response += f"\n...dan {quote['resolved'] - len(shown)} item lainnya\n"
+
+    totals = quote['totals']
+    response += "\n💰 Total Estimasi:\n"
+    response += f"• Minimum: {format_currency(totals['min'])}\n"
+    response += f"• Rata-rata: {format_currency(totals['avg'])}\n"
+    response += f"• Maksimum: {format_currency(totals['max'])}\n"
+
+    if quote['unresolved']:
+        response += f"\n⚠️ Belum ada data harga untuk: {', '.join(quote['unresolved'][:5])}"
+        if len(quote['unresolved']) > 5:
+            response += f" (+{len(quote['unresolved']) - 5} lainnya)"
+        response += "\n"
+
+    return response
+
+
+if __name__ == "__main__":
+    import time
+    from knowledge_base import get_knowledge_base
+
+    estimator = get_knowledge_base().boq_estimator
+
+    lines = [
+        ('keramik', 45, 'm2'),
+        ('plafon gypsum', 38, 'm2'),
+        ('cat tembok', 120, 'm2'),
+        ('kitchen set', 3.5, 'm'),
+        ('lemari', 2, 'unit'),
+        ('pintu', 4, 'unit'),
+    ]
+    print(format_boq_response(estimator.estimate(lines)))
+
+    # Skala: ribuan baris
+    bulk = lines * 1000
+    start = time.perf_counter()
+    quote = estimator.estimate(bulk)
+    print(f"\n⏱️ {quote['count']} baris dihitung dalam {(time.perf_counter() - start) * 1000:.1f} ms")
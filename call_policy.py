@@ -0,0 +1,294 @@
+# call_policy.py
+# Deadline, hedged request, dan retry dengan jitter untuk panggilan ke Groq
+
+import asyncio
+import inspect
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable
+
+from groq import APIConnectionError, APIStatusError, APITimeoutError
+
+# Batas waktu panggilan Groq per giliran (detik)
+DEFAULT_DEADLINE = float(os.getenv("GROQ_DEADLINE", "20"))
+
+# Kirim request kedua jika yang pertama belum selesai setelah sekian detik (0 = mati)
+DEFAULT_HEDGE_DELAY = float(os.getenv("GROQ_HEDGE_DELAY", "0"))
+
+# Jumlah retry untuk 429/5xx/error koneksi
+DEFAULT_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+
+# Backoff eksponensial dengan full jitter (detik)
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 4.0
+
+# Thread untuk request sync yang di-hedge (tanpa hedging, request jalan di thread pemanggil)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="groq-call")
+
+
+class DeadlineExceeded(Exception):
+    """Panggilan Groq tidak selesai sebelum deadline"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """429, 5xx, timeout, dan error koneksi layak dicoba lagi"""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _close_result(result):
+    """Tutup hasil request yang tidak dipakai (mis. stream yang kalah hedge / lewat deadline)"""
+    for item in result if isinstance(result, tuple) else (result,):
+        close = getattr(item, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+async def _aclose_result(result):
+    """Versi async dari _close_result() (close() AsyncStream berupa coroutine)"""
+    for item in result if isinstance(result, tuple) else (result,):
+        close = getattr(item, 'close', None)
+        if callable(close):
+            try:
+                closing = close()
+                if inspect.isawaitable(closing):
+                    await closing
+            except Exception:
+                pass
+
+
+def _discard(future: Future):
+    """Batalkan request yang belum jalan, atau tutup hasilnya begitu selesai"""
+    if not future.cancel():
+        future.add_done_callback(
+            lambda done: _close_result(done.result()) if done.exception() is None else None
+        )
+
+
+def _retry_after(error: Exception) -> float:
+    """Nilai header retry-after dari response error (0 jika tidak ada)"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class GroqCallPolicy:
+    """
+    Kebijakan panggilan Groq
+
+    - Deadline: total waktu untuk satu panggilan (termasuk retry); lewat dari
+      itu DeadlineExceeded, supaya engine bisa pakai jawaban cadangan
+    - Hedging: jika request pertama lambat, kirim request kedua dan pakai
+      yang selesai duluan (memotong tail latency)
+    - Retry: 429/5xx/error koneksi dicoba lagi dengan backoff + jitter,
+      menghormati header retry-after, selama masih dalam deadline
+
+    Request dipanggil sebagai request(timeout) dengan sisa waktu sampai deadline.
+    Tanpa hedging, request sync jalan langsung di thread pemanggil (tidak antre
+    di thread pool); hasil yang datang setelah deadline atau kalah hedge
+    ditutup (stream ikut ditutup).
+
+    Batas deadline per jalur:
+    - async, dan sync dengan hedging: batas waktu total, pemanggil berhenti
+      menunggu tepat saat deadline
+    - sync tanpa hedging: timeout httpx berlaku per read, bukan total;
+      DeadlineExceeded dilempar begitu hasil datang terlambat, jadi response
+      yang menetes pelan bisa melewati deadline paling lama satu timeout read.
+      Request yang membaca stream sendiri wajib mengecek waktu total di
+      loop-nya (lihat _open_stream() di chatbot engine)
+    """
+
+    def __init__(self, deadline: float = DEFAULT_DEADLINE, hedge_delay: float = DEFAULT_HEDGE_DELAY,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Args:
+            deadline: Batas waktu total dalam detik
+            hedge_delay: Jeda sebelum request kedua dikirim (0 = tanpa hedging)
+            max_retries: Jumlah retry maksimal
+        """
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.max_retries = max_retries
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        return max(delay, _retry_after(error))
+
+    def call(self, request: Callable[[float], object], hedge: bool = True, metrics=None):
+        """
+        Jalankan request sync dengan deadline, hedging, dan retry
+
+        Args:
+            request: Fungsi request(timeout) yang memanggil Groq
+            hedge: Izinkan hedging (matikan untuk streaming)
+            metrics: ChatMetrics untuk mencatat retry/hedge (opsional)
+
+        Returns:
+            Hasil request yang sukses
+        """
+        deadline_at = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            try:
+                return self._hedged(request, deadline_at, hedge, metrics)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                delay = self._backoff(attempt, e)
+                if not is_retryable(e) or attempt >= self.max_retries \
+                        or time.monotonic() + delay >= deadline_at:
+                    raise
+                attempt += 1
+                if metrics is not None:
+                    metrics.record_event('retry')
+                time.sleep(delay)
+
+    def _deadline_error(self) -> DeadlineExceeded:
+        return DeadlineExceeded(f"Tidak ada respon dalam {self.deadline:.1f} detik")
+
+    def _hedged(self, request, deadline_at: float, hedge: bool, metrics):
+        """Satu percobaan, dengan request kedua jika yang pertama lambat"""
+        if deadline_at - time.monotonic() <= 0:
+            raise self._deadline_error()
+
+        if not hedge or self.hedge_delay <= 0:
+            return self._direct(request, deadline_at)
+
+        pending = {_executor.submit(self._run, request, deadline_at)}
+        hedge_at = time.monotonic() + self.hedge_delay
+        last_error = None
+
+        try:
+            while pending:
+                now = time.monotonic()
+                timeout = deadline_at - now
+                if hedge_at is not None:
+                    timeout = min(timeout, hedge_at - now)
+
+                done, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+                winner = None
+                for future in done:
+                    if future.exception() is not None:
+                        last_error = future.exception()
+                    elif winner is None:
+                        winner = future
+                    else:
+                        _close_result(future.result())
+                if winner is not None:
+                    return winner.result()
+
+                now = time.monotonic()
+                if now >= deadline_at:
+                    raise self._deadline_error()
+
+                if hedge_at is not None and now >= hedge_at and not done:
+                    pending.add(_executor.submit(self._run, request, deadline_at))
+                    hedge_at = None
+                    if metrics is not None:
+                        metrics.record_event('hedge')
+
+            raise last_error
+        finally:
+            # Request yang kalah / lewat deadline dibatalkan atau hasilnya ditutup
+            for future in pending:
+                _discard(future)
+
+    def _run(self, request, deadline_at: float):
+        """Jalankan request dengan sisa waktu saat mulai jalan (waktu antre di pool tidak dihitung dua kali)"""
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise self._deadline_error()
+        return request(remaining)
+
+    def _direct(self, request, deadline_at: float):
+        """Request di thread pemanggil, dibatasi timeout-nya sendiri (= sisa waktu sampai deadline)"""
+        try:
+            result = self._run(request, deadline_at)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if time.monotonic() >= deadline_at:
+                raise self._deadline_error() from e
+            raise
+
+        if time.monotonic() > deadline_at:
+            _close_result(result)
+            raise self._deadline_error()
+        return result
+
+    async def acall(self, request: Callable[[float], Awaitable], hedge: bool = True, metrics=None):
+        """Versi async dari call() (request lain yang masih jalan dibatalkan)"""
+        deadline_at = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            try:
+                return await self._ahedged(request, deadline_at, hedge, metrics)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                delay = self._backoff(attempt, e)
+                if not is_retryable(e) or attempt >= self.max_retries \
+                        or time.monotonic() + delay >= deadline_at:
+                    raise
+                attempt += 1
+                if metrics is not None:
+                    metrics.record_event('retry')
+                await asyncio.sleep(delay)
+
+    async def _ahedged(self, request, deadline_at: float, hedge: bool, metrics):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise self._deadline_error()
+
+        pending = {asyncio.ensure_future(request(remaining))}
+        hedge_at = time.monotonic() + self.hedge_delay if hedge and self.hedge_delay > 0 else None
+        last_error = None
+
+        try:
+            while pending:
+                now = time.monotonic()
+                timeout = deadline_at - now
+                if hedge_at is not None:
+                    timeout = min(timeout, hedge_at - now)
+
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, timeout),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    elif winner is None:
+                        winner = task
+                    else:
+                        await _aclose_result(task.result())
+                if winner is not None:
+                    return winner.result()
+
+                now = time.monotonic()
+                if now >= deadline_at:
+                    raise self._deadline_error()
+
+                if hedge_at is not None and now >= hedge_at and not done:
+                    pending.add(asyncio.ensure_future(request(deadline_at - now)))
+                    hedge_at = None
+                    if metrics is not None:
+                        metrics.record_event('hedge')
+
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -1,14 +1,178 @@
 # chatbot_engine_ai.py
 # Chatbot Engine dengan Groq API + RAB Parser + Price Scraper
 
+import asyncio
+import functools
+import itertools
 import os
-from typing import List, Dict
-from groq import Groq
-from rab_parser import RABParser, format_rab_response
-from price_scraper import InteriorPriceScraper, format_price_response, format_package_response
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Iterator, AsyncIterator, Tuple
+from groq import Groq, AsyncGroq
+from rab_parser import format_rab_response
+from price_scraper import format_price_response, format_package_response
+from boq_estimator import BoQLine, format_boq_response
 from data_perusahaan import COMPANY_INFO
+from knowledge_base import KnowledgeBase, get_knowledge_base
+from keyword_matcher import KeywordMatcher
+from conversation_history import ConversationHistory, DEFAULT_TOKEN_BUDGET
+from response_cache import ResponseCache, CACHEABLE_INTENTS, get_response_cache
+from semantic_cache import SemanticCache, get_semantic_cache
+from company_responder import CompanyInfoResponder
+from welcome_message import WELCOME_PROMPT, render_fallback_welcome, get_welcome_cache
+from metrics import ChatMetrics, get_metrics
+from http_transport import get_http_client, get_async_http_client, prewarm_connections, aprewarm_connections
+from call_policy import DeadlineExceeded, GroqCallPolicy
+from model_router import GREETING_KEYWORDS, ModelRouter, get_model_router
+from answer_templates import ANSWER_MODES, DEFAULT_ANSWER_MODE, TEMPLATE_INTENTS, render_price_answer
 import json
 
+# Keywords yang DIPERBOLEHKAN (on-topic)
+ALLOWED_KEYWORDS = [
+    # Perusahaan
+    'intervisual', 'pt intervisual', 'perusahaan', 'kantor', 'alamat', 'kontak',
+    'layanan', 'promo', 'gratis', 'konsultasi',
+    
+    # Konstruksi
+    'bangun', 'bangunan', 'konstruksi', 'kontraktor', 'renovasi', 'pembangunan',
+    'rumah', 'gedung', 'kantor', 'ruko', 'apartemen', 'villa',
+    'pondasi', 'struktur', 'sipil', 'arsitek', 'arsitektur',
+    
+    # Material & Pekerjaan
+    'plafon', 'dinding', 'lantai', 'atap', 'pintu', 'jendela', 'tangga',
+    'cat', 'keramik', 'granit', 'marmer', 'parket', 'vinyl', 'wallpaper',
+    'gypsum', 'pvc', 'bata', 'beton', 'semen',
+    
+    # Interior
+    'interior', 'desain', 'design', 'furniture', 'mebel', 'furnitur',
+    'kitchen set', 'dapur', 'lemari', 'meja', 'kursi', 'sofa',
+    'kamar tidur', 'ruang tamu', 'kamar mandi', 'toilet',
+    
+    # Sanitasi
+    'closet', 'wastafel', 'shower', 'kran', 'pipa', 'air',
+    
+    # Elektrikal
+    'listrik', 'lampu', 'instalasi', 'kabel', 'saklar', 'stop kontak',
+    
+    # Finishing
+    'finishing', 'waterproofing', 'pengecatan', 'pemasangan',
+    
+    # Harga & Estimasi
+    'harga', 'biaya', 'budget', 'anggaran', 'rab', 'estimasi', 'paket',
+    'berapa', 'mahal', 'murah',
+    
+    # Smart Home
+    'smart home', 'otomasi', 'automation', 'solar', 'panel surya',
+    
+    # Umum terkait konstruksi
+    'ukuran', 'luas', 'meter', 'm2', 'm²', 'dimensi',
+    'material', 'bahan', 'kualitas', 'spesifikasi',
+    'proyek', 'pembangunan', 'pengerjaan', 'durasi', 'waktu',
+]
+
+# Keywords yang DILARANG (off-topic)
+BLOCKED_KEYWORDS = [
+    # Politik & Agama
+    'politik', 'pilpres', 'pemilu', 'partai', 'presiden', 'menteri',
+    'agama', 'islam', 'kristen', 'hindu', 'buddha',
+    
+    # Entertainment
+    'film', 'movie', 'musik', 'lagu', 'artis', 'selebritis', 'celebrity',
+    'sepak bola', 'football', 'basket', 'olahraga',
+    
+    # Programming (kecuali smart home)
+    'python', 'javascript', 'code', 'coding', 'programming', 'github',
+    'bug', 'debug', 'api',
+    
+    # Kesehatan & Hukum
+    'dokter', 'obat', 'penyakit', 'sakit', 'hospital', 'medis',
+    'lawyer', 'pengacara', 'hukum', 'undang-undang',
+    
+    # Finance umum
+    'saham', 'trading', 'forex', 'kripto', 'bitcoin', 'investasi',
+    
+    # Lainnya
+    'cuaca', 'weather', 'makanan', 'resep', 'masak',
+    'game', 'gaming', 'anime', 'komik',
+]
+
+# Keywords untuk berbagai intent
+RAB_KEYWORDS = ['plafon', 'dinding', 'lantai', 'cat', 'waterproofing', 
+                'finishing', 'instalasi', 'pekerjaan', 'konstruksi', 'bangunan']
+
+INTERIOR_KEYWORDS = ['keramik', 'granit', 'marmer', 'parket', 'vinyl', 
+                     'kitchen set', 'lemari', 'furniture', 'lampu', 'gorden',
+                     'wallpaper', 'closet', 'wastafel', 'shower']
+
+PACKAGE_KEYWORDS = ['paket', 'kamar tidur', 'ruang tamu', 'dapur', 
+                    'kamar mandi', 'total biaya', 'budget']
+
+PRICE_KEYWORDS = ['harga', 'biaya', 'berapa']
+
+# Keyword paket yang merupakan tipe ruangan (untuk query paket)
+PACKAGE_ROOM_KEYWORDS = ['kamar tidur', 'ruang tamu', 'dapur', 'kamar mandi']
+
+# Automaton dibangun sekali saat import, dipakai untuk semua pesan
+KEYWORD_MATCHER = KeywordMatcher({
+    'allowed': ALLOWED_KEYWORDS,
+    'blocked': BLOCKED_KEYWORDS,
+    # Greeting/salam (always allowed), kosakata sama dengan model router
+    'greeting': GREETING_KEYWORDS,
+    'rab': RAB_KEYWORDS,
+    'interior': INTERIOR_KEYWORDS,
+    'package': PACKAGE_KEYWORDS,
+    'price': PRICE_KEYWORDS,
+})
+
+
+def _chunk_usage(chunk):
+    """Field usage dari chunk streaming (Groq mengirimnya di chunk terakhir lewat x_groq)"""
+    usage = getattr(chunk, 'usage', None)
+    if usage is None:
+        x_groq = getattr(chunk, 'x_groq', None)
+        usage = getattr(x_groq, 'usage', None) if x_groq is not None else None
+    return usage
+
+
+# Thread untuk polish jawaban template di background
+_polish_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="answer-polish")
+
+# Jumlah jawaban rapi yang disimpan per sesi untuk UI (yang terlama dibuang)
+MAX_POLISHED_REPLIES = 50
+
+
+def _generate_welcome_message(client, model: str, system_prompt: str,
+                              call_policy: GroqCallPolicy, metrics: ChatMetrics) -> str:
+    """Minta Groq memperkenalkan diri (tanpa history sesi manapun, dipanggil di thread background)"""
+    chat_completion = call_policy.call(
+        lambda timeout: client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": WELCOME_PROMPT}
+            ],
+            model=model,
+            temperature=0.7,
+            max_tokens=1024,
+            top_p=0.9,
+            stream=False,
+            timeout=timeout
+        ),
+        metrics=metrics
+    )
+    metrics.record_usage(getattr(chat_completion, 'usage', None))
+    return chat_completion.choices[0].message.content
+
+
+async def _achain(head: List, stream: AsyncIterator) -> AsyncIterator:
+    """Chunk yang sudah dibaca (head) lalu sisa stream async"""
+    for chunk in head:
+        yield chunk
+    async for chunk in stream:
+        yield chunk
+
+
 class ChatbotIntervisualAI:
     """
     Chatbot PT Intervisual dengan AI (Groq)
@@ -20,17 +184,41 @@ class ChatbotIntervisualAI:
     - Info perusahaan
     """
     
-    def __init__(self, groq_api_key: str = None):
+    def __init__(self, groq_api_key: str = None, knowledge_base: KnowledgeBase = None,
+                 history_token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 response_cache: ResponseCache = None, use_response_cache: bool = True,
+                 semantic_cache: SemanticCache = None, use_semantic_cache: bool = True,
+                 metrics: ChatMetrics = None, client=None, base_url: str = None,
+                 call_policy: GroqCallPolicy = None, router: ModelRouter = None,
+                 answer_mode: str = DEFAULT_ANSWER_MODE, on_polish: Callable[[str, str], None] = None):
         """
         Initialize chatbot dengan Groq API
         
         Args:
             groq_api_key: API key dari Groq (https://console.groq.com)
+            knowledge_base: Knowledge base bersama (default: milik proses ini)
+            history_token_budget: Batas token history yang dikirim ke Groq
+            response_cache: Cache jawaban (default: cache bersama milik proses ini)
+            use_response_cache: Aktifkan cache jawaban untuk intent harga/paket
+            semantic_cache: Cache pertanyaan mirip (default: cache bersama milik proses ini)
+            use_semantic_cache: Aktifkan cache untuk pertanyaan yang mirip
+            metrics: Metrics latency/token/error (default: metrics bersama milik proses ini)
+            client: Groq client yang sudah jadi (mis. fake client untuk benchmark)
+            base_url: Endpoint Groq lain, mis. stub server lokal (default: env GROQ_BASE_URL)
+            call_policy: Deadline, hedging & retry panggilan Groq (default dari env GROQ_*)
+            router: Routing model per giliran (default: router bersama milik proses ini)
+            answer_mode: Cara menjawab intent harga/paket: 'llm', 'template', atau
+                         'template_polish' (default: env PRICE_ANSWER_MODE)
+            on_polish: Callback (jawaban template, jawaban rapi) saat jawaban rapi diterapkan
+                       (dipanggil dari thread sesi, lihat apply_polished())
         """
+        if answer_mode not in ANSWER_MODES:
+            raise ValueError(f"answer_mode harus salah satu dari {ANSWER_MODES}, bukan {answer_mode!r}")
+        
         # Setup Groq client
         self.api_key = groq_api_key or os.getenv("GROQ_API_KEY")
         
-        if not self.api_key:
+        if not self.api_key and client is None:
             raise ValueError(
                 "⚠️ GROQ_API_KEY tidak ditemukan!\n"
                 "Cara setup:\n"
@@ -40,42 +228,69 @@ class ChatbotIntervisualAI:
                 "   atau buat file .env dengan isi: GROQ_API_KEY=your_key"
             )
         
-        self.client = Groq(api_key=self.api_key)
+        # Endpoint Groq (None = api.groq.com)
+        self.base_url = base_url or os.getenv("GROQ_BASE_URL") or None
+        
+        if client is None:
+            client = self._create_client()
+            # Buka koneksi ke Groq duluan supaya giliran pertama tidak bayar handshake
+            self._prewarm(self.base_url)
+        self.client = client
         
         # Model yang digunakan
         self.model = "llama-3.3-70b-versatile"  # Groq's fastest & most capable
         
-        # Initialize parsers
-        self.rab_parser = RABParser()
-        self.price_scraper = InteriorPriceScraper()
+        # Giliran sederhana (sapaan, harga) ke model kecil, konsultasi ke model utama
+        self.router = router or get_model_router()
+        
+        # Data RAB & harga dipakai bersama oleh semua sesi (di-load sekali per proses)
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.rab_parser = self.knowledge_base.rab_parser
+        self.price_scraper = self.knowledge_base.price_scraper
+        
+        # Conversation history (satu-satunya state per sesi)
+        self.history = ConversationHistory(token_budget=history_token_budget)
+        
+        # Cache jawaban untuk pertanyaan harga/paket (dipakai bersama semua sesi)
+        self.response_cache = (response_cache or get_response_cache()) if use_response_cache else None
+        self.semantic_cache = (semantic_cache or get_semantic_cache()) if use_semantic_cache else None
+        
+        # Jawaban info perusahaan langsung dari COMPANY_INFO (tanpa AI)
+        self.company_responder = CompanyInfoResponder(self.knowledge_base.company_info)
+        
+        # Jumlah giliran yang dijawab tanpa memanggil Groq (info perusahaan / cache)
+        self.llm_skipped_turns = 0
+        
+        # Latency per tahap, intent, token & error (dipakai bersama semua sesi)
+        self.metrics = metrics or get_metrics()
         
-        # Load RAB data
-        self._load_rab_data()
+        # Deadline + retry ditangani di sini, jadi retry bawaan SDK dimatikan
+        self.call_policy = call_policy or GroqCallPolicy()
         
-        # Conversation history
-        self.conversation_history: List[Dict] = []
+        # Error terakhir dari panggilan Groq (None jika sukses)
+        self.last_error: Exception = None
+        
+        # Jawaban harga/paket dari template (tanpa AI) + polish opsional di background
+        self.answer_mode = answer_mode
+        self.on_polish = on_polish
+        
+        # Jawaban template → versi yang sudah dirapikan AI (untuk ganti tampilan di UI)
+        self.polished_replies: Dict[str, str] = {}
+        
+        # Hasil polish dari thread background, diterapkan di thread sesi (apply_polished)
+        self._polish_queue = deque()
         
         # System prompt
         self.system_prompt = self._create_system_prompt()
     
-    def _load_rab_data(self):
-        """Load dan parse semua file RAB"""
-        try:
-            # Parse RAB files
-            rab_files = [
-                "/mnt/user-data/uploads/RAB_Finishing_Kav10__r17_Juli_2020__-_Tahap_1.pdf",
-                "/mnt/user-data/uploads/BQ_9x15.pdf"
-            ]
-            
-            for rab_file in rab_files:
-                if os.path.exists(rab_file):
-                    print(f"📂 Loading RAB: {rab_file}")
-                    self.rab_parser.parse_pdf(rab_file)
-            
-            print(f"✅ Loaded {len(self.rab_parser.rab_data)} items from RAB")
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Could not load RAB files: {e}")
+    def _create_client(self):
+        """Buat Groq client (sync) di atas pool koneksi bersama"""
+        return Groq(api_key=self.api_key, base_url=self.base_url, http_client=get_http_client(),
+                    max_retries=0)
+    
+    def _prewarm(self, base_url):
+        """Buka koneksi pool sync ke Groq di background"""
+        prewarm_connections(base_url)
     
     def _create_system_prompt(self) -> str:
         """Create system prompt untuk Groq AI"""
@@ -150,134 +365,95 @@ PENTING:
     
     def query_rab(self, keyword: str) -> str:
         """Query harga dari RAB data"""
+        return self._query_rab(keyword)[1]
+    
+    def query_interior_price(self, item_name: str) -> str:
+        """Query harga material/paket desain interior"""
+        return self._query_interior_price(item_name)[1]
+    
+    def query_package(self, room_type: str, area: float = 15.0) -> str:
+        """Query paket desain per ruangan"""
+        return self._query_package(room_type, area)[1]
+    
+    def query_boq(self, lines: List[BoQLine]) -> str:
+        """Estimasi biaya banyak item sekaligus dari daftar (item, volume, satuan)"""
+        try:
+            return format_boq_response(self.knowledge_base.boq_estimator.estimate(lines))
+        except Exception as e:
+            return f"Maaf, terjadi error saat menghitung estimasi: {e}"
+    
+    def _query_rab(self, keyword: str) -> Tuple[bool, str]:
+        """Query RAB: (data ditemukan, response terformat)"""
         try:
             result = self.rab_parser.get_price_estimate(keyword)
-            return format_rab_response(result)
+            return result['found'], format_rab_response(result)
         except Exception as e:
-            return f"Maaf, terjadi error saat mengambil data RAB: {e}"
+            return False, f"Maaf, terjadi error saat mengambil data RAB: {e}"
     
-    def query_interior_price(self, item_name: str) -> str:
-        """Query harga material/paket desain interior"""
+    def _query_interior_price(self, item_name: str) -> Tuple[bool, str]:
+        """Query harga interior: (data ditemukan, response terformat)"""
         try:
             result = self.price_scraper.get_price_estimate(item_name)
-            return format_price_response(result)
+            return result['found'], format_price_response(result)
         except Exception as e:
-            return f"Maaf, terjadi error saat mengambil data harga: {e}"
+            return False, f"Maaf, terjadi error saat mengambil data harga: {e}"
     
-    def query_package(self, room_type: str, area: float = 15.0) -> str:
-        """Query paket desain per ruangan"""
+    def _query_package(self, room_type: str, area: float = 15.0) -> Tuple[bool, str]:
+        """Query paket ruangan: (data ditemukan, response terformat)"""
         try:
             result = self.price_scraper.get_package_estimate(room_type, area)
-            return format_package_response(result)
+            return result['found'], format_package_response(result)
         except Exception as e:
-            return f"Maaf, terjadi error saat mengambil data paket: {e}"
+            return False, f"Maaf, terjadi error saat mengambil data paket: {e}"
     
-    def _is_on_topic(self, message: str) -> bool:
+    def _match_keywords(self, message: str) -> Dict[str, set]:
+        """Scan pesan sekali untuk semua grup keyword (topik & intent)"""
+        return KEYWORD_MATCHER.match(message.lower())
+    
+    def _is_on_topic(self, message: str, matches: Dict[str, set] = None) -> bool:
         """
         Check apakah pertanyaan masih dalam scope konstruksi/desain interior
         
+        Args:
+            message: Pesan dari user
+            matches: Hasil _match_keywords (dihitung ulang jika tidak diberikan)
+        
         Returns:
             True jika on-topic, False jika off-topic
         """
-        message_lower = message.lower()
+        if matches is None:
+            matches = self._match_keywords(message)
         
-        # Keywords yang DIPERBOLEHKAN (on-topic)
-        allowed_keywords = [
-            # Perusahaan
-            'intervisual', 'pt intervisual', 'perusahaan', 'kantor', 'alamat', 'kontak',
-            'layanan', 'promo', 'gratis', 'konsultasi',
-            
-            # Konstruksi
-            'bangun', 'bangunan', 'konstruksi', 'kontraktor', 'renovasi', 'pembangunan',
-            'rumah', 'gedung', 'kantor', 'ruko', 'apartemen', 'villa',
-            'pondasi', 'struktur', 'sipil', 'arsitek', 'arsitektur',
-            
-            # Material & Pekerjaan
-            'plafon', 'dinding', 'lantai', 'atap', 'pintu', 'jendela', 'tangga',
-            'cat', 'keramik', 'granit', 'marmer', 'parket', 'vinyl', 'wallpaper',
-            'gypsum', 'pvc', 'bata', 'beton', 'semen',
-            
-            # Interior
-            'interior', 'desain', 'design', 'furniture', 'mebel', 'furnitur',
-            'kitchen set', 'dapur', 'lemari', 'meja', 'kursi', 'sofa',
-            'kamar tidur', 'ruang tamu', 'kamar mandi', 'toilet',
-            
-            # Sanitasi
-            'closet', 'wastafel', 'shower', 'kran', 'pipa', 'air',
-            
-            # Elektrikal
-            'listrik', 'lampu', 'instalasi', 'kabel', 'saklar', 'stop kontak',
-            
-            # Finishing
-            'finishing', 'waterproofing', 'pengecatan', 'pemasangan',
-            
-            # Harga & Estimasi
-            'harga', 'biaya', 'budget', 'anggaran', 'rab', 'estimasi', 'paket',
-            'berapa', 'mahal', 'murah',
-            
-            # Smart Home
-            'smart home', 'otomasi', 'automation', 'solar', 'panel surya',
-            
-            # Umum terkait konstruksi
-            'ukuran', 'luas', 'meter', 'm2', 'm²', 'dimensi',
-            'material', 'bahan', 'kualitas', 'spesifikasi',
-            'proyek', 'pembangunan', 'pengerjaan', 'durasi', 'waktu',
-        ]
-        
-        # Keywords yang DILARANG (off-topic)
-        blocked_keywords = [
-            # Politik & Agama
-            'politik', 'pilpres', 'pemilu', 'partai', 'presiden', 'menteri',
-            'agama', 'islam', 'kristen', 'hindu', 'buddha',
-            
-            # Entertainment
-            'film', 'movie', 'musik', 'lagu', 'artis', 'selebritis', 'celebrity',
-            'sepak bola', 'football', 'basket', 'olahraga',
-            
-            # Programming (kecuali smart home)
-            'python', 'javascript', 'code', 'coding', 'programming', 'github',
-            'bug', 'debug', 'api',
-            
-            # Kesehatan & Hukum
-            'dokter', 'obat', 'penyakit', 'sakit', 'hospital', 'medis',
-            'lawyer', 'pengacara', 'hukum', 'undang-undang',
-            
-            # Finance umum
-            'saham', 'trading', 'forex', 'kripto', 'bitcoin', 'investasi',
-            
-            # Lainnya
-            'cuaca', 'weather', 'makanan', 'resep', 'masak',
-            'game', 'gaming', 'anime', 'komik',
-        ]
+        word_count = len(message.lower().split())
         
         # Check greeting/salam (always allowed)
-        greetings = ['hai', 'halo', 'hi', 'hello', 'selamat', 'pagi', 'siang', 'sore', 'malam']
-        if any(greeting in message_lower for greeting in greetings) and len(message_lower.split()) <= 3:
+        if matches['greeting'] and word_count <= 3:
             return True
         
+        has_allowed = bool(matches['allowed'])
+        
         # Check jika ada blocked keywords
-        has_blocked = any(keyword in message_lower for keyword in blocked_keywords)
-        if has_blocked:
+        if matches['blocked']:
             # Double check - mungkin konteksnya masih relevan
             # Misalnya: "harga cat dinding yang bagus untuk kesehatan"
-            has_allowed = any(keyword in message_lower for keyword in allowed_keywords)
             if not has_allowed:
                 return False  # Pure off-topic
         
-        # Check jika ada allowed keywords
-        has_allowed = any(keyword in message_lower for keyword in allowed_keywords)
-        
         # Jika tidak ada keyword apapun, check panjang pertanyaan
-        if not has_allowed and len(message_lower.split()) > 3:
+        if not has_allowed and word_count > 3:
             # Pertanyaan panjang tanpa keyword relevan = likely off-topic
             return False
         
         return True
     
-    def _detect_intent(self, message: str) -> Dict:
+    def _detect_intent(self, message: str, matches: Dict[str, set] = None) -> Dict:
         """
         Detect user intent untuk routing
         
+        Args:
+            message: Pesan dari user
+            matches: Hasil _match_keywords (dihitung ulang jika tidak diberikan)
+        
         Returns:
             {
                 'intent': 'rab_query' | 'interior_price' | 'package' | 'general',
@@ -285,44 +461,36 @@ PENTING:
                 'confidence': 0.0-1.0
             }
         """
-        message_lower = message.lower()
-        
-        # Keywords untuk berbagai intent
-        rab_keywords = ['plafon', 'dinding', 'lantai', 'cat', 'waterproofing', 
-                       'finishing', 'instalasi', 'pekerjaan', 'konstruksi', 'bangunan']
-        
-        interior_keywords = ['keramik', 'granit', 'marmer', 'parket', 'vinyl', 
-                            'kitchen set', 'lemari', 'furniture', 'lampu', 'gorden',
-                            'wallpaper', 'closet', 'wastafel', 'shower']
+        if matches is None:
+            matches = self._match_keywords(message)
         
-        package_keywords = ['paket', 'kamar tidur', 'ruang tamu', 'dapur', 
-                           'kamar mandi', 'total biaya', 'budget']
+        asks_price = bool(matches['price'])
         
         # Check RAB query
-        rab_matches = sum(1 for kw in rab_keywords if kw in message_lower)
-        if rab_matches > 0 and any(word in message_lower for word in ['harga', 'biaya', 'berapa']):
+        rab_found = [kw for kw in RAB_KEYWORDS if kw in matches['rab']]
+        if rab_found and asks_price:
             return {
                 'intent': 'rab_query',
-                'keywords': [kw for kw in rab_keywords if kw in message_lower],
-                'confidence': min(rab_matches / len(rab_keywords), 1.0)
+                'keywords': rab_found,
+                'confidence': min(len(rab_found) / len(RAB_KEYWORDS), 1.0)
             }
         
         # Check package query
-        package_matches = sum(1 for kw in package_keywords if kw in message_lower)
-        if package_matches > 0:
+        package_found = [kw for kw in PACKAGE_KEYWORDS if kw in matches['package']]
+        if package_found:
             return {
                 'intent': 'package',
-                'keywords': [kw for kw in package_keywords if kw in message_lower],
-                'confidence': min(package_matches / len(package_keywords), 1.0)
+                'keywords': package_found,
+                'confidence': min(len(package_found) / len(PACKAGE_KEYWORDS), 1.0)
             }
         
         # Check interior price query
-        interior_matches = sum(1 for kw in interior_keywords if kw in message_lower)
-        if interior_matches > 0 and any(word in message_lower for word in ['harga', 'biaya', 'berapa']):
+        interior_found = [kw for kw in INTERIOR_KEYWORDS if kw in matches['interior']]
+        if interior_found and asks_price:
             return {
                 'intent': 'interior_price',
-                'keywords': [kw for kw in interior_keywords if kw in message_lower],
-                'confidence': min(interior_matches / len(interior_keywords), 1.0)
+                'keywords': interior_found,
+                'confidence': min(len(interior_found) / len(INTERIOR_KEYWORDS), 1.0)
             }
         
         # Default: general conversation
@@ -332,20 +500,9 @@ PENTING:
             'confidence': 1.0
         }
     
-    def chat(self, user_message: str) -> str:
-        """
-        Main chat function
-        
-        Args:
-            user_message: Pesan dari user
-            
-        Returns:
-            Response dari chatbot
-        """
-        try:
-            # CHECK ON-TOPIC FIRST
-            if not self._is_on_topic(user_message):
-                return """Maaf, saya adalah asisten khusus untuk konsultasi konstruksi dan desain interior PT Intervisual. Saya hanya dapat membantu pertanyaan seputar:
+    def _off_topic_response(self) -> str:
+        """Response standar untuk pertanyaan di luar scope"""
+        return """Maaf, saya adalah asisten khusus untuk konsultasi konstruksi dan desain interior PT Intervisual. Saya hanya dapat membantu pertanyaan seputar:
 
 🏗️ **Konstruksi & Bangunan:**
 - Harga pekerjaan konstruksi (pondasi, dinding, lantai, atap, dll)
@@ -367,118 +524,574 @@ Ada yang bisa saya bantu terkait konstruksi atau desain interior? 😊
 Atau hubungi kami langsung:
 📱 WhatsApp: """ + COMPANY_INFO['kontak']['whatsapp'] + """
 📧 Email: """ + COMPANY_INFO['kontak']['email']
+    
+    def _prepare_turn(self, user_message: str) -> Dict:
+        """
+        Siapkan satu giliran chat: filter topik, deteksi intent, query data, dan susun prompt
+        
+        Args:
+            user_message: Pesan dari user
             
-            # Detect intent
-            intent_data = self._detect_intent(user_message)
+        Returns:
+            {
+                'reply': response langsung tanpa AI, yaitu penolakan off-topic, info
+                         perusahaan, atau jawaban template harga (None jika perlu panggil Groq),
+                'prompt': prompt untuk Groq,
+                'intent': hasil _detect_intent,
+                'tool_response': data hasil query RAB/harga/paket (jika ada),
+                'cache_key' / 'semantic_scope': key cache jawaban (None jika tidak di-cache),
+                'route': model & batas generate untuk giliran ini,
+                'source': asal reply langsung ('off_topic', 'company_info', 'template')
+            }
+        """
+        metrics = self.metrics
+        
+        # Satu kali scan keyword untuk gating & intent
+        with metrics.timer('gating'):
+            matches = self._match_keywords(user_message)
+            on_topic = self._is_on_topic(user_message, matches)
+        
+        # CHECK ON-TOPIC FIRST
+        if not on_topic:
+            return {
+                'reply': self._off_topic_response(),
+                'prompt': None,
+                'intent': None,
+                'tool_response': None,
+                'cache_key': None,
+                'semantic_scope': None,
+                'route': None,
+                'source': 'off_topic'
+            }
+        
+        # Detect intent
+        with metrics.timer('intent'):
+            intent_data = self._detect_intent(user_message, matches)
+        
+        # Pertanyaan info perusahaan yang jelas → jawab langsung dari COMPANY_INFO
+        if intent_data['intent'] == 'general':
+            with metrics.timer('company_info'):
+                company_reply = self.company_responder.answer(user_message, matches)
+            if company_reply is not None:
+                return {
+                    'reply': company_reply,
+                    'prompt': None,
+                    'intent': intent_data,
+                    'tool_response': None,
+                    'cache_key': None,
+                    'semantic_scope': None,
+                    'route': None,
+                    'source': 'company_info'
+                }
+        
+        # General conversation
+        tool_response = None
+        found = False
+        topic_keywords = intent_data['keywords']
+        enhanced_prompt = user_message
+        
+        # Handle specific intents
+        if intent_data['intent'] == 'rab_query':
+            # Query RAB data
+            keywords = ' '.join(intent_data['keywords'])
+            with metrics.timer('tool'):
+                found, rab_response = self._query_rab(keywords)
+            tool_response = rab_response
             
-            # Handle specific intents
-            if intent_data['intent'] == 'rab_query':
-                # Query RAB data
-                keywords = ' '.join(intent_data['keywords'])
-                rab_response = self.query_rab(keywords)
-                
-                # Enhance dengan AI
+            # Enhance dengan AI
+            with metrics.timer('prompt_build'):
                 enhanced_prompt = f"""User bertanya tentang harga konstruksi: "{user_message}"
 
 Data dari RAB kami:
 {rab_response}
 
 Berikan response yang natural dan helpful berdasarkan data di atas. Jelaskan dengan ramah dan tawarkan konsultasi gratis untuk detail lebih lanjut."""
-                
-                return self._call_groq(enhanced_prompt)
+        
+        elif intent_data['intent'] == 'interior_price':
+            # Query interior price
+            keywords = ' '.join(intent_data['keywords'])
+            with metrics.timer('tool'):
+                found, price_response = self._query_interior_price(keywords)
+            tool_response = price_response
             
-            elif intent_data['intent'] == 'interior_price':
-                # Query interior price
-                keywords = ' '.join(intent_data['keywords'])
-                price_response = self.query_interior_price(keywords)
-                
-                # Enhance dengan AI
+            # Enhance dengan AI
+            with metrics.timer('prompt_build'):
                 enhanced_prompt = f"""User bertanya tentang harga material interior: "{user_message}"
 
 Data harga pasaran:
 {price_response}
 
 Berikan response yang natural dan helpful. Jelaskan range harga dan tawarkan konsultasi gratis untuk mendapatkan penawaran yang sesuai kebutuhan."""
-                
-                return self._call_groq(enhanced_prompt)
+        
+        elif intent_data['intent'] == 'package':
+            # Query package
+            # Extract room type dan area jika ada
+            room_type = next((k for k in intent_data['keywords'] if k in PACKAGE_ROOM_KEYWORDS), 'kamar tidur')
+            topic_keywords = [room_type]
             
-            elif intent_data['intent'] == 'package':
-                # Query package
-                # Extract room type dan area jika ada
-                room_type = intent_data['keywords'][0] if intent_data['keywords'] else 'kamar tidur'
-                
-                package_response = self.query_package(room_type)
-                
+            with metrics.timer('tool'):
+                found, package_response = self._query_package(room_type)
+            tool_response = package_response
+            
+            with metrics.timer('prompt_build'):
                 enhanced_prompt = f"""User bertanya tentang paket desain: "{user_message}"
 
 Paket yang tersedia:
 {package_response}
 
 Berikan response yang natural. Jelaskan paket-paket yang ada dan tawarkan konsultasi gratis untuk customisasi sesuai budget."""
-                
-                return self._call_groq(enhanced_prompt)
-            
+        
+        route = self.router.route(intent_data, user_message, matches)
+        
+        # Mode template: data harga/paket yang ditemukan langsung jadi jawaban (tanpa AI)
+        if found and self.answer_mode != 'llm' and intent_data['intent'] in TEMPLATE_INTENTS:
+            with metrics.timer('template'):
+                reply = render_price_answer(intent_data['intent'], topic_keywords, tool_response,
+                                            user_message, self.knowledge_base.company_info)
+            return {
+                'reply': reply,
+                'prompt': enhanced_prompt,
+                'intent': intent_data,
+                'tool_response': tool_response,
+                'cache_key': None,
+                'semantic_scope': None,
+                'route': route,
+                'source': 'template'
+            }
+        
+        return {
+            'reply': None,
+            'prompt': enhanced_prompt,
+            'intent': intent_data,
+            'tool_response': tool_response,
+            'cache_key': self._response_cache_key(intent_data),
+            'semantic_scope': self._semantic_scope(intent_data, user_message),
+            'route': route,
+            'source': None
+        }
+    
+    def _response_cache_key(self, intent_data: Dict) -> str:
+        """Key cache untuk intent harga/paket (None jika tidak di-cache)"""
+        if self.response_cache is None or intent_data['intent'] not in CACHEABLE_INTENTS:
+            return None
+        return ResponseCache.make_key(intent_data['intent'], intent_data['keywords'],
+                                      self.knowledge_base.data_version)
+    
+    def _semantic_scope(self, intent_data: Dict, user_message: str) -> str:
+        """
+        Scope semantic cache (None jika tidak boleh pakai semantic cache)
+        
+        Scope = intent + keyword yang cocok + angka di pesan + versi data, jadi
+        hanya variasi penulisan pertanyaan yang sama yang berbagi jawaban
+        ("rumah 2 lantai" tidak memakai jawaban "rumah 3 lantai").
+        Pertanyaan umum hanya di-cache di awal percakapan, karena jawaban
+        pertanyaan lanjutan bergantung pada konteks sebelumnya.
+        """
+        if self.semantic_cache is None:
+            return None
+        if intent_data['intent'] == 'general' and len(self.history):
+            return None
+        return SemanticCache.make_scope(intent_data['intent'], intent_data['keywords'], user_message,
+                                        self.knowledge_base.data_version)
+    
+    def _local_reply(self, turn: Dict, user_message: str) -> str:
+        """Jawaban tanpa panggil Groq: reply langsung atau cache (None jika perlu Groq)"""
+        if turn['reply'] is not None:
+            # Penolakan off-topic tidak dicatat; jawaban info perusahaan & template masuk history
+            if turn['intent'] is not None:
+                if turn['source'] == 'template' and self.answer_mode == 'template_polish':
+                    # Konteks polish = history sebelum giliran ini
+                    self._schedule_polish(turn['reply'], self._build_messages(turn['prompt']), turn['route'])
+                self.history.add_turn(user_message, turn['reply'])
+                self.llm_skipped_turns += 1
+                self.metrics.record_turn(turn['intent']['intent'], turn['source'])
             else:
-                # General conversation
-                return self._call_groq(user_message)
+                self.metrics.record_turn('off_topic', 'off_topic')
+            return turn['reply']
+        
+        with self.metrics.timer('cache'):
+            cached = self._cached_reply(turn, user_message)
+        if cached is not None:
+            self.metrics.record_turn(turn['intent']['intent'], 'cache')
+        return cached
+    
+    def _cached_reply(self, turn: Dict, user_message: str) -> str:
+        """Ambil jawaban dari cache (exact lalu semantic) dan catat ke history (None jika miss)"""
+        cached = None
+        
+        if turn['cache_key']:
+            cached = self.response_cache.get(turn['cache_key'])
+        
+        if cached is None and turn['semantic_scope']:
+            cached = self.semantic_cache.lookup(user_message, turn['semantic_scope'])
+        
+        if cached is not None:
+            self.history.add_turn(user_message, cached)
+            self.llm_skipped_turns += 1
+        return cached
+    
+    def _store_reply(self, turn: Dict, user_message: str, reply: str):
+        """Simpan jawaban ke cache jika panggilan Groq sukses"""
+        if self.last_error is not None:
+            return
+        
+        if turn['cache_key']:
+            self.response_cache.set(turn['cache_key'], reply)
+        if turn['semantic_scope']:
+            self.semantic_cache.add(user_message, turn['semantic_scope'], reply)
+    
+    def _fallback_reply(self, turn: Dict) -> str:
+        """
+        Jawaban cadangan jika Groq gagal / lewat deadline
+        
+        Untuk intent harga/paket, data RAB/harga yang sudah diformat sudah
+        merupakan jawaban lengkap; tinggal ditambah ajakan konsultasi.
+        """
+        if not turn['tool_response']:
+            return None
+        return (
+            f"{turn['tool_response']}\n\n"
+            f"💬 Untuk penjelasan detail dan penawaran sesuai kebutuhan, konsultasi GRATIS via "
+            f"WhatsApp {COMPANY_INFO['kontak']['whatsapp']} ({COMPANY_INFO['kontak']['whatsapp_link']}) 😊"
+        )
+    
+    def _schedule_polish(self, reply: str, messages: List[Dict], route: Dict):
+        """Jalankan polish AI untuk jawaban template di background"""
+        _polish_executor.submit(self._polish, reply, messages, route)
+    
+    def _polish(self, reply: str, messages: List[Dict], route: Dict):
+        """Minta Groq merangkai ulang jawaban template (di thread polish), hasilnya diantrekan"""
+        try:
+            params = self._generation_params(route)
+            with self.metrics.timer('polish'):
+                chat_completion = self.call_policy.call(
+                    lambda timeout: self._sync_client().chat.completions.create(
+                        messages=messages,
+                        **params,
+                        stream=False,
+                        timeout=timeout
+                    ),
+                    metrics=self.metrics
+                )
+            self.metrics.record_usage(getattr(chat_completion, 'usage', None))
+            self._polish_queue.append((reply, chat_completion.choices[0].message.content))
+        except Exception as e:
+            # Jawaban template tetap dipakai
+            self.metrics.record_error(e)
+    
+    def apply_polished(self) -> int:
+        """
+        Terapkan jawaban rapi yang sudah selesai di background
+        
+        Dipanggil dari thread sesi (otomatis di awal chat()/chat_stream(), atau
+        oleh UI sebelum menampilkan pesan), jadi history, polished_replies, dan
+        callback on_polish hanya diubah / dipanggil oleh thread sesi.
+        
+        Returns:
+            Jumlah jawaban yang diterapkan
+        """
+        applied = 0
+        while self._polish_queue:
+            reply, polished = self._polish_queue.popleft()
+            self._apply_polish(reply, polished)
+            applied += 1
+        return applied
+    
+    def _apply_polish(self, reply: str, polished: str):
+        """Ganti jawaban template dengan versi AI (di history, UI, dan callback)"""
+        if not polished:
+            return
+        self.history.replace("assistant", reply, polished)
+        self.polished_replies.pop(reply, None)
+        self.polished_replies[reply] = polished
+        while len(self.polished_replies) > MAX_POLISHED_REPLIES:
+            self.polished_replies.pop(next(iter(self.polished_replies)))
+        self.metrics.record_event('polish')
+        if self.on_polish is not None:
+            self.on_polish(reply, polished)
+    
+    def _error_response(self, error: Exception) -> str:
+        """Response jika terjadi error saat memproses pesan"""
+        self.metrics.record_error(error)
+        return f"⚠️ Maaf, terjadi error: {error}\n\nSilakan hubungi kami langsung:\n📱 WhatsApp: {COMPANY_INFO['kontak']['whatsapp']}"
+    
+    def chat(self, user_message: str) -> str:
+        """
+        Main chat function
+        
+        Args:
+            user_message: Pesan dari user
+            
+        Returns:
+            Response dari chatbot
+        """
+        self.apply_polished()
+        try:
+            with self.metrics.timer('total'):
+                turn = self._prepare_turn(user_message)
+                
+                local = self._local_reply(turn, user_message)
+                if local is not None:
+                    return local
+                
+                response = self._call_groq(turn['prompt'], user_message,
+                                           fallback=self._fallback_reply(turn), route=turn['route'])
+                self._store_reply(turn, user_message, response)
+                self.metrics.record_turn(turn['intent']['intent'], 'llm')
+                return response
         
         except Exception as e:
-            return f"⚠️ Maaf, terjadi error: {e}\n\nSilakan hubungi kami langsung:\n📱 WhatsApp: {COMPANY_INFO['kontak']['whatsapp']}"
+            return self._error_response(e)
     
-    def _call_groq(self, user_message: str) -> str:
-        """Call Groq API untuk generate response"""
+    def chat_stream(self, user_message: str) -> Iterator[str]:
+        """
+        Versi streaming dari chat()
+        
+        Yield potongan response begitu diterima dari Groq, jadi UI bisa
+        langsung menampilkan token pertama. Response lengkap masuk ke
+        history setelah stream selesai.
+        
+        Args:
+            user_message: Pesan dari user
+            
+        Yields:
+            Potongan teks response
+        """
+        self.apply_polished()
+        start = time.perf_counter()
         try:
-            # Add message to history
-            self.conversation_history.append({
+            turn = self._prepare_turn(user_message)
+        except Exception as e:
+            yield self._error_response(e)
+            return
+        
+        local = self._local_reply(turn, user_message)
+        if local is not None:
+            yield local
+            self.metrics.observe_stage('total', time.perf_counter() - start)
+            return
+        
+        parts = []
+        for delta in self._call_groq_stream(turn['prompt'], user_message, self._fallback_reply(turn),
+                                            turn['route']):
+            parts.append(delta)
+            yield delta
+        self._store_reply(turn, user_message, "".join(parts))
+        self.metrics.record_turn(turn['intent']['intent'], 'llm')
+        self.metrics.observe_stage('total', time.perf_counter() - start)
+    
+    @property
+    def conversation_history(self) -> List[Dict]:
+        """Pesan-pesan terbaru yang masih disimpan utuh"""
+        return self.history.get_turns()
+    
+    def _build_messages(self, prompt: str) -> List[Dict]:
+        """Susun messages untuk Groq: system prompt + history + prompt giliran ini"""
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
+            }
+        ] + self.history.messages() + [
+            {
                 "role": "user",
-                "content": user_message
-            })
-            
-            # Prepare messages untuk Groq
-            messages = [
-                {
-                    "role": "system",
-                    "content": self.system_prompt
-                }
-            ] + self.conversation_history
+                "content": prompt
+            }
+        ]
+    
+    def _call_groq(self, prompt: str, user_message: str = None, record: bool = True,
+                   fallback: str = None, route: Dict = None) -> str:
+        """
+        Call Groq API untuk generate response
+        
+        Args:
+            prompt: Prompt untuk giliran ini (bisa berisi data RAB/harga)
+            user_message: Pesan asli user yang disimpan di history (default: prompt)
+            record: Simpan giliran ini ke history
+            fallback: Jawaban cadangan jika Groq gagal / lewat deadline
+            route: Hasil ModelRouter (default: model utama)
+        """
+        self.last_error = None
+        try:
+            messages = self._build_messages(prompt)
+            params = self._generation_params(route)
             
-            # Call Groq API
-            chat_completion = self.client.chat.completions.create(
-                messages=messages,
-                model=self.model,
-                temperature=0.7,
-                max_tokens=1024,
-                top_p=0.9,
-                stream=False
-            )
+            # Call Groq API (dengan deadline, hedging & retry)
+            with self.metrics.timer('llm'), self.metrics.model_timer(params['model']):
+                chat_completion = self.call_policy.call(
+                    lambda timeout: self.client.chat.completions.create(
+                        messages=messages,
+                        **params,
+                        stream=False,
+                        timeout=timeout
+                    ),
+                    metrics=self.metrics
+                )
+            self.metrics.record_usage(getattr(chat_completion, 'usage', None))
             
             # Extract response
             assistant_message = chat_completion.choices[0].message.content
             
-            # Add to history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
+            # Add to history (pesan asli user, tanpa data tambahan)
+            if record:
+                self.history.add_turn(user_message or prompt, assistant_message)
             
             return assistant_message
         
         except Exception as e:
-            return f"⚠️ Error saat berkomunikasi dengan AI: {e}\n\nSilakan coba lagi atau hubungi kami di WhatsApp: {COMPANY_INFO['kontak']['whatsapp']}"
+            self.last_error = e
+            self.metrics.record_error(e)
+            return self._groq_failure_reply(e, prompt, user_message, record, fallback)
+    
+    def _call_groq_stream(self, prompt: str, user_message: str = None,
+                          fallback: str = None, route: Dict = None) -> Iterator[str]:
+        """
+        Call Groq API dengan stream=True, yield delta teks
+        
+        Deadline & retry berlaku sampai token pertama diterima; setelah itu
+        stream dibaca sampai selesai.
+        """
+        self.last_error = None
+        parts = []
+        try:
+            messages = self._build_messages(prompt)
+            params = self._generation_params(route)
+            
+            start = time.perf_counter()
+            head, stream = self.call_policy.call(
+                lambda timeout: self._open_stream(messages, params, timeout),
+                hedge=False,
+                metrics=self.metrics
+            )
+            
+            for chunk in itertools.chain(head, stream):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if not parts:
+                        self.metrics.observe_stage('llm_first_token', time.perf_counter() - start)
+                    parts.append(delta)
+                    yield delta
+                self.metrics.record_usage(_chunk_usage(chunk))
+            self.metrics.observe_stage('llm', time.perf_counter() - start)
+            self.metrics.observe_model(params['model'], time.perf_counter() - start)
+            
+            # Add to history setelah response lengkap
+            self.history.add_turn(user_message or prompt, "".join(parts))
+        
+        except Exception as e:
+            self.last_error = e
+            self.metrics.record_error(e)
+            if parts:
+                yield self._groq_error_response(e)
+            else:
+                yield self._groq_failure_reply(e, prompt, user_message, True, fallback)
+    
+    def _open_stream(self, messages: List[Dict], params: Dict, timeout: float):
+        """
+        Buka stream Groq dan baca sampai token pertama
+        
+        Timeout httpx hanya membatasi tiap read, jadi stream yang terus mengirim
+        chunk kosong bisa melewati deadline; waktu total sampai token pertama
+        dicek di setiap chunk.
+        
+        Returns:
+            (head, stream): stream tetap objek Stream Groq, supaya bisa ditutup
+            jika tidak dipakai (iterasi berikutnya melanjutkan setelah head)
+        """
+        deadline_at = time.monotonic() + timeout
+        stream = self.client.chat.completions.create(
+            messages=messages,
+            **params,
+            stream=True,
+            timeout=timeout
+        )
+        
+        head = []
+        for chunk in stream:
+            head.append(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                break
+            if time.monotonic() >= deadline_at:
+                stream.close()
+                raise DeadlineExceeded(f"Token pertama tidak datang dalam {timeout:.1f} detik")
+        return head, stream
+    
+    def _generation_params(self, route: Dict = None) -> Dict:
+        """Parameter generate Groq untuk route ini (dan catat keputusan routing)"""
+        route = route or {'name': 'default', 'model': self.model, 'max_tokens': 1024, 'temperature': 0.7}
+        self.metrics.record_route(route['name'], route['model'])
+        return {
+            'model': route['model'],
+            'temperature': route['temperature'],
+            'max_tokens': route['max_tokens'],
+            'top_p': 0.9
+        }
+    
+    def _groq_failure_reply(self, error: Exception, prompt: str, user_message: str,
+                            record: bool, fallback: str = None) -> str:
+        """Jawaban cadangan (dicatat ke history) jika ada, selain itu pesan error"""
+        if fallback is None:
+            return self._groq_error_response(error)
+        
+        self.metrics.record_event('fallback')
+        if record:
+            self.history.add_turn(user_message or prompt, fallback)
+        return fallback
+    
+    def _groq_error_response(self, error: Exception) -> str:
+        """Response jika panggilan ke Groq gagal"""
+        return f"⚠️ Error saat berkomunikasi dengan AI: {error}\n\nSilakan coba lagi atau hubungi kami di WhatsApp: {COMPANY_INFO['kontak']['whatsapp']}"
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.history.clear()
+        self.polished_replies.clear()
+        self._polish_queue.clear()
+    
+    def welcome_message(self) -> str:
+        """
+        Welcome message untuk sesi baru
+        
+        Di-generate sekali per proses (per versi data + model) di thread
+        background lalu dipakai semua sesi, jadi membuka halaman tidak pernah
+        menunggu Groq (selama belum siap, template yang dipakai). Pesan
+        dicatat ke history sebagai jawaban asisten.
+        
+        Returns:
+            Welcome message
+        """
+        # Factory tanpa referensi ke sesi ini (cache menyimpannya selama proses berjalan)
+        message = get_welcome_cache().get(
+            f"{self.knowledge_base.data_version}|{self.model}",
+            functools.partial(_generate_welcome_message, self._sync_client(), self.model,
+                              self.system_prompt, self.call_policy, self.metrics),
+            functools.partial(render_fallback_welcome, self.knowledge_base.company_info)
+        )
+        self.history.add("assistant", message)
+        return message
+    
+    def _sync_client(self):
+        """Groq client sync (untuk pekerjaan di thread background)"""
+        return self.client
     
     def get_conversation_summary(self) -> str:
         """Get summary of conversation"""
-        if not self.conversation_history:
+        if not len(self.history):
             return "Belum ada percakapan"
         
+        try:
+            response = self._call_groq(self._summary_prompt(), record=False,
+                                       route=self.router.get('summary'))
+            return response
+        except:
+            return "Tidak dapat membuat ringkasan"
+    
+    def _summary_prompt(self) -> str:
+        """Prompt untuk meringkas percakapan"""
         # Use Groq to summarize
-        summary_prompt = f"""Buatkan ringkasan singkat dari percakapan berikut:
+        return f"""Buatkan ringkasan singkat dari percakapan berikut:
 
-{json.dumps(self.conversation_history, indent=2)}
+{json.dumps(self.history.messages(), indent=2, ensure_ascii=False)}
 
 Ringkasan harus mencakup:
 - Topik utama yang dibahas
@@ -486,10 +1099,271 @@ Ringkasan harus mencakup:
 - Follow-up action (jika ada)
 
 Maksimal 3-4 kalimat."""
+
+
+class AsyncChatbotIntervisualAI(ChatbotIntervisualAI):
+    """
+    Versi asyncio dari ChatbotIntervisualAI
+    
+    Memakai AsyncGroq, jadi satu proses bisa melayani banyak percakapan
+    sekaligus tanpa satu thread per user. Query RAB & harga (pandas)
+    dijalankan di thread pool supaya tidak memblokir event loop.
+    """
+    
+    _welcome_client = None
+    
+    def __init__(self, *args, **kwargs):
+        # Task background (polish, prewarm) yang masih berjalan (disimpan supaya tidak di-garbage collect)
+        self._background_tasks = set()
+        # Client yang diberikan dari luar (None = AsyncGroq dibuat per event loop)
+        self._client = None
+        self._loop_clients = weakref.WeakKeyDictionary()
+        # Endpoint yang di-prewarm di setiap event loop yang dipakai engine ini
+        self._prewarm_target = None
+        self._prewarmed_loops = weakref.WeakSet()
+        super().__init__(*args, **kwargs)
+    
+    @property
+    def client(self):
+        """
+        AsyncGroq untuk event loop yang sedang berjalan
         
+        Pool koneksi async terikat ke event loop yang membukanya, jadi engine
+        yang dipakai di beberapa asyncio.run() mendapat client baru per loop.
+        """
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = AsyncGroq(api_key=self.api_key, base_url=self.base_url,
+                               http_client=get_async_http_client(), max_retries=0)
+            self._loop_clients[loop] = client
+        return client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    def _prewarm(self, base_url):
+        """Buka koneksi pool async di event loop yang berjalan (atau saat giliran async pertama)"""
+        self._prewarm_target = (base_url,)
         try:
-            response = self._call_groq(summary_prompt)
-            return response
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._start_prewarm()
+    
+    def _start_prewarm(self):
+        """Jadwalkan prewarm pool async di event loop ini (sekali per loop)"""
+        if self._prewarm_target is None:
+            return
+        loop = asyncio.get_running_loop()
+        if loop in self._prewarmed_loops:
+            return
+        self._prewarmed_loops.add(loop)
+        self._spawn(aprewarm_connections(*self._prewarm_target))
+    
+    def _spawn(self, coro):
+        """Jalankan coroutine sebagai task background di event loop ini"""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    def _create_client(self):
+        """AsyncGroq dibuat saat dipakai, per event loop (lihat property client)"""
+        return None
+    
+    def _sync_client(self):
+        """Groq client sync terpisah, karena welcome message di-generate di thread"""
+        if self._welcome_client is None:
+            self._welcome_client = Groq(api_key=self.api_key, base_url=self.base_url,
+                                       http_client=get_http_client(), max_retries=0)
+        return self._welcome_client
+    
+    def _schedule_polish(self, reply: str, messages: List[Dict], route: Dict):
+        """Jalankan polish AI sebagai task di event loop"""
+        self._spawn(self._apolish(reply, messages, route))
+    
+    async def _apolish(self, reply: str, messages: List[Dict], route: Dict):
+        """Versi async dari _polish() (jalan di event loop sesi, jadi hasilnya langsung diterapkan)"""
+        try:
+            params = self._generation_params(route)
+            with self.metrics.timer('polish'):
+                chat_completion = await self.call_policy.acall(
+                    lambda timeout: self.client.chat.completions.create(
+                        messages=messages,
+                        **params,
+                        stream=False,
+                        timeout=timeout
+                    ),
+                    metrics=self.metrics
+                )
+            self.metrics.record_usage(getattr(chat_completion, 'usage', None))
+            self._apply_polish(reply, chat_completion.choices[0].message.content)
+        except Exception as e:
+            self.metrics.record_error(e)
+    
+    async def welcome_message(self) -> str:
+        """Welcome message untuk sesi baru (async, tidak pernah menunggu Groq)"""
+        return super().welcome_message()
+    
+    async def chat(self, user_message: str) -> str:
+        """
+        Main chat function (async)
+        
+        Args:
+            user_message: Pesan dari user
+            
+        Returns:
+            Response dari chatbot
+        """
+        self._start_prewarm()
+        self.apply_polished()
+        try:
+            with self.metrics.timer('total'):
+                turn = await asyncio.to_thread(self._prepare_turn, user_message)
+                
+                local = self._local_reply(turn, user_message)
+                if local is not None:
+                    return local
+                
+                response = await self._call_groq(turn['prompt'], user_message,
+                                                 fallback=self._fallback_reply(turn), route=turn['route'])
+                self._store_reply(turn, user_message, response)
+                self.metrics.record_turn(turn['intent']['intent'], 'llm')
+                return response
+        
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Versi streaming dari chat() (async generator)
+        
+        Args:
+            user_message: Pesan dari user
+            
+        Yields:
+            Potongan teks response
+        """
+        self._start_prewarm()
+        self.apply_polished()
+        start = time.perf_counter()
+        try:
+            turn = await asyncio.to_thread(self._prepare_turn, user_message)
+        except Exception as e:
+            yield self._error_response(e)
+            return
+        
+        local = self._local_reply(turn, user_message)
+        if local is not None:
+            yield local
+            self.metrics.observe_stage('total', time.perf_counter() - start)
+            return
+        
+        parts = []
+        async for delta in self._call_groq_stream(turn['prompt'], user_message,
+                                                  self._fallback_reply(turn), turn['route']):
+            parts.append(delta)
+            yield delta
+        self._store_reply(turn, user_message, "".join(parts))
+        self.metrics.record_turn(turn['intent']['intent'], 'llm')
+        self.metrics.observe_stage('total', time.perf_counter() - start)
+    
+    async def _call_groq(self, prompt: str, user_message: str = None, record: bool = True,
+                         fallback: str = None, route: Dict = None) -> str:
+        """Call Groq API untuk generate response (async)"""
+        self.last_error = None
+        try:
+            messages = self._build_messages(prompt)
+            params = self._generation_params(route)
+            
+            with self.metrics.timer('llm'), self.metrics.model_timer(params['model']):
+                chat_completion = await self.call_policy.acall(
+                    lambda timeout: self.client.chat.completions.create(
+                        messages=messages,
+                        **params,
+                        stream=False,
+                        timeout=timeout
+                    ),
+                    metrics=self.metrics
+                )
+            self.metrics.record_usage(getattr(chat_completion, 'usage', None))
+            
+            assistant_message = chat_completion.choices[0].message.content
+            
+            if record:
+                self.history.add_turn(user_message or prompt, assistant_message)
+            
+            return assistant_message
+        
+        except Exception as e:
+            self.last_error = e
+            self.metrics.record_error(e)
+            return self._groq_failure_reply(e, prompt, user_message, record, fallback)
+    
+    async def _call_groq_stream(self, prompt: str, user_message: str = None,
+                                fallback: str = None, route: Dict = None) -> AsyncIterator[str]:
+        """Call Groq API dengan stream=True, yield delta teks (async)"""
+        self.last_error = None
+        parts = []
+        try:
+            messages = self._build_messages(prompt)
+            params = self._generation_params(route)
+            
+            start = time.perf_counter()
+            head, stream = await self.call_policy.acall(
+                lambda timeout: self._open_stream(messages, params, timeout),
+                hedge=False,
+                metrics=self.metrics
+            )
+            
+            async for chunk in _achain(head, stream):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if not parts:
+                        self.metrics.observe_stage('llm_first_token', time.perf_counter() - start)
+                    parts.append(delta)
+                    yield delta
+                self.metrics.record_usage(_chunk_usage(chunk))
+            self.metrics.observe_stage('llm', time.perf_counter() - start)
+            self.metrics.observe_model(params['model'], time.perf_counter() - start)
+            
+            self.history.add_turn(user_message or prompt, "".join(parts))
+        
+        except Exception as e:
+            self.last_error = e
+            self.metrics.record_error(e)
+            if parts:
+                yield self._groq_error_response(e)
+            else:
+                yield self._groq_failure_reply(e, prompt, user_message, True, fallback)
+    
+    async def _open_stream(self, messages: List[Dict], params: Dict, timeout: float):
+        """Buka stream Groq dan baca sampai token pertama (async, stream tetap objek AsyncStream)"""
+        stream = await self.client.chat.completions.create(
+            messages=messages,
+            **params,
+            stream=True,
+            timeout=timeout
+        )
+        
+        head = []
+        async for chunk in stream:
+            head.append(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                break
+        return head, stream
+    
+    async def get_conversation_summary(self) -> str:
+        """Get summary of conversation (async)"""
+        if not len(self.history):
+            return "Belum ada percakapan"
+        
+        try:
+            return await self._call_groq(self._summary_prompt(), record=False,
+                                          route=self.router.get('summary'))
         except:
             return "Tidak dapat membuat ringkasan"
 
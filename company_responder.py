@@ -0,0 +1,188 @@
+# company_responder.py
+# Jawaban cepat (tanpa AI) untuk pertanyaan info perusahaan dari COMPANY_INFO
+
+import re
+from typing import Dict, Mapping, Optional, Set
+
+# Topik info perusahaan → frasa pertanyaan pemicu (dicocokkan per kata utuh).
+# Kata benda umum ("kantor", "hp", "nomor") sengaja tidak dipakai sendirian.
+COMPANY_TOPICS = {
+    'alamat': ['alamat', 'alamatnya', 'lokasi', 'lokasinya', 'letak', 'di mana', 'dimana',
+               'share loc', 'sharelok'],
+    'kontak': ['whatsapp', 'nomor wa', 'no wa', 'wa nya', 'nomor whatsapp', 'nomor hp', 'no hp',
+               'nomor telepon', 'nomor telpon', 'nomor telp', 'no telp', 'no telepon', 'telepon',
+               'telpon', 'kontak', 'kontaknya', 'cara menghubungi', 'hubungi', 'customer service',
+               'nomor cs', 'no cs'],
+    'email': ['email', 'e-mail', 'surel', 'alamat email'],
+    'layanan': ['layanan', 'layanannya', 'jasa apa', 'jasa apa saja', 'melayani apa'],
+    'website': ['website', 'situs', 'instagram', 'ig', 'facebook', 'fb', 'youtube', 'twitter',
+                'sosmed', 'media sosial'],
+    'promo': ['promo', 'promonya', 'diskon'],
+}
+
+# Kata yang boleh menyertai frasa pemicu tanpa mengubah pertanyaannya ("alamat kantornya
+# di mana ya kak?"). Kata lain ("kantor buka jam berapa", "alamat email saya salah")
+# berarti yang ditanya bukan isi template → serahkan ke AI.
+NEUTRAL_WORDS = {
+    'berapa', 'apa', 'apakah', 'mana', 'ya', 'dong', 'deh', 'sih', 'nih', 'kah', 'kak', 'min', 'gan',
+    'mas', 'mbak', 'pak', 'bu', 'admin', 'mohon', 'tolong', 'minta', 'boleh', 'bisa', 'info',
+    'informasi', 'tanya', 'nanya', 'mau', 'ingin', 'saya', 'aku', 'kami', 'anda', 'kalian', 'kamu',
+    'yang', 'dan', 'atau', 'untuk', 'ke', 'di', 'dari', 'nya', 'ada', 'punya', 'saja', 'aja',
+    'lengkap', 'lengkapnya', 'resmi', 'utama', 'terbaru', 'sekarang', 'ini', 'itu', 'bulan',
+    'pt', 'intervisual', 'perusahaan', 'kantor', 'kantornya', 'office', 'workshop', 'cs',
+    'halo', 'hai', 'hi', 'selamat', 'pagi', 'siang', 'sore', 'malam', 'terima', 'kasih',
+    'konsultasi', 'gratis', 'bisnis', 'akun', 'official',
+}
+
+# Keyword on-topic yang masih termasuk "info perusahaan" (plus "berapa" untuk
+# "nomor WA berapa?"). Jika ada keyword on-topic lain (mis. renovasi, harga),
+# pertanyaan dianggap bukan murni info perusahaan dan diteruskan ke AI.
+COMPANY_KEYWORDS = {
+    'intervisual', 'pt intervisual', 'perusahaan', 'kantor', 'alamat', 'kontak',
+    'layanan', 'promo', 'gratis', 'konsultasi', 'berapa',
+}
+
+# Kata yang menandakan pertanyaan butuh penjelasan, bukan sekadar info
+EXPLANATION_WORDS = ['kenapa', 'mengapa', 'bagaimana', 'gimana', 'cara', 'beda', 'bandingkan',
+                     'lebih bagus', 'rekomendasi', 'saran', 'pengalaman']
+
+# Pertanyaan panjang biasanya gabungan beberapa hal → serahkan ke AI
+MAX_WORDS = 12
+
+
+def _word_pattern(phrases) -> re.Pattern:
+    """Regex untuk mencocokkan salah satu frasa sebagai kata utuh"""
+    alternatives = '|'.join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(r'(?<![a-z0-9])(?:' + alternatives + r')(?![a-z0-9])')
+
+
+class CompanyInfoResponder:
+    """
+    Fast path untuk pertanyaan info perusahaan (alamat, kontak, email, layanan, dll)
+
+    Jawaban dirender sekali dari COMPANY_INFO saat init, jadi menjawab
+    cukup lookup template. Hanya dipakai jika pertanyaannya jelas satu topik
+    dan selain frasa pemicu hanya berisi kata netral; pertanyaan gabungan,
+    ambigu, atau yang menanyakan hal lain tetap diteruskan ke AI.
+    """
+
+    def __init__(self, company_info: Mapping):
+        """
+        Args:
+            company_info: Data perusahaan (format COMPANY_INFO)
+        """
+        self._topic_patterns = {topic: _word_pattern(words) for topic, words in COMPANY_TOPICS.items()}
+        self._explanation_pattern = _word_pattern(EXPLANATION_WORDS)
+        self._answers = self._render_answers(company_info)
+
+    def detect_topics(self, message: str) -> Set[str]:
+        """Topik info perusahaan yang disebut di pesan"""
+        message_lower = message.lower()
+        return {topic for topic, pattern in self._topic_patterns.items() if pattern.search(message_lower)}
+
+    def answer(self, message: str, matches: Dict[str, set]) -> Optional[str]:
+        """
+        Jawab pertanyaan info perusahaan tanpa AI
+
+        Args:
+            message: Pesan dari user
+            matches: Hasil scan keyword engine (grup 'allowed', dll)
+
+        Returns:
+            Jawaban siap kirim, atau None jika harus diteruskan ke AI
+        """
+        message_lower = message.lower()
+
+        if len(message_lower.split()) > MAX_WORDS:
+            return None
+
+        # Ada topik konstruksi/interior/harga → bukan murni info perusahaan
+        if matches['allowed'] - COMPANY_KEYWORDS:
+            return None
+
+        if self._explanation_pattern.search(message_lower):
+            return None
+
+        topics = self.detect_topics(message_lower)
+
+        # "alamat email" → yang ditanya email, bukan alamat kantor
+        if topics == {'alamat', 'email'} and 'alamat email' in message_lower:
+            topics = {'email'}
+
+        # Harus tepat satu topik, selain itu (gabungan/ambigu) serahkan ke AI
+        if len(topics) != 1:
+            return None
+        topic = topics.pop()
+
+        # Sisa kalimat selain frasa pemicu harus kata netral; selain itu template tidak menjawabnya
+        rest = self._topic_patterns[topic].sub(' ', message_lower)
+        if set(re.findall(r'[a-z0-9]+', rest)) - NEUTRAL_WORDS:
+            return None
+
+        return self._answers[topic]
+
+    @staticmethod
+    def _render_answers(info: Mapping) -> Dict[str, str]:
+        """Render jawaban untuk setiap topik dari data perusahaan"""
+        kontak = info['kontak']
+        kantor = info['lokasi_kantor']
+
+        penutup = (
+            f"\n\nAda yang bisa kami bantu lagi? Konsultasi GRATIS via WhatsApp "
+            f"{kontak['whatsapp']} ({kontak['whatsapp_link']}) 😊"
+        )
+
+        nama_kantor = {
+            'head_office': 'Head Office',
+            'brand_office_1': 'Brand Office 1',
+            'brand_office_2': 'Brand Office 2',
+        }
+
+        alamat = "📍 Lokasi kantor PT Intervisual:\n"
+        for key, office in kantor.items():
+            alamat += f"\n🏢 **{nama_kantor.get(key, key)}**\n{office['alamat']}\n📞 {office['telepon']}\n"
+
+        kontak_text = (
+            "📞 Kontak PT Intervisual:\n\n"
+            f"📱 WhatsApp: {kontak['whatsapp']} ({kontak['whatsapp_link']})\n"
+            f"☎️ Telepon Head Office: {kantor['head_office']['telepon']}\n"
+            f"📧 Email: {kontak['email']}\n"
+            f"🌐 Website: {kontak['website']}"
+        )
+
+        email = (
+            f"📧 Email PT Intervisual: {kontak['email']}\n\n"
+            f"Untuk respon lebih cepat, bisa juga via WhatsApp {kontak['whatsapp']}."
+        )
+
+        layanan = "🛠️ Layanan PT Intervisual:\n"
+        for i, item in enumerate(info['layanan_utama'], 1):
+            layanan += f"\n{i}. **{item['nama']}** - {item['deskripsi']}"
+
+        website = (
+            "🌐 Website & media sosial PT Intervisual:\n\n"
+            f"• Website: {kontak['website']}\n"
+            f"• Instagram: {kontak['instagram']}\n"
+            f"• Facebook: {kontak['facebook']}\n"
+            f"• YouTube: {kontak['youtube']}\n"
+            f"• Twitter: {kontak['twitter']}"
+        )
+
+        promo_info = info['promo']
+        promo = (
+            "🎁 Promo PT Intervisual:\n\n"
+            f"• {promo_info['jenis']}\n"
+            + ("• Konsultasi GRATIS\n" if promo_info['konsultasi_gratis'] else "")
+            + f"• Cara mendapatkan: {promo_info['cara_dapatkan']}\n\n"
+            f"ℹ️ {promo_info['catatan']}"
+        )
+
+        answers = {
+            'alamat': alamat.rstrip(),
+            'kontak': kontak_text,
+            'email': email,
+            'layanan': layanan,
+            'website': website,
+            'promo': promo,
+        }
+        return {topic: text + penutup for topic, text in answers.items()}
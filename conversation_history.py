@@ -0,0 +1,141 @@
+# conversation_history.py
+# History percakapan dengan batas token + ringkasan bergulir untuk turn lama
+
+import os
+import threading
+from typing import Dict, List
+
+# Batas token untuk history (di luar system prompt)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "2000"))
+
+# Jumlah pesan terakhir yang selalu disimpan utuh
+DEFAULT_KEEP_RECENT = 4
+
+# Batas token untuk ringkasan turn lama
+DEFAULT_SUMMARY_BUDGET = 400
+
+# Panjang maksimal satu baris ringkasan (karakter)
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimasi jumlah token (kira-kira 4 karakter per token)"""
+    return max(1, len(text) // 4)
+
+
+class ConversationHistory:
+    """
+    History percakapan dengan batas token
+
+    - Pesan terbaru disimpan utuh
+    - Pesan lama dipadatkan jadi ringkasan bergulir (satu baris per pesan)
+    - Yang disimpan adalah pesan asli user, bukan prompt yang sudah
+      ditambah data RAB/harga, jadi ukuran prompt tetap terbatas
+    - Thread-safe: semua baca/tulis lewat satu lock (jawaban yang dirapikan
+      di thread lain tidak bentrok dengan giliran baru)
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 keep_recent: int = DEFAULT_KEEP_RECENT,
+                 summary_budget: int = DEFAULT_SUMMARY_BUDGET):
+        """
+        Args:
+            token_budget: Batas total token untuk pesan + ringkasan
+            keep_recent: Jumlah pesan terakhir yang tidak pernah dipadatkan
+            summary_budget: Batas token untuk ringkasan
+        """
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summary_budget = summary_budget
+
+        self.turns: List[Dict] = []
+        self.summary_lines: List[str] = []
+        self._turn_tokens = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.turns)
+
+    def add(self, role: str, content: str):
+        """Tambahkan satu pesan lalu padatkan jika melebihi budget"""
+        with self._lock:
+            self.turns.append({"role": role, "content": content})
+            self._turn_tokens += estimate_tokens(content)
+            self._compact()
+
+    def add_turn(self, user_message: str, assistant_message: str):
+        """Tambahkan satu giliran (pesan user + jawaban asisten)"""
+        with self._lock:
+            self.add("user", user_message)
+            self.add("assistant", assistant_message)
+
+    def replace(self, role: str, old_content: str, new_content: str) -> bool:
+        """
+        Ganti isi pesan terbaru yang cocok (mis. jawaban yang dirapikan belakangan)
+
+        Returns:
+            True jika pesan ditemukan (pesan yang sudah dipadatkan tidak diganti)
+        """
+        with self._lock:
+            for message in reversed(self.turns):
+                if message["role"] == role and message["content"] == old_content:
+                    message["content"] = new_content
+                    self._turn_tokens += estimate_tokens(new_content) - estimate_tokens(old_content)
+                    self._compact()
+                    return True
+            return False
+
+    def clear(self):
+        """Hapus semua history dan ringkasan"""
+        with self._lock:
+            self.turns = []
+            self.summary_lines = []
+            self._turn_tokens = 0
+
+    @property
+    def summary(self) -> str:
+        """Ringkasan turn lama yang sudah dipadatkan"""
+        with self._lock:
+            if not self.summary_lines:
+                return ""
+            return "Ringkasan percakapan sebelumnya:\n" + "\n".join(self.summary_lines)
+
+    def get_turns(self) -> List[Dict]:
+        """Salinan pesan yang masih disimpan utuh (tanpa ringkasan)"""
+        with self._lock:
+            return [dict(message) for message in self.turns]
+
+    def messages(self) -> List[Dict]:
+        """Messages untuk dikirim ke LLM (ringkasan + pesan terbaru)"""
+        with self._lock:
+            turns = self.get_turns()
+            if not self.summary_lines:
+                return turns
+            return [{"role": "system", "content": self.summary}] + turns
+
+    def token_count(self) -> int:
+        """Estimasi total token history saat ini"""
+        with self._lock:
+            summary = self.summary
+            return self._turn_tokens + (estimate_tokens(summary) if summary else 0)
+
+    def _compact(self):
+        """Pindahkan pesan lama ke ringkasan sampai masuk budget (dipanggil dengan lock dipegang)"""
+        while self.token_count() > self.token_budget and len(self.turns) > self.keep_recent:
+            oldest = self.turns.pop(0)
+            self._turn_tokens -= estimate_tokens(oldest["content"])
+            self.summary_lines.append(self._summarize(oldest))
+
+        # Ringkasan juga dibatasi, baris paling lama dibuang dulu
+        while self.summary_lines and estimate_tokens(self.summary) > self.summary_budget:
+            self.summary_lines.pop(0)
+
+    @staticmethod
+    def _summarize(message: Dict) -> str:
+        """Ringkas satu pesan jadi satu baris pendek"""
+        speaker = "User" if message["role"] == "user" else "Asisten"
+        text = " ".join(message["content"].split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+        return f"- {speaker}: {text}"
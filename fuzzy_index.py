@@ -0,0 +1,247 @@
+# fuzzy_index.py
+# Index fuzzy untuk nama item interior: sinonim, inverted index token, dan kamus edit-distance (SymSpell)
+
+import heapq
+import re
+import threading
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+# Frasa yang ditulis berbeda → bentuk baku (diganti sebelum dipecah jadi token)
+PHRASE_SYNONYMS = {
+    'wall paper': 'wallpaper',
+    'kitchenset': 'kitchen set',
+    'kitchen cabinet': 'kitchen set',
+    'lemari dapur': 'kitchen set',
+    'down light': 'downlight',
+    'water closet': 'closet',
+    'toilet duduk': 'closet',
+    'lemari pakaian': 'lemari',
+    'plafond': 'plafon',
+}
+
+# Token Inggris / variasi ejaan → token baku
+TOKEN_SYNONYMS = {
+    'granite': 'granit',
+    'marble': 'marmer',
+    'ceramic': 'keramik',
+    'ceramics': 'keramik',
+    'tile': 'keramik',
+    'tiles': 'keramik',
+    'parquet': 'parket',
+    'kloset': 'closet',
+    'toilet': 'closet',
+    'wc': 'closet',
+    'sink': 'wastafel',
+    'washtafel': 'wastafel',
+    'westafel': 'wastafel',
+    'lamp': 'lampu',
+    'light': 'lampu',
+    'lighting': 'lampu',
+    'door': 'pintu',
+    'window': 'jendela',
+    'wardrobe': 'lemari',
+    'cabinet': 'lemari',
+    'table': 'meja',
+    'desk': 'meja',
+    'paint': 'cat',
+    'ceiling': 'plafon',
+    'gipsum': 'gypsum',
+    'wall': 'tembok',
+    'dinding': 'tembok',
+    'wood': 'kayu',
+    'design': 'desain',
+    'klasik': 'classic',
+    'skandinavia': 'scandinavian',
+    'minimalist': 'minimalis',
+}
+
+# Kata yang tidak ikut dicocokkan
+STOPWORDS = {'dan', 'untuk', 'yang', 'per', 'harga', 'biaya', 'berapa', 'the', 'of', 'and'}
+
+# Jarak edit maksimal (kata pendek lebih ketat supaya tidak asal cocok)
+MAX_DISTANCE = 2
+SHORT_TOKEN_LENGTH = 4
+
+
+def _max_distance(token: str, max_distance: int = MAX_DISTANCE) -> int:
+    if len(token) <= 2:
+        return 0
+    if len(token) <= SHORT_TOKEN_LENGTH:
+        return min(1, max_distance)
+    return max_distance
+
+
+def _deletes(token: str, distance: int) -> set:
+    """Semua variasi token dengan menghapus sampai `distance` karakter (termasuk token itu sendiri)"""
+    variants = {token}
+    frontier = {token}
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Jarak Damerau-Levenshtein (optimal string alignment)
+
+    Berhenti lebih awal jika jarak pasti > limit (hasilnya limit + 1).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Pencarian nama item yang tahan typo, beda ejaan, dan bahasa Inggris
+
+    - Teks dinormalisasi dengan peta sinonim ("granite" → "granit", "wall paper" → "wallpaper")
+    - Token → daftar item yang mengandungnya (inverted index)
+    - Kamus SymSpell: variasi hapus-karakter setiap token, jadi token yang
+      salah ketik ("kramik") ditemukan tanpa membandingkan ke semua token
+
+    Skor item = 2 × (jumlah skor token yang cocok) / (token query + token nama),
+    dengan skor token 1.0 untuk sama persis dan berkurang sesuai jarak edit.
+    """
+
+    def __init__(self, names: Sequence[str], max_distance: int = MAX_DISTANCE,
+                 phrase_synonyms: Mapping[str, str] = None, token_synonyms: Mapping[str, str] = None):
+        """
+        Args:
+            names: Nama item (posisi di list = row id)
+            max_distance: Jarak edit maksimal per token
+            phrase_synonyms: Peta frasa → frasa baku (default: PHRASE_SYNONYMS)
+            token_synonyms: Peta token → token baku (default: TOKEN_SYNONYMS)
+        """
+        self.max_distance = max_distance
+        self.phrase_synonyms = dict(PHRASE_SYNONYMS if phrase_synonyms is None else phrase_synonyms)
+        self.token_synonyms = dict(TOKEN_SYNONYMS if token_synonyms is None else token_synonyms)
+
+        phrases = sorted(self.phrase_synonyms, key=len, reverse=True)
+        self._phrase_pattern = re.compile(
+            r'(?<![a-z0-9])(?:' + '|'.join(re.escape(phrase) for phrase in phrases) + r')(?![a-z0-9])'
+        ) if phrases else None
+
+        self._postings: Dict[str, List[int]] = {}
+        self._name_sizes: List[int] = []
+        self._name_tokens: List[Tuple[str, ...]] = []
+        for row, name in enumerate(names):
+            tokens = set(self.tokenize(name))
+            self._name_sizes.append(max(1, len(tokens)))
+            self._name_tokens.append(tuple(tokens))
+            for token in tokens:
+                self._postings.setdefault(token, []).append(row)
+
+        # Kamus SymSpell: variasi hapus-karakter → token asli
+        self._deletes: Dict[str, List[str]] = {}
+        for token in self._postings:
+            for variant in _deletes(token, _max_distance(token, max_distance)):
+                self._deletes.setdefault(variant, []).append(token)
+
+        # Memo token query → token index yang cocok (index dipakai bersama semua sesi)
+        self._token_matches: Dict[str, List[Tuple[str, float]]] = {}
+        self._memo_lock = threading.Lock()
+
+    def tokenize(self, text: str) -> List[str]:
+        """Normalisasi teks jadi token baku (sinonim diterapkan, stopword dibuang)"""
+        text = ' '.join(re.findall(r'[a-z0-9]+', str(text).lower()))
+        if self._phrase_pattern is not None:
+            text = self._phrase_pattern.sub(lambda match: self.phrase_synonyms[match.group(0)], text)
+
+        tokens = []
+        for token in text.split():
+            token = self.token_synonyms.get(token, token)
+            if token not in STOPWORDS:
+                tokens.extend(token.split())
+        return tokens
+
+    def _match_token(self, token: str) -> List[Tuple[str, float]]:
+        """Token di index yang mirip token query, beserta skornya (di-cache)"""
+        matches = self._token_matches.get(token)
+        if matches is not None:
+            return matches
+
+        if token in self._postings:
+            matches = [(token, 1.0)]
+        else:
+            limit = _max_distance(token, self.max_distance)
+            candidates = set()
+            for variant in _deletes(token, limit):
+                candidates.update(self._deletes.get(variant, ()))
+
+            matches = []
+            for candidate in candidates:
+                distance = edit_distance(token, candidate, limit)
+                if distance <= min(limit, _max_distance(candidate, self.max_distance)):
+                    matches.append((candidate, 1.0 - distance / max(len(token), len(candidate))))
+
+        with self._memo_lock:
+            if len(self._token_matches) < 10000:
+                self._token_matches[token] = matches
+        return matches
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Cari item yang paling mirip dengan query
+
+        Args:
+            query: Teks query
+            limit: Jumlah kandidat maksimal
+
+        Returns:
+            List (row id, skor 0-1) urut dari skor tertinggi (row id kecil duluan jika seri)
+        """
+        tokens = list(dict.fromkeys(self.tokenize(query)))
+        if not tokens:
+            return []
+
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            best: Dict[int, float] = {}
+            for candidate, score in self._match_token(token):
+                for row in self._postings[candidate]:
+                    if score > best.get(row, 0.0):
+                        best[row] = score
+            for row, score in best.items():
+                scores[row] = scores.get(row, 0.0) + score
+
+        return heapq.nsmallest(
+            limit,
+            ((row, 2 * total / (len(tokens) + self._name_sizes[row])) for row, total in scores.items()),
+            key=lambda item: (-item[1], item[0])
+        )
+
+    def find_in(self, text: str) -> List[int]:
+        """
+        Item yang semua token namanya ada di dalam text (setelah sinonim), tanpa toleransi typo
+
+        Dipakai untuk mencocokkan judul produk ("Granite Tile Indogress 60x60") ke item katalog.
+
+        Returns:
+            List row id, urut dari item yang muncul paling awal di text, lalu nama terpanjang
+        """
+        positions: Dict[str, int] = {}
+        for position, token in enumerate(self.tokenize(text)):
+            positions.setdefault(token, position)
+
+        rows = {row for token in positions for row in self._postings.get(token, ())}
+        matched = [row for row in rows if all(token in positions for token in self._name_tokens[row])]
+        return sorted(matched, key=lambda row: (
+            min(positions[token] for token in self._name_tokens[row]),
+            -len(self._name_tokens[row]),
+            row
+        ))
@@ -0,0 +1,326 @@
+# groq_stub_server.py
+# Stub server lokal yang meniru endpoint chat completions Groq (untuk load test tanpa network)
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+# Path endpoint Groq (SDK memanggil <base_url>/openai/v1/chat/completions)
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+# Kalimat untuk menyusun response palsu
+_STUB_WORDS = (
+    "Terima kasih sudah menghubungi PT Intervisual. Untuk pekerjaan tersebut kisaran "
+    "harganya bergantung pada material, luas area, dan tingkat kesulitan. Silakan "
+    "konsultasi gratis dengan tim kami supaya estimasinya lebih akurat."
+).split()
+
+
+class StubConfig:
+    """
+    Perilaku stub server
+
+    Args:
+        ttft: Waktu sampai token pertama (detik)
+        tokens_per_sec: Kecepatan token setelah token pertama
+        completion_tokens: Jumlah token per response
+        jitter: Variasi acak TTFT (fraksi, mis. 0.2 = ±20%)
+        error_rate: Peluang response 500
+        rate_limit_rate: Peluang response 429 acak
+        requests_per_minute: Batas request per menit (0 = tanpa batas), lebih dari itu → 429
+        dribble_interval: Kirim chunk kosong tiap sekian detik sebelum token pertama
+            (0 = mati), untuk mensimulasikan stream yang menetes pelan
+    """
+
+    def __init__(self, ttft: float = 0.3, tokens_per_sec: float = 250.0,
+                 completion_tokens: int = 120, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 requests_per_minute: int = 0, dribble_interval: float = 0.0):
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.completion_tokens = completion_tokens
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.dribble_interval = dribble_interval
+
+
+class _RateLimiter:
+    """Token bucket sederhana untuk batas request per menit"""
+
+    def __init__(self, requests_per_minute: int):
+        self.capacity = requests_per_minute
+        self.tokens = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> Tuple[bool, float]:
+        """Ambil satu slot. Returns (diizinkan, detik sampai slot berikutnya)"""
+        if not self.capacity:
+            return True, 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True, 0.0
+            return False, (1.0 - self.tokens) / self.rate
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server dengan config, rate limiter, dan statistik bersama"""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, _StubHandler)
+        self.config = config
+        self.rate_limiter = _RateLimiter(config.requests_per_minute)
+        self.random = random.Random()
+        self.stats = {'requests': 0, 'streamed': 0, 'errors': 0, 'rate_limited': 0}
+        self.stats_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Client yang sudah berhenti menunggu (timeout/hedging) bukan error stub
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def count(self, key: str):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def log_message(self, format, *args):
+        # Log per request dimatikan supaya tidak membebani load test
+        pass
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.server.stats_lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, _error_body("Not found", "not_found"))
+
+    def do_HEAD(self):
+        # Dipakai untuk pre-warm koneksi
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        if self.path != COMPLETIONS_PATH:
+            self._send_json(404, _error_body("Not found", "not_found"))
+            return
+
+        server = self.server
+        config = server.config
+        server.count('requests')
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, _error_body("Invalid JSON", "invalid_request_error"))
+            return
+
+        # Rate limit (batas per menit lalu 429 acak)
+        allowed, retry_after = server.rate_limiter.acquire()
+        if not allowed or server.random.random() < config.rate_limit_rate:
+            server.count('rate_limited')
+            self._send_json(429, _error_body("Rate limit reached", "rate_limit_exceeded"),
+                            {"retry-after": f"{max(retry_after, 1.0):.0f}"})
+            return
+
+        if server.random.random() < config.error_rate:
+            server.count('errors')
+            self._send_json(500, _error_body("Internal server error", "internal_server_error"))
+            return
+
+        model = request.get("model", "stub-model")
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in request.get("messages", [])) // 4
+        completion_tokens = min(config.completion_tokens, int(request.get("max_tokens") or config.completion_tokens))
+        words = [_STUB_WORDS[i % len(_STUB_WORDS)] for i in range(completion_tokens)]
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+        }
+
+        jitter = 1.0 + config.jitter * (2 * server.random.random() - 1)
+        ttft = max(0.0, config.ttft * jitter)
+
+        if request.get("stream"):
+            server.count('streamed')
+            self._stream(model, words, usage, ttft)
+        else:
+            time.sleep(ttft + max(0, completion_tokens - 1) / config.tokens_per_sec)
+            self._send_json(200, {
+                'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': " ".join(words)},
+                    'finish_reason': 'stop',
+                }],
+                'usage': usage,
+            })
+
+    def _stream(self, model: str, words, usage: Dict, ttft: float):
+        """Kirim response sebagai server-sent events (chunked transfer)"""
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        def chunk(delta: Dict, finish_reason=None, extra: Dict = None) -> Dict:
+            data = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            if extra:
+                data.update(extra)
+            return data
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            self._write_event(chunk({'role': 'assistant', 'content': ''}))
+            dribble = self.server.config.dribble_interval
+            if dribble > 0:
+                first_token_at = time.monotonic() + ttft
+                while time.monotonic() + dribble < first_token_at:
+                    time.sleep(dribble)
+                    self._write_event(chunk({'content': ''}))
+                time.sleep(max(0.0, first_token_at - time.monotonic()))
+            else:
+                time.sleep(ttft)
+
+            interval = 1.0 / self.server.config.tokens_per_sec
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(interval)
+                self._write_event(chunk({'content': word if not i else ' ' + word}))
+
+            # Groq mengirim usage di chunk terakhir lewat field x_groq
+            self._write_event(chunk({}, 'stop', {'x_groq': {'id': completion_id, 'usage': usage}}))
+            self._write_raw(b"data: [DONE]\n\n")
+            self._write_raw(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client berhenti membaca stream
+            self.close_connection = True
+
+    def _write_event(self, data: Dict):
+        self._write_raw(f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+
+    def _write_raw(self, payload: bytes):
+        """Tulis satu chunk (chunk kosong = akhir body)"""
+        self.wfile.write(f"{len(payload):X}\r\n".encode('ascii') + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: Dict, headers: Dict = None):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _error_body(message: str, code: str) -> Dict:
+    """Format error seperti API Groq/OpenAI"""
+    return {'error': {'message': message, 'type': code, 'code': code}}
+
+
+def start_stub_server(config: StubConfig = None, host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """
+    Jalankan stub server di thread background
+
+    Args:
+        config: Perilaku stub (default: StubConfig())
+        host: Host yang di-bind
+        port: Port (0 = pilih port kosong)
+
+    Returns:
+        StubServer yang sedang berjalan (pakai server.base_url, stop dengan server.shutdown())
+    """
+    server = StubServer((host, port), config or StubConfig())
+    thread = threading.Thread(target=server.serve_forever, name="groq-stub", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub server lokal yang meniru API chat completions Groq")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Waktu sampai token pertama (detik)")
+    parser.add_argument("--tokens-per-sec", type=float, default=250.0, help="Kecepatan token")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="Token per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variasi acak TTFT (fraksi)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang response 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Peluang response 429 acak")
+    parser.add_argument("--rpm", type=int, default=0, help="Batas request per menit (0 = tanpa batas)")
+    parser.add_argument("--dribble-interval", type=float, default=0.0,
+                        help="Chunk kosong tiap sekian detik sebelum token pertama (0 = mati)")
+    parser.add_argument("--seed", type=int, help="Seed random untuk injeksi error")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        ttft=args.ttft,
+        tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        requests_per_minute=args.rpm,
+        dribble_interval=args.dribble_interval,
+    )
+
+    server = StubServer((args.host, args.port), config)
+    if args.seed is not None:
+        server.random.seed(args.seed)
+
+    print(f"🚀 Groq stub server berjalan di {server.base_url}")
+    print(f"   Set GROQ_BASE_URL={server.base_url} untuk mengarahkan chatbot ke stub ini")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stub server dihentikan")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
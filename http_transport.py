@@ -0,0 +1,167 @@
+# http_transport.py
+# Connection pool HTTP bersama untuk semua Groq client dalam satu proses
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional, Set
+
+import httpx
+from groq import DefaultHttpxClient, DefaultAsyncHttpxClient
+
+# Batas pool koneksi (dipakai bersama semua sesi)
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("GROQ_POOL_MAX_CONNECTIONS", "100"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("GROQ_POOL_MAX_KEEPALIVE", "20"))
+
+# Berapa lama koneksi idle disimpan (detik)
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_POOL_KEEPALIVE_EXPIRY", "60"))
+
+# HTTP/2 (butuh package h2: pip install httpx[http2])
+DEFAULT_HTTP2 = os.getenv("GROQ_HTTP2", "0") == "1"
+
+# Jumlah koneksi yang dibuka duluan saat engine pertama dibuat (0 = tidak pre-warm)
+DEFAULT_PREWARM_CONNECTIONS = int(os.getenv("GROQ_PREWARM_CONNECTIONS", "2"))
+
+# Endpoint default Groq SDK
+GROQ_DEFAULT_BASE_URL = "https://api.groq.com"
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+    )
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 hanya dipakai jika diminta dan package h2 tersedia"""
+    if not DEFAULT_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        print("⚠️ Warning: GROQ_HTTP2=1 tapi package h2 tidak ada, pakai HTTP/1.1 (pip install httpx[http2])")
+        return False
+
+
+_http_client = None
+# Pool async per event loop (koneksi async terikat ke loop yang membukanya)
+_async_http_clients = weakref.WeakKeyDictionary()
+# Endpoint yang sudah di-prewarm: pool sync, dan per event loop untuk pool async
+_prewarmed: Set[str] = set()
+_async_prewarmed = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Ambil HTTP client sync bersama (satu pool koneksi per proses)
+
+    Semua engine memakai pool yang sama, jadi sesi baru langsung dapat
+    koneksi keep-alive yang sudah terbuka tanpa TCP/TLS handshake lagi.
+    """
+    global _http_client
+
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = DefaultHttpxClient(limits=_pool_limits(), http2=_http2_enabled())
+
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Ambil HTTP client async bersama untuk event loop yang sedang berjalan
+
+    Koneksi async terikat ke event loop yang membukanya, jadi setiap loop
+    punya pool sendiri (dipakai bersama semua engine di loop itu). Pool milik
+    loop yang sudah ditutup (mis. asyncio.run() sebelumnya) dibuang.
+
+    Harus dipanggil dari dalam event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        with _lock:
+            client = _async_http_clients.get(loop)
+            if client is None:
+                for closed in [other for other in _async_http_clients if other.is_closed()]:
+                    del _async_http_clients[closed]
+                client = DefaultAsyncHttpxClient(limits=_pool_limits(), http2=_http2_enabled())
+                _async_http_clients[loop] = client
+
+    return client
+
+
+def _claim_prewarm(prewarmed: Set[str], base_url: Optional[str], connections: int) -> Optional[str]:
+    """Tandai endpoint sebagai sudah di-prewarm untuk satu pool (None jika tidak perlu prewarm)"""
+    base_url = str(base_url or GROQ_DEFAULT_BASE_URL)
+    if connections <= 0:
+        return None
+
+    with _lock:
+        if base_url in prewarmed:
+            return None
+        prewarmed.add(base_url)
+    return base_url
+
+
+def prewarm_connections(base_url: str = None, connections: int = DEFAULT_PREWARM_CONNECTIONS):
+    """
+    Buka beberapa koneksi ke endpoint Groq di pool sync, di background (sekali per endpoint)
+
+    Request ringan (HEAD) hanya untuk menyelesaikan DNS + TCP + TLS; status
+    response tidak penting. Koneksinya lalu tersimpan di pool untuk giliran
+    chat pertama.
+
+    Args:
+        base_url: Endpoint Groq (default: api.groq.com)
+        connections: Jumlah koneksi yang dibuka
+    """
+    base_url = _claim_prewarm(_prewarmed, base_url, connections)
+    if base_url is None:
+        return
+
+    client = get_http_client()
+
+    def warm():
+        try:
+            client.head(base_url, timeout=5.0)
+        except Exception:
+            pass
+
+    # Satu thread per koneksi, supaya request-nya paralel dan membuka koneksi terpisah
+    for _ in range(connections):
+        threading.Thread(target=warm, name="groq-prewarm", daemon=True).start()
+
+
+async def aprewarm_connections(base_url: str = None, connections: int = DEFAULT_PREWARM_CONNECTIONS):
+    """
+    Versi async dari prewarm_connections() untuk pool async event loop ini
+    (sekali per endpoint per event loop)
+
+    Args:
+        base_url: Endpoint Groq (default: api.groq.com)
+        connections: Jumlah koneksi yang dibuka
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        prewarmed = _async_prewarmed.setdefault(loop, set())
+    base_url = _claim_prewarm(prewarmed, base_url, connections)
+    if base_url is None:
+        return
+
+    client = get_async_http_client()
+
+    async def warm():
+        try:
+            await client.head(base_url, timeout=5.0)
+        except Exception:
+            pass
+
+    # Request bersamaan, supaya masing-masing membuka koneksi terpisah
+    await asyncio.gather(*(warm() for _ in range(connections)))
@@ -0,0 +1,90 @@
+# keyword_matcher.py
+# Multi-pattern keyword matcher untuk filtering topik & deteksi intent
+
+import re
+from typing import Dict, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Matcher untuk banyak grup keyword sekaligus
+
+    Semua keyword dikompilasi sekali jadi satu regex, lalu setiap pesan
+    cukup di-scan satu kali untuk menemukan keyword dari semua grup.
+    Hasilnya sama dengan mengecek `keyword in text` untuk setiap keyword.
+
+    Cara kerja:
+    - Semua keyword disusun jadi trie lalu diubah ke regex lookahead
+      `(?=(...))` yang dicoba di setiap posisi teks. Karena bentuknya trie,
+      setiap posisi hanya mengikuti satu cabang karakter, dan yang tertangkap
+      adalah keyword terpanjang yang mulai di posisi itu.
+    - Keyword lain yang cocok di posisi yang sama pasti lebih pendek dan
+      merupakan bagian dari keyword terpanjang tadi, jadi cukup ditambahkan
+      dari tabel "keyword → keyword yang terkandung di dalamnya".
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        """
+        Args:
+            groups: Nama grup → daftar keyword (lowercase)
+        """
+        self.groups = list(groups)
+
+        keyword_groups: Dict[str, Set[str]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                keyword_groups.setdefault(keyword, set()).add(group)
+
+        keywords = sorted(keyword_groups, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + self._trie_regex(keywords) + '))')
+
+        # Keyword → semua (grup, keyword) yang terkandung di dalamnya (termasuk dirinya)
+        self._expansion: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            keyword: tuple(
+                (group, other)
+                for other in keywords if other in keyword
+                for group in keyword_groups[other]
+            )
+            for keyword in keywords
+        }
+
+    @staticmethod
+    def _trie_regex(keywords: List[str]) -> str:
+        """Ubah daftar keyword jadi regex berbentuk trie (cabang terpanjang dicoba dulu)"""
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                # Keyword berakhir di sini, tapi coba perpanjang dulu (greedy)
+                pattern = '(?:' + pattern + ')?'
+            return pattern
+
+        return build(trie)
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Cari semua keyword di teks dalam satu kali scan
+
+        Args:
+            text: Teks yang sudah di-lowercase
+
+        Returns:
+            Nama grup → set keyword yang ditemukan (semua grup selalu ada)
+        """
+        found = {group: set() for group in self.groups}
+
+        for longest in set(self._pattern.findall(text)):
+            for group, keyword in self._expansion[longest]:
+                found[group].add(keyword)
+
+        return found
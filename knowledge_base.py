@@ -0,0 +1,126 @@
+# knowledge_base.py
+# Knowledge base bersama (RAB, harga interior, info perusahaan) untuk semua sesi chatbot
+
+import hashlib
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import List
+import pandas as pd
+from rab_parser import RABParser, RAB_PARSER_VERSION
+from price_scraper import InteriorPriceScraper
+from boq_estimator import BoQEstimator
+from data_perusahaan import COMPANY_INFO
+
+# File RAB yang di-load saat startup
+RAB_FILES = [
+    "/mnt/user-data/uploads/RAB_Finishing_Kav10__r17_Juli_2020__-_Tahap_1.pdf",
+    "/mnt/user-data/uploads/BQ_9x15.pdf"
+]
+
+# Scrape harga interior dari sumber online (PRICE_SOURCES_FILE) saat startup
+SCRAPE_PRICES_ON_START = os.getenv("SCRAPE_PRICES_ON_START", "0") == "1"
+
+
+def _freeze(value):
+    """Copy data jadi versi read-only (dict → MappingProxyType, list → tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class KnowledgeBase:
+    """
+    Data read-only yang dipakai bersama oleh semua sesi chatbot dalam satu proses
+
+    Berisi:
+    - RAB parser yang sudah di-load
+    - Database harga interior (opsional diperbarui dari hasil scraping)
+    - Estimasi BoQ (banyak item sekaligus) di atas RAB & database harga
+    - Info perusahaan
+
+    Setiap sesi chatbot cukup menyimpan history percakapannya sendiri.
+    Memo hasil lookup di dalam parser/index (estimasi per keyword, token
+    yang cocok) ditulis di bawah lock, jadi aman dipakai banyak thread sesi.
+    """
+
+    def __init__(self, rab_files: List[str] = None):
+        """
+        Args:
+            rab_files: Daftar file RAB yang di-load (default: RAB_FILES)
+        """
+        self.rab_parser = RABParser()
+        self.price_scraper = InteriorPriceScraper()
+        self.company_info = _freeze(COMPANY_INFO)
+
+        self._load_rab_data(rab_files if rab_files is not None else RAB_FILES)
+        if SCRAPE_PRICES_ON_START:
+            self._scrape_prices()
+        self.boq_estimator = BoQEstimator(self.rab_parser, self.price_scraper)
+
+        # Versi data, berubah jika isi RAB / database harga / info perusahaan berubah
+        self.data_version = self._compute_data_version()
+
+        # Setelah di-load, atribut tidak boleh diganti lagi
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("KnowledgeBase bersifat read-only")
+        super().__setattr__(name, value)
+
+    def _compute_data_version(self) -> str:
+        """Hash singkat dari semua data (dipakai sebagai bagian dari key cache)"""
+        digest = hashlib.sha1()
+        digest.update(str(RAB_PARSER_VERSION).encode('utf-8'))
+
+        frame = self.rab_parser.get_frame()
+        digest.update(str(len(frame)).encode('utf-8'))
+        if len(frame):
+            digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+
+        digest.update(json.dumps(self.price_scraper.price_database, sort_keys=True).encode('utf-8'))
+        digest.update(json.dumps(self.price_scraper.scraped_prices, sort_keys=True).encode('utf-8'))
+        digest.update(json.dumps(COMPANY_INFO, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def _load_rab_data(self, rab_files: List[str]):
+        """Load dan parse semua file RAB"""
+        try:
+            for rab_file in rab_files:
+                if os.path.exists(rab_file):
+                    print(f"📂 Loading RAB: {rab_file}")
+                    self.rab_parser.parse_pdf(rab_file)
+
+            cache_stats = self.rab_parser.get_cache_stats()
+            print(f"✅ Loaded {self.rab_parser.item_count} items from RAB "
+                  f"(cache hit: {cache_stats['hits']}, miss: {cache_stats['misses']})")
+
+        except Exception as e:
+            print(f"⚠️ Warning: Could not load RAB files: {e}")
+
+    def _scrape_prices(self):
+        """Perbarui harga interior dari sumber online (gagal → tetap pakai database harga)"""
+        try:
+            self.price_scraper.refresh_prices()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not scrape prices: {e}")
+
+
+_knowledge_base = None
+_knowledge_base_lock = threading.Lock()
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Ambil knowledge base bersama (dibuat sekali per proses)"""
+    global _knowledge_base
+
+    if _knowledge_base is None:
+        with _knowledge_base_lock:
+            if _knowledge_base is None:
+                _knowledge_base = KnowledgeBase()
+
+    return _knowledge_base
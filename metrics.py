@@ -0,0 +1,321 @@
+# metrics.py
+# Instrumentasi latency per tahap, intent, token, dan error untuk chatbot engine
+
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+# Aktifkan metrics (CHATBOT_METRICS=0 untuk mematikan)
+METRICS_ENABLED = os.getenv("CHATBOT_METRICS", "1") != "0"
+
+# Batas bucket histogram latency (detik)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Batas bucket histogram jumlah token
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+class Histogram:
+    """Histogram dengan bucket tetap (format kumulatif seperti Prometheus)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimasi quantile dari bucket (interpolasi linear, seperti histogram_quantile)"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+class _StageTimer:
+    """Context manager untuk mengukur satu tahap (hasil dikirim ke observe(key, detik))"""
+
+    __slots__ = ('observe', 'key', 'start')
+
+    def __init__(self, observe, key: str):
+        self.observe = observe
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopTimer:
+    """Timer kosong saat metrics dimatikan (satu instance dipakai ulang)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def _label(value) -> str:
+    """Escape nilai label Prometheus (backslash, tanda kutip, newline)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class ChatMetrics:
+    """
+    Kumpulan metrics chatbot engine
+
+    - chat_stage_seconds{stage}: histogram latency per tahap
+    - chat_turns_total{intent, source}: jumlah giliran per intent dan sumber
+      jawaban (llm, cache, company_info, off_topic)
+    - chat_tokens{kind}: histogram token prompt/completion dari field usage Groq
+    - chat_errors_total{error}: jumlah error per class exception
+    - chat_events_total{event}: kejadian lain (retry, hedge, fallback)
+    - chat_model_seconds{model}: histogram latency panggilan Groq per model
+    - chat_routes_total{route, model}: keputusan routing model
+
+    Jika enabled=False semua method langsung return, jadi overhead di hot path
+    hanya satu pengecekan atribut.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        """
+        Args:
+            enabled: Aktifkan pencatatan metrics
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Hapus semua data metrics"""
+        with self._lock:
+            self._stages: Dict[str, Histogram] = {}
+            self._tokens: Dict[str, Histogram] = {}
+            self._turns: Dict[Tuple[str, str], int] = {}
+            self._errors: Dict[str, int] = {}
+            self._events: Dict[str, int] = {}
+            self._models: Dict[str, Histogram] = {}
+            self._routes: Dict[Tuple[str, str], int] = {}
+            self._token_totals: Dict[str, int] = {}
+            self.started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Pencatatan (hot path)
+    # ------------------------------------------------------------------
+
+    def timer(self, stage: str):
+        """Context manager untuk mengukur latency satu tahap"""
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _StageTimer(self.observe_stage, stage)
+
+    def observe_stage(self, stage: str, seconds: float):
+        """Catat latency satu tahap (detik)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def model_timer(self, model: str):
+        """Context manager untuk mengukur latency panggilan ke satu model"""
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _StageTimer(self.observe_model, model)
+
+    def observe_model(self, model: str, seconds: float):
+        """Catat latency panggilan Groq untuk satu model (detik)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._models.get(model)
+            if histogram is None:
+                histogram = self._models[model] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def record_route(self, route: str, model: str):
+        """Catat keputusan routing model"""
+        if not self.enabled:
+            return
+        key = (route, model)
+        with self._lock:
+            self._routes[key] = self._routes.get(key, 0) + 1
+
+    def record_turn(self, intent: str, source: str):
+        """Catat satu giliran chat beserta intent dan sumber jawabannya"""
+        if not self.enabled:
+            return
+        key = (intent, source)
+        with self._lock:
+            self._turns[key] = self._turns.get(key, 0) + 1
+
+    def record_usage(self, usage):
+        """Catat jumlah token dari field usage response Groq (boleh None)"""
+        if not self.enabled or usage is None:
+            return
+        with self._lock:
+            for kind in ('prompt_tokens', 'completion_tokens'):
+                tokens = getattr(usage, kind, None)
+                if tokens is None:
+                    continue
+                histogram = self._tokens.get(kind)
+                if histogram is None:
+                    histogram = self._tokens[kind] = Histogram(TOKEN_BUCKETS)
+                histogram.observe(tokens)
+                self._token_totals[kind] = self._token_totals.get(kind, 0) + tokens
+
+    def record_error(self, error: Exception):
+        """Catat error berdasarkan nama class-nya"""
+        if not self.enabled:
+            return
+        name = type(error).__name__
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+    def record_event(self, event: str):
+        """Catat satu kejadian (mis. retry, hedge, fallback)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        """Snapshot semua metrics sebagai dict (bisa di-serialize ke JSON)"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'uptime_seconds': time.time() - self.started_at,
+                'stages': {stage: h.snapshot() for stage, h in self._stages.items()},
+                'turns': [
+                    {'intent': intent, 'source': source, 'count': count}
+                    for (intent, source), count in sorted(self._turns.items())
+                ],
+                'tokens': {kind: h.snapshot() for kind, h in self._tokens.items()},
+                'token_totals': dict(self._token_totals),
+                'errors': dict(self._errors),
+                'events': dict(self._events),
+                'models': {model: h.snapshot() for model, h in self._models.items()},
+                'routes': [
+                    {'route': route, 'model': model, 'count': count}
+                    for (route, model), count in sorted(self._routes.items())
+                ],
+            }
+
+    def to_json(self) -> str:
+        """Snapshot metrics dalam format JSON"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Metrics dalam format text exposition Prometheus"""
+        lines = []
+
+        with self._lock:
+            lines.append("# HELP chat_stage_seconds Latency per tahap giliran chat")
+            lines.append("# TYPE chat_stage_seconds histogram")
+            for stage, histogram in sorted(self._stages.items()):
+                lines.extend(self._histogram_lines('chat_stage_seconds', f'stage="{_label(stage)}"', histogram))
+
+            lines.append("# HELP chat_tokens Jumlah token per panggilan Groq")
+            lines.append("# TYPE chat_tokens histogram")
+            for kind, histogram in sorted(self._tokens.items()):
+                lines.extend(self._histogram_lines('chat_tokens', f'kind="{_label(kind)}"', histogram))
+
+            lines.append("# HELP chat_model_seconds Latency panggilan Groq per model")
+            lines.append("# TYPE chat_model_seconds histogram")
+            for model, histogram in sorted(self._models.items()):
+                lines.extend(self._histogram_lines('chat_model_seconds', f'model="{_label(model)}"', histogram))
+
+            lines.append("# HELP chat_turns_total Jumlah giliran chat per intent dan sumber jawaban")
+            lines.append("# TYPE chat_turns_total counter")
+            for (intent, source), count in sorted(self._turns.items()):
+                lines.append(f'chat_turns_total{{intent="{_label(intent)}",source="{_label(source)}"}} {count}')
+
+            lines.append("# HELP chat_routes_total Keputusan routing model per route")
+            lines.append("# TYPE chat_routes_total counter")
+            for (route, model), count in sorted(self._routes.items()):
+                lines.append(f'chat_routes_total{{route="{_label(route)}",model="{_label(model)}"}} {count}')
+
+            lines.append("# HELP chat_errors_total Jumlah error per class exception")
+            lines.append("# TYPE chat_errors_total counter")
+            for error, count in sorted(self._errors.items()):
+                lines.append(f'chat_errors_total{{error="{_label(error)}"}} {count}')
+
+            lines.append("# HELP chat_events_total Jumlah retry, hedge, dan fallback")
+            lines.append("# TYPE chat_events_total counter")
+            for event, count in sorted(self._events.items()):
+                lines.append(f'chat_events_total{{event="{_label(event)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name: str, labels: str, histogram: Histogram):
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+            cumulative += bucket_count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+        yield f'{name}_sum{{{labels}}} {histogram.sum}'
+        yield f'{name}_count{{{labels}}} {histogram.count}'
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> ChatMetrics:
+    """Ambil metrics bersama (satu per proses, dipakai semua sesi)"""
+    global _metrics
+
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = ChatMetrics()
+
+    return _metrics
@@ -0,0 +1,155 @@
+# model_router.py
+# Pilih model Groq per giliran: model kecil untuk giliran sederhana, 70B untuk konsultasi
+
+import json
+import os
+import re
+import threading
+from typing import Dict
+
+# Model yang tersedia
+LARGE_MODEL = "llama-3.3-70b-versatile"
+FAST_MODEL = "llama-3.1-8b-instant"
+
+# Matikan routing (semua giliran ke model utama) dengan MODEL_ROUTING=0
+ROUTING_ENABLED = os.getenv("MODEL_ROUTING", "1") != "0"
+
+# File JSON opsional untuk mengganti tabel routing
+ROUTING_FILE = os.getenv("MODEL_ROUTING_FILE")
+
+# Route → model & batas generate
+DEFAULT_ROUTES = {
+    'greeting': {'model': FAST_MODEL, 'max_tokens': 256, 'temperature': 0.7},
+    'price': {'model': FAST_MODEL, 'max_tokens': 512, 'temperature': 0.5},
+    'consultation': {'model': LARGE_MODEL, 'max_tokens': 1024, 'temperature': 0.7},
+    'summary': {'model': FAST_MODEL, 'max_tokens': 400, 'temperature': 0.3},
+}
+
+# Intent (hasil _detect_intent) → route
+DEFAULT_INTENT_ROUTES = {
+    'rab_query': 'price',
+    'interior_price': 'price',
+    'package': 'price',
+    'general': 'consultation',
+}
+
+# Sapaan pendek boleh ke model kecil
+GREETING_MAX_WORDS = 8
+
+# Sapaan dikenali sebagai kata utuh di awal pesan ("Halo kak", "Selamat malam"),
+# bukan substring ("hi" di "hitungkan") atau kata waktu di tengah kalimat ("tema malam")
+GREETING_WORDS = ['hai', 'halo', 'hallo', 'hi', 'hello', 'hey', 'hei', 'assalamualaikum']
+GREETING_TIME_WORDS = ['pagi', 'siang', 'sore', 'malam']
+
+# Kosakata sapaan yang sama untuk scan keyword engine (grup 'greeting')
+GREETING_KEYWORDS = GREETING_WORDS + ['selamat'] + GREETING_TIME_WORDS
+
+# Pertanyaan harga yang panjang / minta pendapat tetap ke model besar
+COMPLEX_MIN_WORDS = 30
+CONSULTATION_WORDS = ['bandingkan', 'dibandingkan', 'beda', 'perbedaan', 'rekomendasi', 'saran',
+                      'sebaiknya', 'lebih bagus', 'lebih baik', 'kenapa', 'mengapa', 'bagaimana',
+                      'gimana', 'cocok', 'rencana', 'konsep']
+
+
+class ModelRouter:
+    """
+    Routing giliran chat ke model Groq
+
+    Keputusan berdasarkan intent dari _detect_intent dan kompleksitas pesan:
+    - sapaan pendek → model kecil, jawaban pendek
+    - pertanyaan harga/paket sederhana (data sudah ada di prompt) → model kecil
+    - pertanyaan harga yang panjang / minta perbandingan & saran → model besar
+    - konsultasi umum → model besar
+    """
+
+    def __init__(self, routes: Dict = None, intent_routes: Dict = None,
+                 default_model: str = LARGE_MODEL, enabled: bool = ROUTING_ENABLED,
+                 routing_file: str = ROUTING_FILE):
+        """
+        Args:
+            routes: Tabel route → {'model', 'max_tokens', 'temperature'} (digabung dengan default)
+            intent_routes: Tabel intent → route (digabung dengan default)
+            default_model: Model jika routing dimatikan
+            enabled: Aktifkan routing
+            routing_file: File JSON berisi {"routes": {...}, "intents": {...}}
+        """
+        self.enabled = enabled
+        self.routes = {name: dict(route) for name, route in DEFAULT_ROUTES.items()}
+        self.intent_routes = dict(DEFAULT_INTENT_ROUTES)
+
+        if routing_file:
+            try:
+                with open(routing_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                self._merge(config.get('routes', {}), config.get('intents', {}))
+                print(f"✅ Routing model dari {routing_file}")
+            except Exception as e:
+                print(f"⚠️ Warning: Gagal membaca {routing_file}, pakai routing default: {e}")
+
+        self._merge(routes or {}, intent_routes or {})
+
+        self.default_route = {'name': 'default', 'model': default_model, 'max_tokens': 1024, 'temperature': 0.7}
+
+        alternatives = '|'.join(re.escape(word) for word in CONSULTATION_WORDS)
+        self._consultation_pattern = re.compile(r'(?<![a-z])(?:' + alternatives + r')(?![a-z])')
+
+        greetings = '|'.join(re.escape(word) for word in GREETING_WORDS)
+        times = '|'.join(re.escape(word) for word in GREETING_TIME_WORDS)
+        self._greeting_pattern = re.compile(r'^\W*(?:' + greetings + r'|(?:selamat\s+)?(?:' + times + r'))\b')
+
+    def _merge(self, routes: Dict, intent_routes: Dict):
+        for name, route in routes.items():
+            self.routes.setdefault(name, {}).update(route)
+        self.intent_routes.update(intent_routes)
+
+    def route(self, intent_data: Dict, message: str, matches: Dict[str, set] = None) -> Dict:
+        """
+        Pilih route untuk satu giliran
+
+        Args:
+            intent_data: Hasil _detect_intent
+            message: Pesan user
+            matches: Hasil scan keyword engine (grup 'greeting', dll; substring, jadi
+                     sapaan dicek ulang sebagai kata utuh di awal pesan)
+
+        Returns:
+            {'name', 'model', 'max_tokens', 'temperature'}
+        """
+        if not self.enabled:
+            return self.default_route
+
+        message_lower = message.lower()
+        words = len(message_lower.split())
+        intent = intent_data['intent']
+        name = self.intent_routes.get(intent, 'consultation')
+
+        if intent == 'general' and matches and matches['greeting'] and words <= GREETING_MAX_WORDS \
+                and self._greeting_pattern.search(message_lower) \
+                and not self._consultation_pattern.search(message_lower):
+            name = 'greeting'
+        elif name == 'price' and (words >= COMPLEX_MIN_WORDS or self._consultation_pattern.search(message_lower)):
+            name = 'consultation'
+
+        return self.get(name)
+
+    def get(self, name: str) -> Dict:
+        """Route berdasarkan nama (route default jika routing mati / nama tidak ada)"""
+        if not self.enabled or name not in self.routes:
+            return self.default_route
+        return dict(self.routes[name], name=name)
+
+
+_model_router = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Ambil router bersama (tabel routing dibaca sekali per proses)"""
+    global _model_router
+
+    if _model_router is None:
+        with _model_router_lock:
+            if _model_router is None:
+                _model_router = ModelRouter()
+
+    return _model_router
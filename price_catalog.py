@@ -0,0 +1,201 @@
+# price_catalog.py
+# Katalog harga interior yang sudah dikompilasi: array numpy + index lookup exact/prefix/substring
+
+import bisect
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import numpy as np
+
+# Harga min/avg/max + id satuan & sumber per item
+PRICE_DTYPE = np.dtype([
+    ('min', np.float64),
+    ('avg', np.float64),
+    ('max', np.float64),
+    ('unit', np.uint16),
+    ('source', np.uint16),
+])
+
+# Panjang n-gram untuk index substring
+GRAM_SIZE = 3
+
+# Jika kandidat substring tinggal sebanyak ini, langsung dicek tanpa intersect trigram lagi
+VERIFY_ROWS = 64
+
+DEFAULT_SOURCE = 'Database Harga Pasaran 2024'
+
+
+def _grams(text: str) -> set:
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class PriceEntry:
+    """Satu item katalog (string satuan & sumber di-intern, dipakai bersama antar item)"""
+
+    __slots__ = ('name', 'min', 'avg', 'max', 'satuan', 'description', 'source')
+
+    def __init__(self, name: str, min: float, avg: float, max: float, satuan: str,
+                 description: str, source: str):
+        self.name = name
+        self.min = min
+        self.avg = avg
+        self.max = max
+        self.satuan = satuan
+        self.description = description
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"PriceEntry({self.name!r}, {self.min:g}-{self.max:g}/{self.satuan})"
+
+
+class PriceCatalog:
+    """
+    Katalog harga read-only
+
+    - Item disimpan sebagai record __slots__, harga juga sebagai satu numpy
+      structured array untuk operasi vektor (filter/statistik)
+    - Satuan & sumber disimpan sekali di tabel (array cukup menyimpan id-nya)
+    - Index: exact (dict), prefix (key terurut + bisect), dan substring
+      (trigram → posting list), jadi lookup tidak memindai semua item
+
+    Urutan item = urutan saat dikompilasi; jika beberapa item cocok,
+    item paling awal yang dipakai (sama seperti scan dict sebelumnya).
+    """
+
+    def __init__(self, records: Iterable[Mapping], default_source: str = DEFAULT_SOURCE):
+        """
+        Args:
+            records: Item katalog {'name', 'min', 'avg', 'max', 'satuan', 'description', 'source' (opsional)}
+            default_source: Sumber untuk item tanpa field 'source'
+        """
+        names: List[str] = []
+        rows: List[Tuple] = []
+        entries: List[PriceEntry] = []
+        self.units: List[str] = []
+        self.sources: List[str] = []
+        unit_ids: Dict[str, int] = {}
+        source_ids: Dict[str, int] = {}
+        self._exact: Dict[str, int] = {}
+
+        for record in records:
+            name = ' '.join(str(record['name']).lower().split())
+            if not name or name in self._exact:
+                continue
+            unit = sys.intern(str(record.get('satuan', '')))
+            source = sys.intern(str(record.get('source') or default_source))
+            unit_id = unit_ids.setdefault(unit, len(unit_ids))
+            source_id = source_ids.setdefault(source, len(source_ids))
+            if unit_id == len(self.units):
+                self.units.append(unit)
+            if source_id == len(self.sources):
+                self.sources.append(source)
+
+            self._exact[name] = len(names)
+            names.append(name)
+            rows.append((record['min'], record['avg'], record['max'], unit_id, source_id))
+            entries.append(PriceEntry(name, float(record['min']), float(record['avg']), float(record['max']),
+                                      unit, str(record.get('description', '')), source))
+
+        self.names: Tuple[str, ...] = tuple(names)
+        self.entries: Tuple[PriceEntry, ...] = tuple(entries)
+        self.prices = np.array(rows, dtype=PRICE_DTYPE)
+        # Awalan nama (GRAM_SIZE karakter pertama) → panjang-panjang nama dengan awalan itu
+        head_lengths: Dict[str, set] = {}
+        for name in names:
+            head_lengths.setdefault(name[:GRAM_SIZE], set()).add(len(name))
+        self._head_lengths = {head: tuple(sorted(lengths)) for head, lengths in head_lengths.items()}
+        self._short_lengths = tuple(sorted({len(name) for name in names if len(name) < GRAM_SIZE}))
+
+        # Prefix: nama terurut + row id-nya
+        order = sorted(range(len(names)), key=names.__getitem__)
+        self._sorted_names = [names[row] for row in order]
+        self._sorted_rows = np.asarray(order, dtype=np.int64)
+
+        # Substring: trigram → row id (terurut)
+        postings: Dict[str, List[int]] = {}
+        for row, name in enumerate(names):
+            for gram in _grams(name):
+                postings.setdefault(gram, []).append(row)
+        self._gram_rows = {gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    @classmethod
+    def from_database(cls, database: Mapping[str, Mapping], source: str = DEFAULT_SOURCE) -> 'PriceCatalog':
+        """Kompilasi dict {nama: {'min', 'avg', 'max', 'satuan', 'description'}}"""
+        return cls(({'name': name, **data} for name, data in database.items()), default_source=source)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return ' '.join(name.lower().split()) in self._exact
+
+    def get(self, name: str) -> Optional[int]:
+        """Row id untuk nama persis (None jika tidak ada)"""
+        return self._exact.get(' '.join(name.lower().split()))
+
+    def prefix(self, text: str, limit: int = 10) -> List[int]:
+        """Row id item yang namanya diawali text (urut abjad)"""
+        text = ' '.join(text.lower().split())
+        start = bisect.bisect_left(self._sorted_names, text)
+        end = bisect.bisect_left(self._sorted_names, text + '\uffff', lo=start)
+        return self._sorted_rows[start:min(end, start + limit)].tolist()
+
+    def _first_containing(self, text: str) -> Optional[int]:
+        """Row id paling awal yang namanya mengandung text"""
+        if len(text) < GRAM_SIZE:
+            # Terlalu pendek untuk trigram: hanya cocokkan awal nama
+            start = bisect.bisect_left(self._sorted_names, text)
+            end = bisect.bisect_left(self._sorted_names, text + '\uffff', lo=start)
+            return int(self._sorted_rows[start:end].min()) if end > start else None
+
+        rows = None
+        for gram in sorted(_grams(text), key=lambda gram: len(self._gram_rows.get(gram, ()))):
+            gram_rows = self._gram_rows.get(gram)
+            if gram_rows is None:
+                return None
+            rows = gram_rows if rows is None else np.intersect1d(rows, gram_rows, assume_unique=True)
+            if len(rows) <= VERIFY_ROWS:
+                # Kandidat sudah sedikit, langsung cek
+                break
+
+        # Semua trigram ada belum tentu berurutan, cek ulang dari row paling awal
+        for row in rows.tolist():
+            if text in self.names[row]:
+                return row
+        return None
+
+    def _contained(self, text: str) -> List[int]:
+        """Row id item yang namanya muncul di dalam text"""
+        rows = []
+        for start in range(len(text)):
+            # Hanya panjang nama yang ada untuk awalan ini yang dicek
+            lengths = self._head_lengths.get(text[start:start + GRAM_SIZE], ())
+            for length in self._short_lengths + lengths:
+                row = self._exact.get(text[start:start + length])
+                if row is not None:
+                    rows.append(row)
+        return rows
+
+    def lookup(self, text: str) -> Optional[int]:
+        """
+        Cari item untuk teks query
+
+        Item cocok jika namanya ada di dalam query atau query ada di dalam
+        namanya; jika lebih dari satu, item paling awal di katalog.
+
+        Returns:
+            Row id (None jika tidak ada yang cocok)
+        """
+        text = ' '.join(text.lower().split())
+        if not text:
+            return None
+
+        # Nama yang ada di dalam query (termasuk nama persis) + nama yang mengandung query
+        candidates = self._contained(text)
+        containing = self._first_containing(text)
+        if containing is not None:
+            candidates.append(containing)
+        return min(candidates) if candidates else None
+
+    def entry(self, row: int) -> PriceEntry:
+        """Record satu item"""
+        return self.entries[row]
@@ -0,0 +1,630 @@
+# price_pipeline.py
+# Pipeline scraping harga interior: adapter per sumber, fetcher async yang sopan, parsing lxml, normalisasi ke katalog
+
+import asyncio
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+import httpx
+import numpy as np
+from lxml import html as lxml_html
+from units import normalize_unit
+from metrics import get_metrics
+
+# Batas request bersamaan (semua sumber) dan per host
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "16"))
+SCRAPER_PER_HOST = int(os.getenv("SCRAPER_PER_HOST", "2"))
+
+# Jeda minimal antar request ke host yang sama (detik)
+SCRAPER_HOST_DELAY = float(os.getenv("SCRAPER_HOST_DELAY", "0.5"))
+
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "15"))
+SCRAPER_MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "2"))
+
+# File JSON daftar sumber (lihat build_adapters), kosong = tidak ada sumber live
+PRICE_SOURCES_FILE = os.getenv("PRICE_SOURCES_FILE", "")
+
+# Folder contoh halaman untuk test offline (dilayani price_stub_server.py)
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_fixtures")
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'id-ID,id;q=0.9,en;q=0.8',
+}
+
+# Status yang dicoba ulang
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Listing dengan harga di luar Q1 - 1.5×IQR .. Q3 + 1.5×IQR dibuang (minimal sebanyak ini listing)
+OUTLIER_MIN_LISTINGS = 4
+
+# Harga di luar min/10 .. max×10 dari database harga dianggap salah input
+PLAUSIBLE_RATIO = 10
+
+_PRICE_PATTERN = re.compile(r'(\d+(?:[.,]\d+)*)\s*(juta|jt|ribu|rb|k)?\b')
+_MULTIPLIERS = {'juta': 1_000_000, 'jt': 1_000_000, 'ribu': 1_000, 'rb': 1_000, 'k': 1_000}
+
+
+def parse_prices(text: str) -> List[float]:
+    """
+    Ambil angka harga dari teks harga toko
+
+    "Rp 1.250.000" → [1250000], "Rp 3,2 jt" → [3200000], "Rp 98rb" → [98000],
+    "Rp 285.000 - Rp 310.000" → [285000, 310000], "Hubungi penjual" → []
+    """
+    prices = []
+    for number, suffix in _PRICE_PATTERN.findall(str(text or '').lower()):
+        multiplier = _MULTIPLIERS.get(suffix, 1)
+        if suffix and re.fullmatch(r'\d+[.,]\d{1,2}', number):
+            # "3,2 jt" / "1.5 jt": pemisah desimal
+            value = float(number.replace(',', '.'))
+        else:
+            # Format Indonesia: titik ribuan, koma desimal
+            whole, _, decimal = number.replace('.', '').partition(',')
+            value = float(f"{whole}.{decimal}" if decimal else whole)
+        prices.append(value * multiplier)
+    return prices
+
+
+def normalize_listing_unit(unit: str) -> str:
+    """Satuan listing → satuan baku ('/m²' → 'm2', 'per meter' → 'm'); kosong dianggap per unit"""
+    unit = str(unit or '').strip().lstrip('/').strip()
+    return normalize_unit(unit) if unit else 'unit'
+
+
+class SourceAdapter(ABC):
+    """
+    Satu sumber harga: daftar halaman + cara membaca listing dari HTML-nya
+
+    Subclass wajib mengisi parse(); setiap listing berupa dict
+    {'name', 'prices' (list angka), 'unit', 'url'}.
+    """
+
+    def __init__(self, name: str, base_url: str, paths: Sequence[str], label: str = None):
+        """
+        Args:
+            name: Id sumber (dipakai di laporan)
+            base_url: URL dasar sumber
+            paths: Path halaman yang diambil (relatif ke base_url)
+            label: Nama sumber yang ditampilkan ke user (default: name)
+        """
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.paths = list(paths)
+        self.label = label or name
+
+    def urls(self) -> List[str]:
+        return [f"{self.base_url}/{path.lstrip('/')}" for path in self.paths]
+
+    @abstractmethod
+    def parse(self, content: bytes, url: str) -> List[Dict]:
+        """Listing dari isi satu halaman"""
+
+
+class XPathAdapter(SourceAdapter):
+    """Halaman grid/tabel produk: satu elemen per listing, field dibaca dengan XPath relatif"""
+
+    def __init__(self, name: str, base_url: str, paths: Sequence[str], item_xpath: str,
+                 name_xpath: str, price_xpath: str, unit_xpath: str = None, label: str = None):
+        super().__init__(name, base_url, paths, label)
+        self.item_xpath = item_xpath
+        self.name_xpath = name_xpath
+        self.price_xpath = price_xpath
+        self.unit_xpath = unit_xpath
+
+    @staticmethod
+    def _text(element, xpath: Optional[str]) -> str:
+        if not xpath:
+            return ''
+        return ' '.join(' '.join(element.xpath(f"{xpath}//text()")).split())
+
+    def parse(self, content: bytes, url: str) -> List[Dict]:
+        document = lxml_html.fromstring(content)
+        listings = []
+        for element in document.xpath(self.item_xpath):
+            listings.append({
+                'name': self._text(element, self.name_xpath),
+                'prices': parse_prices(self._text(element, self.price_xpath)),
+                'unit': self._text(element, self.unit_xpath),
+                'url': url,
+            })
+        return listings
+
+
+class JsonLdAdapter(SourceAdapter):
+    """Halaman yang menyimpan produk sebagai JSON-LD schema.org (Product / ItemList)"""
+
+    def __init__(self, name: str, base_url: str, paths: Sequence[str], currency: str = 'IDR',
+                 label: str = None):
+        super().__init__(name, base_url, paths, label)
+        self.currency = currency
+
+    def _products(self, data):
+        """Semua node Product di dalam data JSON-LD"""
+        if isinstance(data, list):
+            for item in data:
+                yield from self._products(item)
+        elif isinstance(data, dict):
+            if data.get('@type') == 'Product':
+                yield data
+            for key in ('@graph', 'itemListElement', 'item'):
+                if key in data:
+                    yield from self._products(data[key])
+
+    def parse(self, content: bytes, url: str) -> List[Dict]:
+        document = lxml_html.fromstring(content)
+        listings = []
+        for script in document.xpath('//script[@type="application/ld+json"]/text()'):
+            try:
+                data = json.loads(script)
+            except ValueError:
+                continue
+
+            for product in self._products(data):
+                offers = product.get('offers') or {}
+                offers = offers[0] if isinstance(offers, list) and offers else offers
+                if not isinstance(offers, dict) or offers.get('priceCurrency', self.currency) != self.currency:
+                    continue
+                prices = []
+                for key in ('price', 'lowPrice', 'highPrice'):
+                    prices.extend(self._offer_prices(offers.get(key)))
+                specification = offers.get('priceSpecification') or {}
+                listings.append({
+                    'name': ' '.join(str(product.get('name', '')).split()),
+                    'prices': prices,
+                    'unit': specification.get('unitText', '') if isinstance(specification, dict) else '',
+                    'url': url,
+                })
+        return listings
+
+    @staticmethod
+    def _offer_prices(value) -> List[float]:
+        """
+        Harga dari satu field offer
+
+        Angka schema.org ("1250000", "1250000.50") dibaca langsung; teks toko
+        ("Rp 1.250.000") lewat parse_prices(). Field yang tidak bisa dibaca → [].
+        """
+        if value is None or isinstance(value, bool):
+            return []
+        if isinstance(value, (int, float)):
+            return [float(value)]
+        if not isinstance(value, str):
+            return []
+        text = value.strip()
+        if re.fullmatch(r'\d+(?:\.\d{1,2})?', text):
+            return [float(text)]
+        return parse_prices(text)
+
+
+# Jenis adapter yang bisa dipakai di file sumber
+ADAPTER_TYPES = {
+    'xpath': XPathAdapter,
+    'jsonld': JsonLdAdapter,
+}
+
+# Sumber contoh, layout-nya sama dengan halaman di scraper_fixtures/
+FIXTURE_SOURCES = [
+    {
+        'type': 'xpath',
+        'name': 'tokobangunan',
+        'label': 'Toko Bangunan',
+        'paths': ['lantai.html', 'dinding.html', 'sanitasi.html'],
+        'item_xpath': '//div[@class="product-card"]',
+        'name_xpath': './/a[@class="product-title"]',
+        'price_xpath': './/span[@class="price"]',
+        'unit_xpath': './/span[@class="unit"]',
+    },
+    {
+        'type': 'xpath',
+        'name': 'katalogmaterial',
+        'label': 'Katalog Material',
+        'paths': ['material.html', 'jasa.html'],
+        'item_xpath': '//table[@class="price-list"]//tr[@class="item"]',
+        'name_xpath': './td[@class="nama"]',
+        'price_xpath': './td[@class="harga"]',
+        'unit_xpath': './td[@class="satuan"]',
+    },
+    {
+        'type': 'jsonld',
+        'name': 'furniturhome',
+        'label': 'Furnitur Home',
+        'paths': ['furniture.html', 'lampu.html'],
+    },
+]
+
+
+def build_adapters(specs: Sequence[Dict], base_url: str = None) -> List[SourceAdapter]:
+    """
+    Buat adapter dari daftar spesifikasi sumber
+
+    Args:
+        specs: List dict {'type': 'xpath' | 'jsonld', 'name', 'base_url', 'paths', ...argumen adapter}
+        base_url: Jika diisi, semua sumber diarahkan ke {base_url}/{name} (stub server lokal)
+
+    Returns:
+        List SourceAdapter
+    """
+    adapters = []
+    for spec in specs:
+        options = dict(spec)
+        adapter_class = ADAPTER_TYPES[options.pop('type')]
+        if base_url:
+            options['base_url'] = f"{base_url.rstrip('/')}/{options['name']}"
+        adapters.append(adapter_class(**options))
+    return adapters
+
+
+def load_adapters(path: str = None) -> List[SourceAdapter]:
+    """Adapter dari file JSON sumber (default: env PRICE_SOURCES_FILE); [] jika tidak di-set"""
+    path = path or PRICE_SOURCES_FILE
+    if not path:
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return build_adapters(json.load(f))
+
+
+class _HostState:
+    """Pool koneksi + batas bersamaan + jeda untuk satu host"""
+
+    def __init__(self, client: httpx.AsyncClient, per_host: int):
+        self.client = client
+        self.slots = asyncio.Semaphore(per_host)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+
+
+class PoliteFetcher:
+    """
+    Fetcher HTTP async dengan batas bersamaan global & per host
+
+    - Satu httpx.AsyncClient (pool keep-alive sendiri) per host
+    - Maksimal `per_host` request bersamaan ke satu host, dengan jeda
+      minimal `host_delay` detik antar mulai request ke host yang sama
+    - 429/5xx/error koneksi dicoba ulang (header retry-after dihormati)
+    """
+
+    def __init__(self, concurrency: int = SCRAPER_CONCURRENCY, per_host: int = SCRAPER_PER_HOST,
+                 host_delay: float = SCRAPER_HOST_DELAY, timeout: float = SCRAPER_TIMEOUT,
+                 max_retries: int = SCRAPER_MAX_RETRIES, headers: Dict = None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.headers = dict(headers or DEFAULT_HEADERS)
+
+        self._slots = None
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _host(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.per_host, max_keepalive_connections=self.per_host),
+            )
+            self._hosts[host] = _HostState(client, self.per_host)
+        return self._hosts[host]
+
+    async def _wait_turn(self, host: _HostState):
+        """Tunggu sampai jeda minimal sejak request terakhir ke host ini lewat"""
+        async with host.lock:
+            wait = host.next_start - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            host.next_start = time.monotonic() + self.host_delay
+
+    async def fetch(self, url: str) -> Dict:
+        """
+        Ambil satu halaman
+
+        Returns:
+            {'url', 'status', 'content', 'seconds', 'attempts', 'error'} (content None jika gagal)
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        host = self._host(url)
+
+        result = {'url': url, 'status': None, 'content': None, 'seconds': 0.0, 'attempts': 0, 'error': None}
+        async with self._slots, host.slots:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_turn(host)
+                result['attempts'] = attempt + 1
+                retry_after = None
+                start = time.perf_counter()
+                try:
+                    response = await host.client.get(url)
+                    result['seconds'] = time.perf_counter() - start
+                    result['status'] = response.status_code
+                    if response.status_code == 200:
+                        result['content'] = response.content
+                        result['error'] = None
+                        break
+                    result['error'] = f"HTTP {response.status_code}"
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                    retry_after = response.headers.get('retry-after')
+                except httpx.HTTPError as e:
+                    result['seconds'] = time.perf_counter() - start
+                    result['error'] = f"{type(e).__name__}: {e}"
+
+                if attempt < self.max_retries:
+                    try:
+                        delay = float(retry_after) if retry_after else self.host_delay * 2 ** attempt
+                    except ValueError:
+                        delay = self.host_delay * 2 ** attempt
+                    await asyncio.sleep(delay)
+        return result
+
+    async def aclose(self):
+        for host in self._hosts.values():
+            await host.client.aclose()
+        self._hosts = {}
+        self._slots = None
+
+
+def _latency_stats(seconds: List[float]) -> Dict:
+    if not seconds:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    values = np.asarray(seconds, dtype=np.float64)
+    return {
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'max': float(values.max()),
+    }
+
+
+class PricePipeline:
+    """
+    Ambil semua halaman dari semua sumber secara bersamaan, parse, lalu
+    cocokkan listing ke item katalog dan hitung range harga per item
+
+    Listing dicocokkan lewat token nama item (sinonim ikut dipakai, jadi
+    "Granite Tile 60x60" → granit) dan hanya dihitung jika satuannya sama
+    dengan satuan item di katalog.
+    """
+
+    def __init__(self, adapters: Sequence[SourceAdapter], catalog, fuzzy_index,
+                 fetcher: PoliteFetcher = None):
+        """
+        Args:
+            adapters: Sumber yang di-scrape
+            catalog: PriceCatalog acuan (nama item, satuan, deskripsi)
+            fuzzy_index: FuzzyIndex untuk nama item di catalog
+            fetcher: Fetcher HTTP (default: PoliteFetcher() dengan setting env)
+        """
+        self.adapters = list(adapters)
+        self.catalog = catalog
+        self.fuzzy_index = fuzzy_index
+        self.fetcher = fetcher or PoliteFetcher()
+
+    async def _scrape_page(self, adapter: SourceAdapter, url: str) -> Tuple[SourceAdapter, Dict, List[Dict]]:
+        result = await self.fetcher.fetch(url)
+        get_metrics().observe_stage('scrape_fetch', result['seconds'])
+
+        listings = []
+        if result['content'] is not None:
+            try:
+                listings = adapter.parse(result['content'], url)
+            except Exception as e:
+                result['error'] = f"Parse error: {e}"
+        return adapter, result, listings
+
+    async def run(self) -> Tuple[List[Dict], Dict]:
+        """
+        Jalankan pipeline
+
+        Returns:
+            (records katalog hasil scraping, laporan throughput & latency per sumber)
+        """
+        start = time.perf_counter()
+        try:
+            pages = await asyncio.gather(*(
+                self._scrape_page(adapter, url) for adapter in self.adapters for url in adapter.urls()
+            ))
+        finally:
+            await self.fetcher.aclose()
+        fetch_seconds = time.perf_counter() - start
+
+        sources = {adapter.name: {
+            'label': adapter.label, 'pages': 0, 'failed': 0, 'retries': 0, 'bytes': 0, 'listings': 0,
+            'matched': 0, 'errors': [], 'latencies': [],
+        } for adapter in self.adapters}
+
+        listings = []
+        for adapter, result, page_listings in pages:
+            stats = sources[adapter.name]
+            stats['pages'] += 1
+            stats['retries'] += max(0, result['attempts'] - 1)
+            stats['latencies'].append(result['seconds'])
+            if result['error']:
+                stats['failed'] += 1
+                stats['errors'].append(f"{result['url']}: {result['error']}")
+            else:
+                stats['bytes'] += len(result['content'])
+            stats['listings'] += len(page_listings)
+            for listing in page_listings:
+                listing['source'] = adapter.name
+            listings.extend(page_listings)
+
+        records, summary = self.normalize(listings, {name: stats['label'] for name, stats in sources.items()})
+        for name, matched in summary.pop('matched_by_source').items():
+            sources[name]['matched'] = matched
+
+        total_seconds = time.perf_counter() - start
+        page_count = sum(stats['pages'] for stats in sources.values())
+        for stats in sources.values():
+            stats['latency'] = _latency_stats(stats.pop('latencies'))
+
+        get_metrics().observe_stage('scrape', total_seconds)
+        report = {
+            'sources': sources,
+            'pages': page_count,
+            'failed': sum(stats['failed'] for stats in sources.values()),
+            'retries': sum(stats['retries'] for stats in sources.values()),
+            'listings': len(listings),
+            **summary,
+            'records': len(records),
+            'fetch_seconds': fetch_seconds,
+            'seconds': total_seconds,
+            'pages_per_sec': page_count / fetch_seconds if fetch_seconds > 0 else 0.0,
+            'listings_per_sec': len(listings) / total_seconds if total_seconds > 0 else 0.0,
+        }
+        return records, report
+
+    def match(self, listing: Dict) -> Optional[int]:
+        """Row id item katalog untuk satu listing (None jika tidak cocok)"""
+        rows = self.fuzzy_index.find_in(listing['name'])
+        return rows[0] if rows else None
+
+    def normalize(self, listings: List[Dict], labels: Dict[str, str] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Kelompokkan listing per item katalog dan hitung range harganya
+
+        Returns:
+            (records {'name', 'min', 'avg', 'max', 'satuan', 'description', 'source', 'listings'},
+             ringkasan {'matched', 'unmatched', 'unit_mismatch', 'no_price', 'outliers', 'matched_by_source'})
+        """
+        labels = labels or {}
+        summary = {'matched': 0, 'unmatched': 0, 'unit_mismatch': 0, 'no_price': 0, 'outliers': 0}
+        matched_by_source: Dict[str, int] = {}
+        groups: Dict[int, Dict] = {}
+
+        for listing in listings:
+            prices = [price for price in listing['prices'] if price > 0]
+            if not prices:
+                summary['no_price'] += 1
+                continue
+
+            row = self.match(listing)
+            if row is None:
+                summary['unmatched'] += 1
+                continue
+
+            entry = self.catalog.entry(row)
+            if normalize_listing_unit(listing['unit']) != normalize_unit(entry.satuan):
+                summary['unit_mismatch'] += 1
+                continue
+
+            summary['matched'] += 1
+            matched_by_source[listing['source']] = matched_by_source.get(listing['source'], 0) + 1
+            group = groups.setdefault(row, {'prices': [], 'sources': []})
+            group['prices'].extend(prices)
+            if listing['source'] not in group['sources']:
+                group['sources'].append(listing['source'])
+
+        records = []
+        today = date.today().isoformat()
+        for row in sorted(groups):
+            entry = self.catalog.entry(row)
+            prices = np.asarray(groups[row]['prices'], dtype=np.float64)
+            plausible = (prices >= entry.min / PLAUSIBLE_RATIO) & (prices <= entry.max * PLAUSIBLE_RATIO)
+            summary['outliers'] += int((~plausible).sum())
+            prices = prices[plausible]
+            if not len(prices):
+                continue
+            if len(prices) >= OUTLIER_MIN_LISTINGS:
+                q1, q3 = np.percentile(prices, [25, 75])
+                spread = 1.5 * (q3 - q1)
+                kept = prices[(prices >= q1 - spread) & (prices <= q3 + spread)]
+                summary['outliers'] += len(prices) - len(kept)
+                prices = kept
+
+            source_labels = ', '.join(labels.get(name, name) for name in groups[row]['sources'])
+            records.append({
+                'name': entry.name,
+                'min': round(float(prices.min())),
+                'avg': round(float(np.median(prices))),
+                'max': round(float(prices.max())),
+                'satuan': entry.satuan,
+                'description': entry.description,
+                'source': f"Scraping {source_labels} ({today})",
+                'listings': int(len(prices)),
+            })
+
+        summary['matched_by_source'] = matched_by_source
+        return records, summary
+
+
+def run_sync(coroutine):
+    """Jalankan coroutine dari kode sync (di thread lain jika sudah ada event loop berjalan)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="price-scrape") as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def format_scrape_report(report: Dict) -> str:
+    """Format laporan pipeline jadi teks"""
+    lines = [
+        f"🕸️ Scraping: {report['pages']} halaman ({report['failed']} gagal, {report['retries']} retry) dalam {report['seconds']:.2f} detik "
+        f"— {report['pages_per_sec']:.1f} halaman/detik, {report['listings_per_sec']:.0f} listing/detik",
+        f"   Listing: {report['listings']} (cocok {report['matched']}, tidak cocok {report['unmatched']}, "
+        f"beda satuan {report['unit_mismatch']}, tanpa harga {report['no_price']}, outlier {report['outliers']}) "
+        f"→ {report['records']} item katalog",
+    ]
+    for name, stats in report['sources'].items():
+        latency = stats['latency']
+        lines.append(
+            f"   • {stats['label']}: {stats['pages']} halaman, {stats['listings']} listing, {stats['matched']} cocok, "
+            f"{stats['bytes'] / 1024:.1f} KB, "
+            f"latency p50 {latency['p50'] * 1000:.0f} ms / p95 {latency['p95'] * 1000:.0f} ms / "
+            f"max {latency['max'] * 1000:.0f} ms"
+        )
+        for error in stats['errors'][:3]:
+            lines.append(f"     ⚠️ {error}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    from price_scraper import InteriorPriceScraper
+    from price_stub_server import PriceStubConfig, start_price_stub_server
+
+    parser = argparse.ArgumentParser(description="Jalankan pipeline scraping harga (default: offline ke stub lokal)")
+    parser.add_argument("--sources-file", help="File JSON sumber live (default: fixture + stub lokal)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latency stub per halaman (detik)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang response 503 dari stub")
+    parser.add_argument("--seed", type=int, help="Seed random untuk injeksi error stub")
+    parser.add_argument("--concurrency", type=int, default=SCRAPER_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=SCRAPER_PER_HOST)
+    parser.add_argument("--host-delay", type=float, default=SCRAPER_HOST_DELAY)
+    args = parser.parse_args()
+
+    servers = []
+    if args.sources_file:
+        adapters = load_adapters(args.sources_file)
+    else:
+        # Satu stub per sumber (port beda = host beda, seperti toko sungguhan)
+        adapters = []
+        for i, spec in enumerate(FIXTURE_SOURCES):
+            server = start_price_stub_server(PriceStubConfig(latency=args.latency, error_rate=args.error_rate))
+            if args.seed is not None:
+                server.random.seed(args.seed + i)
+            servers.append(server)
+            adapters += build_adapters([spec], base_url=server.base_url)
+
+    scraper = InteriorPriceScraper()
+    fetcher = PoliteFetcher(concurrency=args.concurrency, per_host=args.per_host, host_delay=args.host_delay)
+    try:
+        report = scraper.refresh_prices(adapters, fetcher=fetcher)
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    print(format_scrape_report(report))
+    for name in report['updated']:
+        data = scraper.get_price_estimate(name)
+        print(f"   {name}: {data['min_price']:,.0f} - {data['max_price']:,.0f} / {data['satuan']} ({data['source']})")
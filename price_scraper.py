@@ -5,6 +5,9 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List
 import re
+from price_catalog import PriceCatalog
+from fuzzy_index import FuzzyIndex
+from price_pipeline import DEFAULT_HEADERS, PoliteFetcher, PricePipeline, load_adapters, run_sync
 
 class InteriorPriceScraper:
     """Scraper untuk mendapatkan harga material desain interior"""
@@ -195,6 +198,51 @@ class InteriorPriceScraper:
                 'description': 'Paket desain interior classic mewah'
             },
         }
+        
+        # Harga hasil scraping per item (menggantikan price_database untuk item tersebut)
+        self.scraped_prices: Dict[str, Dict] = {}
+        self.scrape_report = None
+        
+        self._compile()
+    
+    def _compile(self):
+        """Kompilasi katalog (price_database, ditimpa harga hasil scraping) + index fuzzy-nya"""
+        records = [self.scraped_prices.get(name) or {'name': name, **data}
+                   for name, data in self.price_database.items()]
+        
+        # Versi terkompilasi untuk lookup (array harga + index)
+        catalog = PriceCatalog(records, default_source='Database Harga Pasaran 2024')
+        
+        # Index untuk item yang salah ketik / beda ejaan / bahasa Inggris
+        self.fuzzy_index = FuzzyIndex(catalog.names)
+        self.catalog = catalog
+    
+    def refresh_prices(self, adapters: List = None, fetcher=None) -> Dict:
+        """
+        Scrape harga terbaru dari sumber online dan pakai untuk item yang ditemukan
+        
+        Item yang tidak ditemukan di sumber manapun tetap memakai price_database.
+        
+        Args:
+            adapters: List SourceAdapter (default: dari env PRICE_SOURCES_FILE)
+            fetcher: PoliteFetcher (default: setting dari env SCRAPER_*)
+            
+        Returns:
+            Laporan pipeline (throughput, latency per sumber) + 'updated': item yang diperbarui
+        """
+        adapters = load_adapters() if adapters is None else adapters
+        fetcher = fetcher or PoliteFetcher(headers={**DEFAULT_HEADERS, **self.headers})
+        pipeline = PricePipeline(adapters, self.catalog, self.fuzzy_index, fetcher)
+        records, report = run_sync(pipeline.run())
+        
+        self.scraped_prices = {record['name']: record for record in records}
+        self._compile()
+        
+        report['updated'] = [record['name'] for record in records]
+        self.scrape_report = report
+        print(f"🕸️ Harga diperbarui untuk {len(records)} item dari {len(adapters)} sumber "
+              f"({report['pages']} halaman, {report['seconds']:.2f} detik)")
+        return report
     
     def get_price_estimate(self, item_name: str) -> Dict:
         """
@@ -209,36 +257,18 @@ class InteriorPriceScraper:
         # Normalize item name
         item_lower = item_name.lower().strip()
         
-        # Cari di database
-        for key, data in self.price_database.items():
-            if key in item_lower or item_lower in key:
-                return {
-                    'found': True,
-                    'item': item_name,
-                    'min_price': data['min'],
-                    'max_price': data['max'],
-                    'avg_price': data['avg'],
-                    'satuan': data['satuan'],
-                    'description': data['description'],
-                    'source': 'Database Harga Pasaran 2024'
-                }
+        # Cari di katalog (nama ada di query / query ada di nama)
+        row = self.catalog.lookup(item_lower)
+        if row is not None:
+            return self._price_result(item_name, row)
         
         # Jika tidak ditemukan, coba fuzzy match
         best_match = self._fuzzy_search(item_lower)
         if best_match:
-            data = self.price_database[best_match]
-            return {
-                'found': True,
-                'item': item_name,
-                'matched_to': best_match,
-                'min_price': data['min'],
-                'max_price': data['max'],
-                'avg_price': data['avg'],
-                'satuan': data['satuan'],
-                'description': data['description'],
-                'source': 'Database Harga Pasaran 2024',
-                'note': f'Item yang mirip: {best_match}'
-            }
+            result = self._price_result(item_name, self.catalog.get(best_match))
+            result['matched_to'] = best_match
+            result['note'] = f'Item yang mirip: {best_match}'
+            return result
         
         return {
             'found': False,
@@ -246,25 +276,38 @@ class InteriorPriceScraper:
             'message': 'Item tidak ditemukan. Silakan hubungi kami untuk konsultasi harga.'
         }
     
+    def _price_result(self, item_name: str, row: int) -> Dict:
+        """Hasil estimasi dari satu item katalog"""
+        entry = self.catalog.entries[row]
+        return {
+            'found': True,
+            'item': item_name,
+            'min_price': entry.min,
+            'max_price': entry.max,
+            'avg_price': entry.avg,
+            'satuan': entry.satuan,
+            'description': entry.description,
+            'source': entry.source
+        }
+    
     def _fuzzy_search(self, query: str) -> str:
-        """Fuzzy search untuk menemukan item yang mirip"""
-        query_words = set(query.split())
-        
-        best_match = None
-        best_score = 0
+        """Fuzzy search untuk menemukan item yang mirip (nama item terbaik, None jika tidak ada)"""
+        matches = self.fuzzy_index.search(query, limit=1)
+        return self.catalog.names[matches[0][0]] if matches else None
+    
+    def search_similar(self, item_name: str, limit: int = 5) -> List[Dict]:
+        """
+        Kandidat item yang mirip, urut dari yang paling mirip
         
-        for key in self.price_database.keys():
-            key_words = set(key.split())
-            
-            # Hitung berapa banyak word yang match
-            matches = len(query_words & key_words)
+        Args:
+            item_name: Nama item (boleh salah ketik / bahasa Inggris)
+            limit: Jumlah kandidat maksimal
             
-            if matches > best_score:
-                best_score = matches
-                best_match = key
-        
-        # Return hanya jika ada minimal 1 word yang match
-        return best_match if best_score > 0 else None
+        Returns:
+            List {'item', 'score'} dengan skor 0-1
+        """
+        return [{'item': self.catalog.names[row], 'score': score}
+                for row, score in self.fuzzy_index.search(item_name, limit)]
     
     def get_package_estimate(self, room_type: str, area: float) -> Dict:
         """
@@ -0,0 +1,163 @@
+# price_stub_server.py
+# Stub server lokal yang melayani halaman toko dari scraper_fixtures/ (untuk test scraping tanpa network)
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from price_pipeline import FIXTURES_DIR
+
+
+class PriceStubConfig:
+    """
+    Perilaku stub server
+
+    Args:
+        latency: Waktu sampai halaman dikirim (detik)
+        jitter: Variasi acak latency (fraksi, mis. 0.2 = ±20%)
+        error_rate: Peluang response 503
+        fixtures_dir: Folder halaman, path URL /<sumber>/<halaman> → <fixtures_dir>/<sumber>/<halaman>
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0,
+                 fixtures_dir: str = FIXTURES_DIR):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fixtures_dir = fixtures_dir
+
+
+class PriceStubServer(ThreadingHTTPServer):
+    """HTTP server dengan config dan statistik bersama (termasuk request bersamaan tertinggi)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: PriceStubConfig):
+        super().__init__(address, _PriceStubHandler)
+        self.config = config
+        self.random = random.Random()
+        self.stats = {'requests': 0, 'errors': 0, 'not_found': 0, 'in_flight': 0, 'peak_in_flight': 0}
+        self.stats_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def count(self, key: str, value: int = 1):
+        with self.stats_lock:
+            self.stats[key] += value
+            if key == 'in_flight':
+                self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _PriceStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: PriceStubServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+
+        if self.path == "/stats":
+            with server.stats_lock:
+                self._send(200, json.dumps(server.stats).encode('utf-8'), "application/json")
+            return
+
+        server.count('requests')
+        server.count('in_flight')
+        try:
+            jitter = 1.0 + config.jitter * (2 * server.random.random() - 1)
+            time.sleep(max(0.0, config.latency * jitter))
+
+            if server.random.random() < config.error_rate:
+                server.count('errors')
+                self._send(503, b"Service Unavailable", "text/plain", {"retry-after": "0"})
+                return
+
+            # Hanya file di dalam folder fixture
+            relative = os.path.normpath(self.path.split('?', 1)[0].lstrip('/'))
+            path = os.path.join(config.fixtures_dir, relative)
+            if relative.startswith('..') or not os.path.isfile(path):
+                server.count('not_found')
+                self._send(404, b"Not Found", "text/plain")
+                return
+
+            with open(path, 'rb') as f:
+                self._send(200, f.read(), "text/html; charset=utf-8")
+        finally:
+            server.count('in_flight', -1)
+
+    def _send(self, status: int, payload: bytes, content_type: str, headers: Dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_price_stub_server(config: PriceStubConfig = None, host: str = "127.0.0.1",
+                            port: int = 0) -> PriceStubServer:
+    """
+    Jalankan stub server di thread background
+
+    Args:
+        config: Perilaku stub (default: PriceStubConfig())
+        host: Host yang di-bind
+        port: Port (0 = pilih port kosong)
+
+    Returns:
+        PriceStubServer yang sedang berjalan (pakai server.base_url, stop dengan server.shutdown())
+    """
+    server = PriceStubServer((host, port), config or PriceStubConfig())
+    thread = threading.Thread(target=server.serve_forever, name="price-stub", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub server lokal untuk halaman toko (scraper_fixtures/)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.05, help="Latency per halaman (detik)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variasi acak latency (fraksi)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang response 503")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR)
+    parser.add_argument("--seed", type=int, help="Seed random untuk injeksi error")
+    args = parser.parse_args()
+
+    config = PriceStubConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                             fixtures_dir=args.fixtures_dir)
+    server = PriceStubServer((args.host, args.port), config)
+    if args.seed is not None:
+        server.random.seed(args.seed)
+
+    print(f"🚀 Price stub server berjalan di {server.base_url}")
+    print(f"   Contoh: {server.base_url}/tokobangunan/lantai.html")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stub server dihentikan")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,48 +3,676 @@
 
 import PyPDF2
 import pdfplumber
+import hashlib
+import math
+import os
+import pickle
 import re
+import threading
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from pandas.api.types import union_categoricals
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Naikkan versi ini setiap kali logika parsing berubah,
+# supaya cache lama otomatis dianggap tidak valid
+RAB_PARSER_VERSION = 2
+
+# Lokasi default cache hasil parsing RAB
+DEFAULT_CACHE_DIR = os.getenv("RAB_CACHE_DIR", ".rab_cache")
+
+RAB_COLUMNS = ['kategori', 'item_pekerjaan', 'satuan', 'volume', 'harga_satuan', 'total']
+
+# Tipe kolom di DataFrame RAB yang di-materialize
+CATEGORY_COLUMNS = ['kategori', 'satuan']
+NUMERIC_COLUMNS = ['volume', 'harga_satuan', 'total']
+
+# Jumlah worker proses untuk extract tabel (1 = serial)
+DEFAULT_WORKERS = int(os.getenv("RAB_PARSER_WORKERS", "1"))
+
+# Mode paralel hanya dipakai untuk dokumen dengan halaman sebanyak ini atau lebih
+PARALLEL_MIN_PAGES = 8
+
+# Jumlah baris contoh per estimasi (ditampilkan di response)
+TOP_K_ROWS = 5
+
+# Persentil harga yang dihitung per item / kategori
+PERCENTILES = (25, 50, 75)
+
+# Jumlah hasil estimasi per keyword yang disimpan
+ESTIMATE_CACHE_SIZE = 1024
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, List]]:
+    """
+    Extract tabel dari halaman [start, end) - dijalankan di worker process
+    
+    Returns:
+        List (nomor_halaman, tables) urut sesuai halaman
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(i, pdf.pages[i].extract_tables()) for i in range(start, end)]
+
+
+def _tokenize(text: str) -> List[str]:
+    """Pecah teks jadi token lowercase (huruf/angka)"""
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+
+def _normalize_key(text: str) -> str:
+    """Key lookup: lowercase, spasi dirapikan"""
+    return ' '.join(str(text).lower().split())
+
+
+def _price_stats(prices: np.ndarray) -> Dict:
+    """Jumlah, min/max/mean, dan persentil dari array harga"""
+    p25, median, p75 = (float(value) for value in np.percentile(prices, PERCENTILES))
+    return {
+        'count': int(len(prices)),
+        'min': float(prices.min()),
+        'max': float(prices.max()),
+        'mean': float(prices.mean()),
+        'p25': p25,
+        'median': median,
+        'p75': p75,
+    }
+
+
+def _trigrams(token: str) -> set:
+    """Character trigram dari token (dengan padding di awal & akhir)"""
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class RABSearchIndex:
+    """
+    Inverted index untuk pencarian item RAB
+    
+    - Token → daftar baris yang mengandung token tersebut
+    - Trigram → daftar token, untuk mencari variasi ejaan / typo
+      (mis. "plafond" tetap ketemu "plafon")
+    """
+    
+    # Minimal kemiripan (Dice coefficient trigram) supaya token dianggap cocok
+    MIN_SIMILARITY = 0.6
+    
+    # Skor untuk token query yang merupakan bagian dari token lain (mis. "cat" di "pengecatan")
+    SUBSTRING_SCORE = 0.8
+    
+    # Bobot kecocokan di kategori dibanding di nama item
+    CATEGORY_WEIGHT = 0.5
+    
+    # Jumlah token query & posting list yang hasil lookup-nya disimpan
+    MEMO_SIZE = 4096
+    
+    # Token dengan kandidat >= num_rows / DENSE_FRACTION diproses sebagai array penuh
+    DENSE_FRACTION = 4
+    
+    def __init__(self):
+        self.num_rows = 0
+        self._item_postings: Dict[str, List[int]] = {}
+        self._category_postings: Dict[str, List[int]] = {}
+        self._token_trigrams: Dict[str, set] = {}
+        self._trigram_tokens: Dict[str, set] = {}
+        
+        # Cache hasil lookup yang dihitung saat query (dibatasi MEMO_SIZE, yang terlama dibuang).
+        # Index dipakai bersama semua sesi, jadi penulisan memo dikunci.
+        self._arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        self._matches: Dict[str, List[Tuple[str, float]]] = {}
+        self._memo_lock = threading.Lock()
+    
+    def add_rows(self, items: List[str], categories: List[str]):
+        """Tambahkan baris baru ke index (row id melanjutkan baris sebelumnya)"""
+        for offset, (item, category) in enumerate(zip(items, categories)):
+            row_id = self.num_rows + offset
+            for postings, text in ((self._item_postings, item),
+                                   (self._category_postings, category)):
+                for token in set(_tokenize(text)):
+                    postings.setdefault(token, []).append(row_id)
+                    self._add_vocabulary(token)
+        
+        self.num_rows += len(items)
+        with self._memo_lock:
+            self._arrays.clear()
+            self._matches.clear()
+    
+    def _add_vocabulary(self, token: str):
+        """Daftarkan token ke index trigram"""
+        if token in self._token_trigrams:
+            return
+        grams = _trigrams(token)
+        self._token_trigrams[token] = grams
+        for gram in grams:
+            self._trigram_tokens.setdefault(gram, set()).add(token)
+    
+    def _remember(self, memo: Dict, key, value):
+        """Simpan hasil lookup di memo, buang entry terlama kalau sudah penuh (thread-safe)"""
+        with self._memo_lock:
+            if key not in memo and len(memo) >= self.MEMO_SIZE:
+                memo.pop(next(iter(memo)), None)
+            memo[key] = value
+        return value
+    
+    def _match_token(self, query_token: str) -> List[Tuple[str, float]]:
+        """Cari token di vocabulary yang cocok dengan token query, beserta skornya"""
+        matches = self._matches.get(query_token)
+        if matches is not None:
+            return matches
+        
+        query_grams = _trigrams(query_token)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for token in self._trigram_tokens.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        
+        matches = []
+        for token, count in shared.items():
+            if token == query_token:
+                score = 1.0
+            else:
+                similarity = 2 * count / (len(query_grams) + len(self._token_trigrams[token]))
+                score = similarity if similarity >= self.MIN_SIMILARITY else 0.0
+                if len(query_token) >= 3 and query_token in token:
+                    score = max(score, self.SUBSTRING_SCORE)
+            if score > 0:
+                matches.append((token, score))
+        
+        return self._remember(self._matches, query_token, matches)
+    
+    def _postings_array(self, kind: str, token: str) -> np.ndarray:
+        """Posting list sebagai numpy array (di-cache)"""
+        key = (kind, token)
+        rows = self._arrays.get(key)
+        if rows is None:
+            postings = self._item_postings if kind == 'item' else self._category_postings
+            rows = self._remember(self._arrays, key, np.asarray(postings.get(token, ()), dtype=np.int64))
+        return rows
+    
+    def _token_postings(self, query_token: str) -> List[Tuple[float, np.ndarray]]:
+        """Posting list yang cocok dengan satu token query + skornya, urut dari skor tertinggi"""
+        parts = []
+        for token, score in self._match_token(query_token):
+            for kind, weight in (('item', 1.0), ('category', self.CATEGORY_WEIGHT)):
+                rows = self._postings_array(kind, token)
+                if len(rows):
+                    parts.append((score * weight, rows))
+        parts.sort(key=lambda part: -part[0])
+        return parts
+    
+    def match(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Baris yang cocok dengan paling banyak token query, belum diurutkan
+        
+        Array skor dibuat sekali per query dan hanya baris di posting list
+        yang disentuh; tiap baris dihitung sekali per token query dengan skor terbaiknya.
+        
+        Returns:
+            (row ids urut naik, skor masing-masing baris)
+        """
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        tokens = set(_tokenize(query))
+        if not self.num_rows or not tokens:
+            return empty
+        
+        scores = np.zeros(self.num_rows, dtype=np.float32)
+        coverage = np.zeros(self.num_rows, dtype=np.int32)
+        token_scores = None
+        
+        for query_token in tokens:
+            parts = self._token_postings(query_token)
+            num_hits = sum(len(rows) for _, rows in parts)
+            if not num_hits:
+                continue
+            
+            if len(parts) == 1 and num_hits * self.DENSE_FRACTION < self.num_rows:
+                score, rows = parts[0]
+                scores[rows] += score
+                coverage[rows] += 1
+                continue
+            
+            # Isi dari skor terendah supaya skor tertinggi yang tersisa per baris
+            if token_scores is None:
+                token_scores = np.zeros(self.num_rows, dtype=np.float32)
+            for score, rows in reversed(parts):
+                token_scores[rows] = score
+            
+            if num_hits * self.DENSE_FRACTION >= self.num_rows:
+                # Kandidat sebanyak ini lebih murah diproses sebagai array penuh
+                scores += token_scores
+                coverage += token_scores > 0
+                token_scores.fill(0)
+            else:
+                # Baris duplikat di `rows` menulis nilai yang sama, jadi aman
+                rows = np.concatenate([rows for _, rows in parts])
+                scores[rows] += token_scores[rows]
+                coverage[rows] += 1
+                token_scores[rows] = 0
+        
+        best = coverage.max()
+        if not best:
+            return empty
+        row_ids = np.flatnonzero(coverage == best)
+        return row_ids, scores[row_ids]
+    
+    @staticmethod
+    def rank(row_ids: np.ndarray, scores: np.ndarray,
+             limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Urutkan hasil match() dari skor tertinggi (skor sama: row id terkecil dulu)
+        
+        Args:
+            limit: Ambil hanya sejumlah ini (pakai argpartition, tidak mengurutkan semua baris)
+        """
+        if limit is not None and limit < len(row_ids):
+            if limit <= 0:
+                return row_ids[:0], scores[:0]
+            # Semua baris dengan skor >= skor ke-limit, supaya hasil sama dengan sort penuh
+            threshold = scores[np.argpartition(-scores, limit - 1)[limit - 1]]
+            keep = scores >= threshold
+            row_ids, scores = row_ids[keep], scores[keep]
+        
+        order = np.lexsort((row_ids, -scores))[:limit]
+        return row_ids[order], scores[order]
+    
+    def search(self, query: str, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cari baris yang cocok dengan query
+        
+        Baris yang cocok dengan paling banyak token query yang diambil
+        (mis. "pekerjaan cat" hanya mengembalikan baris yang cocok dengan keduanya
+        jika ada), lalu diurutkan berdasarkan skor.
+        
+        Args:
+            query: Teks pencarian
+            limit: Jumlah hasil teratas (None = semua)
+        
+        Returns:
+            (row ids urut dari skor tertinggi, skor masing-masing baris)
+        """
+        row_ids, scores = self.match(query)
+        return self.rank(row_ids, scores, limit)
+
 
 class RABParser:
     """Parser untuk membaca dan mengekstrak data dari file RAB PDF"""
     
-    def __init__(self):
-        self.rab_data = []
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, workers: int = DEFAULT_WORKERS):
+        """
+        Args:
+            cache_dir: Folder cache hasil parsing (None = tanpa cache)
+            workers: Jumlah worker proses untuk extract tabel PDF (1 = serial)
+        """
         self.categories = {}
+        self.workers = max(1, workers)
+        
+        # Cache hasil parsing di disk
+        self.cache_dir = cache_dir
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Satu DataFrame RAB yang sudah bertipe, ditambah setiap kali ada PDF baru
+        self._frame = self._to_frame(pd.DataFrame(columns=RAB_COLUMNS))
+        self._index = RABSearchIndex()
+        
+        # Statistik harga per item & kategori + hasil estimasi per keyword
+        # (parser dipakai bersama semua sesi, jadi memo estimasi dikunci)
+        self._estimates_lock = threading.Lock()
+        self._build_aggregates()
+    
+    @property
+    def item_count(self) -> int:
+        """Jumlah item RAB yang sudah di-load"""
+        return len(self._frame)
+    
+    @property
+    def rab_data(self) -> List[Dict]:
+        """
+        Semua item RAB dalam bentuk list of dict
+        
+        Dibuat sekali setiap data RAB berubah (list yang sama dipakai ulang, jangan diubah).
+        """
+        if self._records is None:
+            self._records = [self._row_record(row) for row in range(len(self._frame))]
+        return self._records
+    
+    def get_frame(self) -> pd.DataFrame:
+        """DataFrame semua item RAB"""
+        return self._frame
         
-    def parse_pdf(self, pdf_path: str) -> pd.DataFrame:
+    def parse_pdf(self, pdf_path: str, workers: int = None) -> pd.DataFrame:
         """
         Parse PDF RAB dan return DataFrame
         
+        Hasil parsing disimpan di cache disk. Selama file PDF tidak berubah
+        (path, ukuran, mtime, dan hash isi sama), parsing berikutnya
+        langsung diambil dari cache.
+        
         Args:
             pdf_path: Path ke file PDF RAB
+            workers: Override jumlah worker proses (default: self.workers)
             
         Returns:
             DataFrame dengan kolom: kategori, item, satuan, volume, harga_satuan, total
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    # Extract tables dari PDF
-                    tables = page.extract_tables()
-                    
-                    for table in tables:
-                        if table:
-                            self._process_table(table)
-            
-            # Convert ke DataFrame
-            df = pd.DataFrame(self.rab_data)
-            return df
+            chunk = self._load_from_cache(pdf_path)
+            
+            if chunk is None:
+                rows = self._extract_rows(pdf_path, workers or self.workers)
+                chunk = pd.DataFrame(rows, columns=RAB_COLUMNS)
+                self._save_to_cache(pdf_path, chunk)
+            
+            self._append_frame(chunk)
+            return self.get_frame()
             
         except Exception as e:
             print(f"Error parsing PDF: {e}")
             return pd.DataFrame()
     
-    def _process_table(self, table: List[List[str]]):
-        """Process single table dari PDF"""
+    def _extract_rows(self, pdf_path: str, workers: int = 1) -> List[Dict]:
+        """Extract semua item pekerjaan dari satu file PDF"""
+        with pdfplumber.open(pdf_path) as pdf:
+            num_pages = len(pdf.pages)
+            
+            if workers <= 1 or num_pages < PARALLEL_MIN_PAGES:
+                # Extract tables dari PDF (serial)
+                page_tables = [page.extract_tables() for page in pdf.pages]
+        
+        if workers > 1 and num_pages >= PARALLEL_MIN_PAGES:
+            page_tables = self._extract_tables_parallel(pdf_path, num_pages, workers)
+        
+        # Gabungkan hasil sesuai urutan halaman. Kategori dibawa lintas
+        # tabel/halaman karena header kategori bisa ada di halaman sebelumnya.
+        rows = []
         current_category = ""
+        for tables in page_tables:
+            for table in tables:
+                if table:
+                    items, current_category = self._process_table(table, current_category)
+                    rows.extend(items)
+        
+        return rows
+    
+    @staticmethod
+    def _to_frame(chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ubah data mentah jadi DataFrame bertipe:
+        kategori/satuan categorical, angka float64
+        
+        float32 hanya presisi sampai 2^24 (±16,7 juta), padahal total RAB
+        sering jauh di atas itu, jadi kolom rupiah tetap float64.
+        """
+        frame = chunk[RAB_COLUMNS].copy()
+        for col in CATEGORY_COLUMNS:
+            frame[col] = frame[col].fillna('').astype(str).astype('category')
+        for col in NUMERIC_COLUMNS:
+            frame[col] = frame[col].astype(np.float64)
+        frame['item_pekerjaan'] = frame['item_pekerjaan'].fillna('').astype(str)
+        return frame
+    
+    def _append_frame(self, chunk: pd.DataFrame):
+        """Tambahkan hasil parsing satu dokumen ke DataFrame RAB (incremental)"""
+        if chunk.empty:
+            return
+        
+        new_frame = self._to_frame(chunk)
+        self._index.add_rows(new_frame['item_pekerjaan'].tolist(),
+                             new_frame['kategori'].astype(str).tolist())
+        
+        if self._frame.empty:
+            self._frame = new_frame
+        else:
+            frame = pd.concat([self._frame, new_frame], ignore_index=True)
+            
+            # concat dengan kategori berbeda jadi object, gabungkan kategorinya lagi
+            for col in CATEGORY_COLUMNS:
+                frame[col] = union_categoricals([self._frame[col], new_frame[col]], ignore_order=True)
+            
+            self._frame = frame
+        
+        self._build_aggregates()
+    
+    # ------------------------------------------------------------------
+    # Agregat harga (dihitung sekali saat load)
+    # ------------------------------------------------------------------
+    
+    def _build_aggregates(self):
+        """
+        Hitung ulang statistik harga per item & per kategori
+        
+        Dipanggil setiap kali data RAB bertambah, jadi estimasi saat query
+        cukup lookup tanpa menghitung ulang / mengubah baris jadi dict.
+        """
+        frame = self._frame
+        self._prices = frame['harga_satuan'].to_numpy(dtype=np.float64)
+        self._columns = {
+            col: (frame[col].astype(str) if col in CATEGORY_COLUMNS else frame[col]).tolist()
+            for col in RAB_COLUMNS
+        }
+        
+        self._item_stats = self._group_stats(frame['item_pekerjaan'].map(_normalize_key).to_numpy())
+        kategori = frame['kategori']
+        category_keys = np.asarray([_normalize_key(cat) for cat in kategori.cat.categories] + [''], dtype=object)
+        self._category_stats = self._group_stats(category_keys[kategori.cat.codes.to_numpy()])
+        with self._estimates_lock:
+            self._estimates = {}
+        self._records = None
+    
+    def _group_stats(self, keys: np.ndarray) -> Dict[str, Dict]:
+        """Statistik harga + baris contoh untuk setiap key (semua grup dihitung sekaligus)"""
+        codes, uniques = pd.factorize(keys)
+        if not len(uniques):
+            return {}
+        
+        # Urutkan per grup lalu per harga, jadi setiap grup jadi satu potongan yang sudah urut
+        order = np.lexsort((self._prices, codes))
+        prices = self._prices[order]
+        counts = np.bincount(codes, minlength=len(uniques))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        ends = starts + counts - 1
+        means = np.add.reduceat(prices, starts) / counts
+        
+        # Persentil dengan interpolasi linear (sama seperti np.percentile)
+        percentiles = []
+        for q in PERCENTILES:
+            position = starts + (counts - 1) * (q / 100)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            percentiles.append(prices[lower] + (prices[upper] - prices[lower]) * (position - lower))
+        
+        # Baris contoh tersebar dari harga termurah sampai termahal
+        picks = starts[:, None] + np.rint(np.linspace(0, 1, TOP_K_ROWS)[None, :] * (counts - 1)[:, None]).astype(np.int64)
+        picks = order[picks]
+        
+        stats = {}
+        for i, key in enumerate(uniques):
+            if not key:
+                continue
+            stats[key] = {
+                'count': int(counts[i]),
+                'min': float(prices[starts[i]]),
+                'max': float(prices[ends[i]]),
+                'mean': float(means[i]),
+                'p25': float(percentiles[0][i]),
+                'median': float(percentiles[1][i]),
+                'p75': float(percentiles[2][i]),
+                'items': [self._row_record(row) for row in dict.fromkeys(picks[i].tolist())],
+            }
+        return stats
+    
+    def _row_record(self, row: int) -> Dict:
+        """Satu baris RAB sebagai dict"""
+        return {col: self._columns[col][row] for col in RAB_COLUMNS}
+    
+    def get_item_stats(self, item_name: str) -> Optional[Dict]:
+        """Statistik harga untuk nama item persis (None jika tidak ada)"""
+        return self._item_stats.get(_normalize_key(item_name))
+    
+    def get_category_stats(self, category: str) -> Optional[Dict]:
+        """Statistik harga untuk satu kategori (None jika tidak ada)"""
+        return self._category_stats.get(_normalize_key(category))
+    
+    def _extract_tables_parallel(self, pdf_path: str, num_pages: int, workers: int) -> List[List]:
+        """
+        Extract tabel per halaman secara paralel dengan ProcessPoolExecutor
+        
+        Halaman dibagi jadi beberapa range (lebih banyak dari jumlah worker
+        supaya beban merata), lalu hasilnya disusun ulang sesuai urutan halaman.
+        """
+        chunk_size = max(1, math.ceil(num_pages / (workers * 4)))
+        ranges = [(start, min(start + chunk_size, num_pages))
+                  for start in range(0, num_pages, chunk_size)]
+        
+        page_tables = [[] for _ in range(num_pages)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_page_range, pdf_path, start, end)
+                       for start, end in ranges]
+            for future in futures:
+                for page_no, tables in future.result():
+                    page_tables[page_no] = tables
+        
+        return page_tables
+    
+    # ------------------------------------------------------------------
+    # Cache hasil parsing
+    # ------------------------------------------------------------------
+    
+    def _cache_path(self, pdf_path: str) -> str:
+        """Path file cache untuk satu PDF (berdasarkan absolute path)"""
+        abs_path = os.path.abspath(pdf_path)
+        name = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.rabcache")
+    
+    @staticmethod
+    def _file_hash(pdf_path: str) -> str:
+        """SHA-256 dari isi file"""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _load_from_cache(self, pdf_path: str) -> Optional[pd.DataFrame]:
+        """
+        Ambil hasil parsing dari cache
+        
+        Returns:
+            DataFrame item jika cache valid, None jika miss
+        """
+        if not self.cache_dir:
+            return None
+        
+        cache_path = self._cache_path(pdf_path)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            
+            meta = cached['meta']
+            stat = os.stat(pdf_path)
+            
+            valid = (
+                meta['version'] == RAB_PARSER_VERSION
+                and meta['path'] == os.path.abspath(pdf_path)
+                and meta['size'] == stat.st_size
+            )
+            
+            # mtime berubah tapi isi sama (mis. file di-copy ulang) masih dianggap valid
+            if valid and meta['mtime'] != stat.st_mtime_ns:
+                valid = meta['sha256'] == self._file_hash(pdf_path)
+                if valid:
+                    meta['mtime'] = stat.st_mtime_ns
+                    self._write_cache(cache_path, cached)
+            
+            if not valid:
+                self.cache_misses += 1
+                return None
+            
+            # Data disimpan per kolom
+            chunk = pd.DataFrame(cached['columns'], columns=RAB_COLUMNS)
+            
+            self.cache_hits += 1
+            return chunk
+            
+        except Exception:
+            # File cache belum ada / rusak → parse ulang
+            self.cache_misses += 1
+            return None
+    
+    def _save_to_cache(self, pdf_path: str, chunk: pd.DataFrame):
+        """Simpan hasil parsing ke cache (format kolom, pickle)"""
+        if not self.cache_dir:
+            return
+        
+        try:
+            stat = os.stat(pdf_path)
+            cached = {
+                'meta': {
+                    'version': RAB_PARSER_VERSION,
+                    'path': os.path.abspath(pdf_path),
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime_ns,
+                    'sha256': self._file_hash(pdf_path),
+                },
+                'columns': {col: chunk[col].tolist() for col in RAB_COLUMNS},
+            }
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_cache(self._cache_path(pdf_path), cached)
+        except Exception as e:
+            print(f"⚠️ Warning: Gagal menyimpan cache RAB: {e}")
+    
+    @staticmethod
+    def _write_cache(cache_path: str, cached: Dict):
+        """Tulis cache secara atomic (tulis ke file sementara lalu rename)"""
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    
+    def invalidate_cache(self, pdf_path: str = None):
+        """
+        Hapus cache parsing
+        
+        Args:
+            pdf_path: Hapus cache untuk file ini saja (None = hapus semua cache)
+        """
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        
+        if pdf_path:
+            targets = [self._cache_path(pdf_path)]
+        else:
+            targets = [os.path.join(self.cache_dir, name)
+                       for name in os.listdir(self.cache_dir)
+                       if name.endswith('.rabcache')]
+        
+        for target in targets:
+            if os.path.exists(target):
+                os.remove(target)
+    
+    def get_cache_stats(self) -> Dict:
+        """Statistik hit/miss cache parsing"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_ratio': self.cache_hits / total if total else 0.0,
+            'version': RAB_PARSER_VERSION,
+        }
+    
+    def _process_table(self, table: List[List[str]], current_category: str = "") -> Tuple[List[Dict], str]:
+        """
+        Process single table dari PDF
+        
+        Args:
+            table: Baris-baris tabel hasil extract
+            current_category: Kategori aktif dari tabel/halaman sebelumnya
+            
+        Returns:
+            (list item, kategori aktif terakhir)
+        """
+        items = []
         
         for row in table:
             if not row or len(row) < 5:
@@ -58,7 +686,9 @@ class RABParser:
             # Extract item pekerjaan
             item_data = self._extract_item(row, current_category)
             if item_data:
-                self.rab_data.append(item_data)
+                items.append(item_data)
+        
+        return items, current_category
     
     def _is_category_header(self, row: List[str]) -> bool:
         """Check apakah row adalah category header"""
@@ -151,48 +781,114 @@ class RABParser:
         except:
             return 0.0
     
+    def _category_mask(self, keyword: str) -> pd.Series:
+        """Mask baris yang kategorinya mengandung keyword (dicek per kategori, bukan per baris)"""
+        kategori = self._frame['kategori']
+        keyword_lower = keyword.lower()
+        matched = [cat for cat in kategori.cat.categories if keyword_lower in cat.lower()]
+        return kategori.isin(matched)
+    
     def get_items_by_category(self, category: str = None) -> pd.DataFrame:
         """Get items filtered by category"""
-        df = pd.DataFrame(self.rab_data)
+        df = self._frame
         
         if category:
-            df = df[df['kategori'].str.contains(category, case=False, na=False)]
+            df = df[self._category_mask(category)]
         
         return df
     
     def search_items(self, keyword: str) -> pd.DataFrame:
-        """Search items by keyword"""
-        df = pd.DataFrame(self.rab_data)
+        """
+        Search items by keyword
         
+        Pencarian lewat inverted index (token + trigram), jadi tahan typo
+        dan hasilnya diurutkan dari yang paling relevan. Jika index tidak
+        menemukan apa-apa, dipakai pencarian substring lama.
+        """
         # Search in item_pekerjaan and kategori
-        mask = df['item_pekerjaan'].str.contains(keyword, case=False, na=False) | \
-               df['kategori'].str.contains(keyword, case=False, na=False)
+        return self._frame.iloc[self.search_rows(keyword)]
+    
+    def search_rows(self, keyword: str, limit: int = None) -> np.ndarray:
+        """
+        Posisi baris (di get_frame()) yang cocok dengan keyword, urut dari yang paling relevan
         
-        return df[mask]
+        Args:
+            keyword: Kata kunci pencarian
+            limit: Jumlah baris teratas (None = semua)
+        """
+        row_ids, _ = self._index.rank(*self._match_rows(keyword), limit)
+        return row_ids
+    
+    def _match_rows(self, keyword: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hasil index.match(), atau baris hasil pencarian substring (skor 0) jika kosong"""
+        row_ids, scores = self._index.match(keyword)
+        if not len(row_ids):
+            row_ids = self._substring_rows(keyword)
+            scores = np.zeros(len(row_ids), dtype=np.float32)
+        return row_ids, scores
+    
+    def _substring_rows(self, keyword: str) -> np.ndarray:
+        """
+        Baris yang nama item / kategorinya mengandung keyword (tanpa index)
+        
+        Cadangan untuk potongan kata yang tidak cocok dengan token manapun,
+        mis. "at" di "Pengecatan" (token query < 3 huruf tidak dicari sebagai substring).
+        """
+        keyword = keyword.strip()
+        if not keyword or not len(self._frame):
+            return np.empty(0, dtype=np.int64)
+        
+        mask = self._frame['item_pekerjaan'].str.contains(keyword, case=False, regex=False) | \
+            self._category_mask(keyword)
+        return np.flatnonzero(mask.to_numpy())
     
     def get_price_estimate(self, keyword: str) -> Dict:
-        """Get price estimate for specific work type"""
-        results = self.search_items(keyword)
+        """
+        Get price estimate for specific work type
         
-        if results.empty:
-            return {
-                'found': False,
-                'message': f'Tidak ditemukan data untuk "{keyword}"'
-            }
+        Keyword yang persis nama item / kategori langsung memakai agregat
+        yang dihitung saat load; keyword lain dicari lewat index lalu
+        statistiknya dihitung dari array harga. Hasil disimpan per keyword.
+        """
+        key = _normalize_key(keyword)
+        result = self._estimates.get(key)
+        
+        if result is None:
+            result = self._compute_estimate(key)
+            # Parser dipakai bersama semua sesi: eviction + insert dikunci
+            with self._estimates_lock:
+                if key not in self._estimates and len(self._estimates) >= ESTIMATE_CACHE_SIZE:
+                    self._estimates.pop(next(iter(self._estimates)), None)
+                self._estimates[key] = result
         
-        # Calculate statistics
-        avg_price = results['harga_satuan'].mean()
-        min_price = results['harga_satuan'].min()
-        max_price = results['harga_satuan'].max()
+        if not result['found']:
+            return dict(result, message=f'Tidak ditemukan data untuk "{keyword}"')
+        return dict(result, keyword=keyword)
+    
+    def _compute_estimate(self, key: str) -> Dict:
+        """Estimasi untuk keyword yang sudah dinormalisasi (tanpa cache)"""
+        stats = self._item_stats.get(key) or self._category_stats.get(key)
+        
+        if stats is None:
+            # Statistik dari semua baris yang cocok, urutan cukup untuk contoh teratas
+            row_ids, scores = self._match_rows(key)
+            if not len(row_ids):
+                return {'found': False}
+            
+            stats = _price_stats(self._prices[row_ids])
+            top_rows, _ = self._index.rank(row_ids, scores, TOP_K_ROWS)
+            stats['items'] = [self._row_record(row) for row in top_rows]
         
         return {
             'found': True,
-            'keyword': keyword,
-            'count': len(results),
-            'avg_price_per_unit': avg_price,
-            'min_price_per_unit': min_price,
-            'max_price_per_unit': max_price,
-            'items': results.to_dict('records')
+            'count': stats['count'],
+            'avg_price_per_unit': stats['mean'],
+            'min_price_per_unit': stats['min'],
+            'max_price_per_unit': stats['max'],
+            'median_price_per_unit': stats['median'],
+            'p25_price_per_unit': stats['p25'],
+            'p75_price_per_unit': stats['p75'],
+            'items': stats['items']
         }
 
 
@@ -210,16 +906,18 @@ def format_rab_response(data: Dict) -> str:
     response = f"📊 Estimasi Harga untuk '{data['keyword']}':\n\n"
     response += f"Ditemukan {data['count']} item:\n"
     response += f"• Harga rata-rata: {format_currency(data['avg_price_per_unit'])}\n"
+    response += f"• Harga tengah (median): {format_currency(data['median_price_per_unit'])}\n"
     response += f"• Harga minimum: {format_currency(data['min_price_per_unit'])}\n"
     response += f"• Harga maksimum: {format_currency(data['max_price_per_unit'])}\n\n"
     
     response += "Detail item:\n"
-    for i, item in enumerate(data['items'][:5], 1):  # Show max 5 items
+    for i, item in enumerate(data['items'][:TOP_K_ROWS], 1):
         response += f"{i}. {item['item_pekerjaan']}\n"
         response += f"   {format_currency(item['harga_satuan'])}/{item['satuan']}\n"
     
-    if len(data['items']) > 5:
-        response += f"\n...dan {len(data['items']) - 5} item lainnya\n"
+    shown = min(len(data['items']), TOP_K_ROWS)
+    if data['count'] > shown:
+        response += f"\n...dan {data['count'] - shown} item lainnya\n"
     
     return response
 
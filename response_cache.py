@@ -0,0 +1,192 @@
+# response_cache.py
+# Cache jawaban AI untuk pertanyaan harga/paket yang sering berulang
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Intent yang jawabannya boleh di-cache (jawaban berbasis data RAB/harga)
+CACHEABLE_INTENTS = ('rab_query', 'interior_price', 'package')
+
+# Umur cache dalam detik
+DEFAULT_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+
+# Jumlah maksimal jawaban di memory
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+# Folder cache di disk (kosong = memory saja)
+DEFAULT_DISK_DIR = os.getenv("RESPONSE_CACHE_DIR") or None
+
+
+class ResponseCache:
+    """
+    Cache jawaban dengan TTL dan LRU eviction
+
+    - Tier memory: OrderedDict, entry paling lama tidak dipakai dibuang dulu
+    - Tier disk (opsional): satu file JSON per key, supaya cache tetap ada
+      setelah restart
+    """
+
+    def __init__(self, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk_dir: Optional[str] = DEFAULT_DISK_DIR):
+        """
+        Args:
+            ttl: Umur entry dalam detik
+            max_entries: Jumlah maksimal entry di memory
+            disk_dir: Folder cache di disk (None = memory saja)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(intent: str, keywords: List[str], data_version: str) -> str:
+        """
+        Buat key cache dari intent, keyword, dan versi data
+
+        Keyword dinormalisasi (lowercase, tanpa duplikat, diurutkan) supaya
+        "keramik granit" dan "Granit keramik" memakai entry yang sama.
+        """
+        normalized = sorted({' '.join(keyword.lower().split()) for keyword in keywords})
+        raw = json.dumps([intent, normalized, data_version], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Ambil jawaban dari cache (None jika tidak ada / kadaluarsa)"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        # Coba tier disk (dipromosikan ke memory dengan waktu kadaluarsa dari disk)
+        entry = self._disk_get(key, now)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            expires, value = entry
+            self._put(key, value, expires)
+            return value
+
+    def set(self, key: str, value: str):
+        """Simpan jawaban ke cache"""
+        now = time.time()
+        expires = now + self.ttl
+        with self._lock:
+            self._put(key, value, expires)
+        self._disk_set(key, value, expires)
+
+    def _put(self, key: str, value: str, expires: float):
+        """Simpan ke memory lalu buang entry LRU jika penuh (lock harus dipegang)"""
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Kosongkan cache (memory dan disk)"""
+        with self._lock:
+            self._entries.clear()
+
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def get_stats(self) -> Dict:
+        """Statistik hit/miss cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'size': len(self._entries),
+        }
+
+    # ------------------------------------------------------------------
+    # Tier disk
+    # ------------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """
+        Baca entry dari disk
+
+        File yang kadaluarsa atau rusak langsung dihapus.
+
+        Returns:
+            (waktu kadaluarsa, jawaban), atau None jika tidak ada / kadaluarsa / rusak
+        """
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            expires, value = float(entry['expires']), entry['value']
+            if not isinstance(value, str):
+                raise ValueError("value bukan string")
+            if expires > now:
+                return expires, value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            pass
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    def _disk_set(self, key: str, value: str, expires: float):
+        """Tulis entry ke disk (error diabaikan, disk hanya tier tambahan)"""
+        if not self.disk_dir:
+            return
+
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = f"{self._disk_path(key)}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'expires': expires, 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            print(f"⚠️ Warning: Gagal menyimpan response cache: {e}")
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Ambil response cache bersama (satu per proses, dipakai semua sesi)"""
+    global _response_cache
+
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+
+    return _response_cache
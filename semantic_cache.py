@@ -0,0 +1,240 @@
+# semantic_cache.py
+# Cache semantik lokal untuk pertanyaan customer yang mirip (tanpa API / network)
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Minimal cosine similarity supaya jawaban lama dipakai ulang
+# (kata pengisi dibuang dan angka/keyword sudah dipisah lewat scope, jadi parafrase skornya tinggi)
+DEFAULT_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.75"))
+
+# Jumlah maksimal pertanyaan yang disimpan (ring buffer)
+DEFAULT_CAPACITY = int(os.getenv("SEMANTIC_CACHE_CAPACITY", "512"))
+
+# Umur entry dalam detik
+DEFAULT_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+
+# Dimensi vektor (hashing trick)
+NUM_FEATURES = 2 ** 11
+
+# Bobot fitur kata utuh dibanding n-gram (kata utuh dihitung sebanyak ini)
+WORD_WEIGHT = 2
+
+# Kata tanya / pengisi yang tidak membedakan pertanyaan ("berapa ya", "harganya dong")
+FILLER_WORDS = {
+    'berapa', 'berapaan', 'harga', 'harganya', 'biaya', 'biayanya', 'kisaran', 'kira', 'sekitar',
+    'ya', 'dong', 'sih', 'kah', 'nih', 'deh', 'kak', 'min', 'gan', 'mohon', 'tolong', 'info',
+    'yang', 'apa', 'ada', 'mau', 'tanya', 'bisa', 'saja', 'aja', 'untuk', 'buat', 'dengan',
+    'di', 'ke', 'dan', 'itu', 'ini', 'kalau', 'kalo', 'saya', 'aku', 'nya',
+}
+
+
+def _features(text: str) -> List[int]:
+    """
+    Fitur hashed dari teks: kata utuh + character n-gram (3 & 4) per kata
+
+    Kata pengisi dibuang dan "per meter" digabung jadi "permeter", jadi
+    "harga granit per meter?" dan "granit permeter berapa ya" sama persis.
+    N-gram membuat variasi penulisan lain tetap mirip.
+    """
+    text = re.sub(r'\bper\s+(?=[a-z])', 'per', text.lower())
+    words = [word for word in re.findall(r'[a-z0-9²]+', text) if word not in FILLER_WORDS]
+    features = []
+
+    for word in words:
+        features.extend([zlib.crc32(f"w:{word}".encode('utf-8')) % NUM_FEATURES] * WORD_WEIGHT)
+        padded = f" {word} "
+        for n in (3, 4):
+            for i in range(len(padded) - n + 1):
+                features.append(zlib.crc32(padded[i:i + n].encode('utf-8')) % NUM_FEATURES)
+
+    return features
+
+
+class SemanticCache:
+    """
+    Cache jawaban berdasarkan kemiripan pertanyaan
+
+    - Pertanyaan diubah jadi vektor TF-IDF (hashing trick, numpy, CPU saja)
+    - Yang disimpan hanya term frequency per slot ring buffer; IDF dipakai saat
+      lookup, jadi entry baru cukup menulis satu slot (tanpa hitung ulang matrix)
+    - Lookup = perkalian matrix (cosine similarity) ke pertanyaan lama dengan scope sama
+    - Jawaban hanya dipakai ulang jika scope sama (lihat make_scope: intent,
+      keyword, angka, versi data) dan similarity >= threshold
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, capacity: int = DEFAULT_CAPACITY,
+                 ttl: int = DEFAULT_TTL):
+        """
+        Args:
+            threshold: Minimal cosine similarity untuk cache hit
+            capacity: Jumlah maksimal pertanyaan yang disimpan
+            ttl: Umur entry dalam detik
+        """
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+
+        # Term frequency per entry (dan kuadratnya, untuk norm setelah dibobot IDF)
+        self._tf = np.zeros((capacity, NUM_FEATURES), dtype=np.float32)
+        self._tf_sq = np.zeros((capacity, NUM_FEATURES), dtype=np.float32)
+        self._doc_freq = np.zeros(NUM_FEATURES, dtype=np.float32)
+
+        self._answers: List[Optional[str]] = [None] * capacity
+        self._scopes = np.full(capacity, -1, dtype=np.int64)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_scope(intent: str, keywords: List[str], question: str, data_version: str) -> str:
+        """
+        Buat scope dari intent, keyword yang cocok, angka di pertanyaan, dan versi data
+
+        Keyword produk dan angka ("rumah 2 lantai" vs "3 lantai", "3x4") menentukan
+        jawaban tapi bobotnya kecil di vektor, jadi dipisah lewat scope: hanya
+        pertanyaan dengan keyword & angka yang sama yang dibandingkan.
+        """
+        normalized = sorted({' '.join(keyword.lower().split()) for keyword in keywords})
+        numbers = re.findall(r'\d+(?:[.,]\d+)*', question)
+        return json.dumps([intent, normalized, numbers, data_version], ensure_ascii=False)
+
+    @staticmethod
+    def _scope_id(scope: str) -> int:
+        """Id scope (hash 64-bit, jadi tidak ada tabel scope yang terus bertambah)"""
+        digest = hashlib.blake2b(scope.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little', signed=True)
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        """Term frequency (sublinear) dari teks"""
+        vector = np.zeros(NUM_FEATURES, dtype=np.float32)
+        features = _features(text)
+        if features:
+            counts = np.bincount(features, minlength=NUM_FEATURES).astype(np.float32)
+            nonzero = counts > 0
+            vector[nonzero] = 1.0 + np.log(counts[nonzero])
+        return vector
+
+    def _idf(self) -> np.ndarray:
+        """Inverse document frequency dari pertanyaan yang tersimpan"""
+        return np.log((1.0 + self._size) / (1.0 + self._doc_freq)) + 1.0
+
+    def _similarity(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity TF-IDF antara query (term frequency) dan entry `rows`
+
+        (tf * idf) · (q * idf) = tf · (q * idf²), dan |tf * idf|² = tf² · idf²,
+        jadi IDF terbaru dipakai tanpa menyimpan matrix yang sudah dibobot.
+        """
+        idf_sq = self._idf() ** 2
+        query_norm = np.sqrt(query ** 2 @ idf_sq)
+        if not query_norm:
+            return np.zeros(len(rows), dtype=np.float32)
+
+        # Matvec di slice yang bersebelahan lebih murah daripada menyalin baris terpilih
+        size = self._size
+        dots = (self._tf[:size] @ (query * idf_sq))[rows]
+        norms = np.sqrt(self._tf_sq[:size] @ idf_sq)[rows]
+        norms[norms == 0] = 1.0
+        return dots / (norms * query_norm)
+
+    def lookup(self, question: str, scope: str) -> Optional[str]:
+        """
+        Cari jawaban untuk pertanyaan yang mirip
+
+        Args:
+            question: Pertanyaan user
+            scope: Hanya entry dengan scope yang sama yang dibandingkan
+
+        Returns:
+            Jawaban tersimpan, atau None jika tidak ada yang cukup mirip
+        """
+        with self._lock:
+            if not self._size:
+                self.misses += 1
+                return None
+
+            # Entry dengan scope lain / kadaluarsa tidak dihitung
+            size = self._size
+            rows = np.flatnonzero((self._scopes[:size] == self._scope_id(scope)) &
+                                  (self._expires[:size] > time.time()))
+            if len(rows):
+                similarity = self._similarity(self._vectorize(question), rows)
+                best = int(np.argmax(similarity))
+                if similarity[best] >= self.threshold:
+                    self.hits += 1
+                    return self._answers[rows[best]]
+
+            self.misses += 1
+            return None
+
+    def add(self, question: str, scope: str, answer: str):
+        """Simpan pertanyaan + jawaban (entry paling lama ditimpa jika penuh)"""
+        vector = self._vectorize(question)
+
+        with self._lock:
+            slot = self._next
+            if self._size == self.capacity:
+                # Keluarkan entry lama dari document frequency
+                self._doc_freq -= self._tf[slot] > 0
+            else:
+                self._size += 1
+
+            self._tf[slot] = vector
+            self._tf_sq[slot] = vector ** 2
+            self._doc_freq += vector > 0
+            self._answers[slot] = answer
+            self._scopes[slot] = self._scope_id(scope)
+            self._expires[slot] = time.time() + self.ttl
+
+            self._next = (slot + 1) % self.capacity
+
+    def clear(self):
+        """Kosongkan cache"""
+        with self._lock:
+            self._tf[:] = 0
+            self._tf_sq[:] = 0
+            self._doc_freq[:] = 0
+            self._answers = [None] * self.capacity
+            self._scopes[:] = -1
+            self._size = 0
+            self._next = 0
+
+    def get_stats(self) -> Dict:
+        """Statistik hit/miss cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'size': self._size,
+        }
+
+
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Ambil semantic cache bersama (satu per proses, dipakai semua sesi)"""
+    global _semantic_cache
+
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache()
+
+    return _semantic_cache
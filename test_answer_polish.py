@@ -0,0 +1,74 @@
+# test_answer_polish.py
+# Test mode template_polish: hasil polish diterapkan di thread sesi dan polished_replies dibatasi
+
+import threading
+import time
+from types import SimpleNamespace
+
+import chatbot_engine_ai
+from chatbot_engine_ai import ChatbotIntervisualAI
+
+POLISHED = "Versi rapi dari jawaban harga."
+
+
+class _FakeCompletions:
+    def create(self, messages, model, stream=False, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=POLISHED))],
+                               usage=None)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=_FakeCompletions())
+
+
+def _bot(**kwargs):
+    return ChatbotIntervisualAI(groq_api_key="test", client=_FakeClient(), answer_mode='template_polish',
+                                use_response_cache=False, use_semantic_cache=False, **kwargs)
+
+
+def _wait_for_polish(bot, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not bot._polish_queue and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert bot._polish_queue
+
+
+def test_polish_is_applied_on_session_thread():
+    calls = []
+    bot = _bot(on_polish=lambda reply, polished: calls.append((reply, polished, threading.current_thread())))
+
+    reply = bot.chat("Harga keramik berapa?")
+    _wait_for_polish(bot)
+
+    # Selesai di thread polish, tapi history / UI / callback belum disentuh
+    assert not calls
+    assert not bot.polished_replies
+    assert bot.conversation_history[-1]['content'] == reply
+
+    assert bot.apply_polished() == 1
+    assert calls == [(reply, POLISHED, threading.current_thread())]
+    assert bot.polished_replies == {reply: POLISHED}
+    assert bot.conversation_history[-1]['content'] == POLISHED
+    assert bot.apply_polished() == 0
+
+
+def test_polished_replies_are_bounded():
+    bot = _bot()
+    total = chatbot_engine_ai.MAX_POLISHED_REPLIES + 10
+    for i in range(total):
+        bot._polish_queue.append((f"template {i}", f"rapi {i}"))
+
+    assert bot.apply_polished() == total
+    assert len(bot.polished_replies) == chatbot_engine_ai.MAX_POLISHED_REPLIES
+    assert "template 0" not in bot.polished_replies
+    assert bot.polished_replies[f"template {total - 1}"] == f"rapi {total - 1}"
+
+
+def test_clear_history_drops_pending_polish():
+    bot = _bot()
+    bot._polish_queue.append(("template", "rapi"))
+    bot.clear_history()
+
+    assert bot.apply_polished() == 0
+    assert not bot.polished_replies
@@ -0,0 +1,105 @@
+# test_async_engine.py
+# Test AsyncChatbotIntervisualAI terhadap stub server Groq lokal
+
+import asyncio
+import time
+
+import pytest
+
+import chatbot_engine_ai
+from chatbot_engine_ai import AsyncChatbotIntervisualAI
+from groq_stub_server import StubConfig, start_stub_server
+from metrics import ChatMetrics
+from welcome_message import WelcomeMessageCache, render_fallback_welcome
+
+QUESTION = "Bagaimana cara memilih kontraktor renovasi yang baik?"
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_server(StubConfig(ttft=0.01, tokens_per_sec=5000, completion_tokens=12))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _bot(stub, **kwargs):
+    return AsyncChatbotIntervisualAI(groq_api_key="test", base_url=stub.base_url, metrics=ChatMetrics(),
+                                     use_response_cache=False, use_semantic_cache=False, **kwargs)
+
+
+def _assert_ai_reply(reply: str):
+    assert reply
+    assert not reply.startswith("⚠️"), reply
+
+
+def test_engines_work_across_separate_event_loops(stub):
+    # Pool async terikat ke event loop: asyncio.run() kedua harus dapat pool baru
+    _assert_ai_reply(asyncio.run(_bot(stub).chat(QUESTION)))
+    _assert_ai_reply(asyncio.run(_bot(stub).chat(QUESTION)))
+
+    # Engine yang sama dipakai di dua event loop
+    bot = _bot(stub)
+    _assert_ai_reply(asyncio.run(bot.chat(QUESTION)))
+    _assert_ai_reply(asyncio.run(bot.chat(QUESTION)))
+    assert stub.stats['requests'] == 4
+
+
+def test_async_chat_records_history(stub):
+    bot = _bot(stub)
+
+    async def conversation():
+        first = await bot.chat(QUESTION)
+        second = await bot.chat("Lalu apa saja yang perlu disiapkan sebelum renovasi?")
+        return first, second
+
+    first, second = asyncio.run(conversation())
+    _assert_ai_reply(first)
+    _assert_ai_reply(second)
+
+    assert bot.conversation_history == [
+        {"role": "user", "content": QUESTION},
+        {"role": "assistant", "content": first},
+        {"role": "user", "content": "Lalu apa saja yang perlu disiapkan sebelum renovasi?"},
+        {"role": "assistant", "content": second},
+    ]
+    assert stub.stats['requests'] == 2
+    assert bot.metrics.snapshot()['stages']['total']['count'] == 2
+
+
+def test_async_chat_answers_company_info_without_groq(stub):
+    bot = _bot(stub)
+
+    async def conversation():
+        local = await bot.chat("Email PT Intervisual apa?")
+        requests = stub.stats['requests']
+        return local, requests, await bot.chat(QUESTION)
+
+    local, requests, reply = asyncio.run(conversation())
+
+    assert bot.knowledge_base.company_info['kontak']['email'] in local
+    assert requests == 0
+    _assert_ai_reply(reply)
+    assert stub.stats['requests'] == 1
+    assert [message['content'] for message in bot.conversation_history if message['role'] == 'assistant'] \
+        == [local, reply]
+
+
+def test_async_welcome_message_uses_template_then_ai(stub, monkeypatch):
+    cache = WelcomeMessageCache(refresh_interval=0)
+    monkeypatch.setattr(chatbot_engine_ai, 'get_welcome_cache', lambda: cache)
+    bot = _bot(stub)
+
+    # Tidak menunggu Groq: pesan pertama dari template, AI di-generate di background
+    first = asyncio.run(bot.welcome_message())
+    assert first == render_fallback_welcome(bot.knowledge_base.company_info)
+    assert bot.conversation_history == [{"role": "assistant", "content": first}]
+
+    deadline = time.monotonic() + 5
+    while cache.get_stats()['is_fallback'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    message = asyncio.run(_bot(stub).welcome_message())
+    _assert_ai_reply(message)
+    assert message != first
+    assert stub.stats['requests'] == 1
@@ -0,0 +1,74 @@
+# test_boq_estimator.py
+# Test BoQEstimator: filter satuan harga RAB dan batas cache hasil pencarian
+
+import pandas as pd
+
+import boq_estimator
+from boq_estimator import BoQEstimator
+from price_scraper import InteriorPriceScraper
+from rab_parser import RABParser, RAB_COLUMNS
+
+
+def _estimator(rows, sources=(boq_estimator.SOURCE_RAB,)):
+    parser = RABParser(cache_dir=None)
+    parser._append_frame(pd.DataFrame(rows, columns=RAB_COLUMNS))
+    return BoQEstimator(parser, InteriorPriceScraper(), sources=sources)
+
+
+def _mixed_unit_rows():
+    return [
+        ('PEKERJAAN PLAFON', 'Plafon gypsum', 'm2', 10, 100000, 1000000),
+        ('PEKERJAAN PLAFON', 'Plafon gypsum', 'M2', 5, 120000, 600000),
+        ('PEKERJAAN PLAFON', 'Plafon gypsum', "m'", 8, 40000, 320000),
+        ('PEKERJAAN PLAFON', 'Plafon gypsum', 'titik', 2, 250000, 500000),
+        ('PEKERJAAN PLAFON', 'Plafon gypsum', 'ls', 1, 5000000, 5000000),
+    ]
+
+
+def test_line_without_unit_uses_dominant_unit():
+    estimator = _estimator(_mixed_unit_rows())
+    quote = estimator.estimate([('plafon gypsum', 10, '')])
+    line = quote['lines'][0]
+
+    # Hanya harga m2 (satuan terbanyak), bukan campuran m2 / m' / titik / ls
+    assert line['unit'] == 'm2'
+    assert line['unit_price'] == {'min': 100000, 'avg': 110000, 'max': 120000}
+    assert quote['totals']['max'] == 1200000
+
+
+def test_line_with_unit_filters_rab_prices():
+    estimator = _estimator(_mixed_unit_rows())
+    quote = estimator.estimate([('plafon gypsum', 4, 'per meter'), ('plafon gypsum', 1, 'kg')])
+
+    assert quote['lines'][0]['unit'] == 'm'
+    assert quote['lines'][0]['unit_price']['avg'] == 40000
+    assert not quote['lines'][1]['found']
+    assert quote['unresolved'] == ['plafon gypsum']
+
+
+def test_dominant_unit_tie_prefers_best_match():
+    rows = [
+        ('PEKERJAAN SANITAIR', 'Wastafel keramik', 'bh', 2, 850000, 1700000),
+        ('PEKERJAAN LANTAI', 'Lantai keramik', 'm2', 10, 185000, 1850000),
+    ]
+    estimator = _estimator(rows)
+    line = estimator.estimate([('keramik', 1)])['lines'][0]
+
+    # Sama banyak → satuan dari baris dengan peringkat teratas
+    assert line['unit'] == 'unit'
+    assert line['matched_to'] == 'Wastafel keramik'
+    assert line['unit_price']['avg'] == 850000
+
+
+def test_resolved_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(boq_estimator, 'RESOLVED_CACHE_SIZE', 8)
+    estimator = _estimator(_mixed_unit_rows())
+
+    estimator.estimate([(f'plafon gypsum {i}', 1, 'm2') for i in range(50)])
+    assert len(estimator._resolved) <= 8
+
+    # Data RAB bertambah → cache di-reset
+    estimator.rab_parser._append_frame(pd.DataFrame([('PEKERJAAN PLAFON', 'Plafon PVC', 'm2', 1, 160000, 160000)],
+                                                    columns=RAB_COLUMNS))
+    assert estimator.estimate([('plafon pvc', 1, 'm2')])['resolved'] == 1
+    assert len(estimator._resolved) == 1
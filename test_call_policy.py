@@ -0,0 +1,141 @@
+# test_call_policy.py
+# Test GroqCallPolicy: thread pemanggil, deadline, hedging, retry, dan penutupan hasil yang tidak dipakai
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from groq import APIConnectionError
+
+from call_policy import DeadlineExceeded, GroqCallPolicy
+from chatbot_engine_ai import ChatbotIntervisualAI
+from groq_stub_server import StubConfig, start_stub_server
+from metrics import ChatMetrics
+
+
+class _Stream:
+    """Pengganti stream Groq yang mencatat close()"""
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+def test_unhedged_call_runs_on_caller_thread():
+    policy = GroqCallPolicy(deadline=5, hedge_delay=0.01)
+    threads = []
+
+    def request(timeout):
+        threads.append(threading.current_thread())
+        assert 0 < timeout <= 5
+        return "ok"
+
+    assert policy.call(request, hedge=False) == "ok"
+    assert GroqCallPolicy(deadline=5, hedge_delay=0).call(request) == "ok"
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_late_result_is_closed_and_deadline_raised():
+    policy = GroqCallPolicy(deadline=0.05, max_retries=0)
+    stream = _Stream("late")
+
+    def request(timeout):
+        time.sleep(0.1)
+        return [], stream
+
+    with pytest.raises(DeadlineExceeded):
+        policy.call(request, hedge=False)
+    assert stream.closed.is_set()
+
+
+def test_hedge_loser_is_closed_when_it_finishes():
+    policy = GroqCallPolicy(deadline=5, hedge_delay=0.05)
+    calls = []
+
+    def request(timeout):
+        stream = _Stream(f"req{len(calls)}")
+        calls.append(stream)
+        if stream.name == "req0":
+            time.sleep(0.3)
+        return [], stream
+
+    head, winner = policy.call(request)
+    assert winner.name == "req1"
+    assert not winner.closed.is_set()
+
+    loser = calls[0]
+    assert loser.closed.wait(2)
+
+
+def test_hedged_deadline_closes_pending_requests():
+    policy = GroqCallPolicy(deadline=0.1, hedge_delay=0.02, max_retries=0)
+    calls = []
+
+    def request(timeout):
+        stream = _Stream(len(calls))
+        calls.append(stream)
+        time.sleep(0.3)
+        return [], stream
+
+    with pytest.raises(DeadlineExceeded):
+        policy.call(request)
+    assert len(calls) == 2
+    assert all(stream.closed.wait(2) for stream in calls)
+
+
+def test_retryable_errors_are_retried_within_deadline():
+    policy = GroqCallPolicy(deadline=5, max_retries=2)
+    attempts = []
+
+    def request(timeout):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise APIConnectionError(request=httpx.Request("POST", "http://groq.test"))
+        return "ok"
+
+    assert policy.call(request, hedge=False) == "ok"
+    assert len(attempts) == 3
+    assert attempts[0] > attempts[2]
+
+
+def test_async_hedge_cancels_and_closes_losers():
+    policy = GroqCallPolicy(deadline=5, hedge_delay=0.05)
+    cancelled = []
+
+    async def request(timeout):
+        index = len(cancelled)
+        cancelled.append(False)
+        try:
+            await asyncio.sleep(0.5 if index == 0 else 0)
+        except asyncio.CancelledError:
+            cancelled[index] = True
+            raise
+        return index
+
+    assert asyncio.run(policy.acall(request)) == 1
+    assert cancelled == [True, False]
+
+
+def test_dribbling_stream_hits_total_deadline():
+    # Chunk kosong tiap 50 ms: tiap read di bawah timeout httpx, tapi token pertama baru setelah 3 detik
+    server = start_stub_server(StubConfig(ttft=3.0, dribble_interval=0.05, completion_tokens=5))
+    try:
+        bot = ChatbotIntervisualAI(groq_api_key="test", base_url=server.base_url, metrics=ChatMetrics(),
+                                   call_policy=GroqCallPolicy(deadline=0.4, max_retries=0),
+                                   use_response_cache=False, use_semantic_cache=False)
+
+        start = time.monotonic()
+        reply = "".join(bot.chat_stream("Bagaimana cara memilih kontraktor renovasi yang baik?"))
+        elapsed = time.monotonic() - start
+
+        assert isinstance(bot.last_error, DeadlineExceeded)
+        assert elapsed < 1.5
+        assert reply
+    finally:
+        server.shutdown()
+        server.server_close()
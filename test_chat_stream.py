@@ -0,0 +1,53 @@
+# test_chat_stream.py
+# Test chat_stream(): delta dikirim bertahap dan response lengkap masuk history setelah stream selesai
+
+import pytest
+
+from chatbot_engine_ai import ChatbotIntervisualAI
+from groq_stub_server import _STUB_WORDS, StubConfig, start_stub_server
+from metrics import ChatMetrics
+
+QUESTION = "Bagaimana cara memilih kontraktor renovasi yang baik?"
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_server(StubConfig(ttft=0.01, tokens_per_sec=5000, completion_tokens=8))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _bot(stub):
+    return ChatbotIntervisualAI(groq_api_key="test", base_url=stub.base_url, metrics=ChatMetrics(),
+                                use_response_cache=False, use_semantic_cache=False)
+
+
+def test_stream_yields_deltas_and_commits_history_at_end(stub):
+    bot = _bot(stub)
+    stream = bot.chat_stream(QUESTION)
+
+    first = next(stream)
+    assert first == _STUB_WORDS[0]
+    # Giliran belum masuk history selama stream masih dibaca
+    assert bot.conversation_history == []
+
+    deltas = [first] + list(stream)
+    assert len(deltas) == 8
+    reply = "".join(deltas)
+    assert reply == " ".join(_STUB_WORDS[:8])
+
+    assert bot.conversation_history == [
+        {"role": "user", "content": QUESTION},
+        {"role": "assistant", "content": reply},
+    ]
+    assert stub.stats['streamed'] == 1
+
+    snapshot = bot.metrics.snapshot()
+    assert snapshot['stages']['llm_first_token']['count'] == 1
+    assert snapshot['token_totals']['completion_tokens'] == 8
+
+
+def test_stream_matches_non_streaming_reply(stub):
+    streamed = "".join(_bot(stub).chat_stream(QUESTION))
+    assert streamed == _bot(stub).chat(QUESTION)
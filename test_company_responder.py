@@ -0,0 +1,54 @@
+# test_company_responder.py
+# Test CompanyInfoResponder: pertanyaan info perusahaan yang dijawab template vs yang diteruskan ke AI
+
+import pytest
+
+from chatbot_engine_ai import KEYWORD_MATCHER
+from company_responder import CompanyInfoResponder
+from data_perusahaan import COMPANY_INFO
+
+RESPONDER = CompanyInfoResponder(COMPANY_INFO)
+
+
+def _topic(message: str):
+    """Topik template yang dipakai untuk pesan (None = diteruskan ke AI)"""
+    reply = RESPONDER.answer(message, KEYWORD_MATCHER.match(message.lower()))
+    if reply is None:
+        return None
+    return next(topic for topic, text in RESPONDER._answers.items() if text == reply)
+
+
+@pytest.mark.parametrize('message, topic', [
+    ("Alamat kantornya di mana ya kak?", 'alamat'),
+    ("kantor intervisual dimana?", 'alamat'),
+    ("lokasi workshop", 'alamat'),
+    ("nomor WA berapa?", 'kontak'),
+    ("boleh minta nomor hp cs?", 'kontak'),
+    ("nomor telepon kantor berapa?", 'kontak'),
+    ("Email PT Intervisual apa?", 'email'),
+    ("alamat email kantor", 'email'),
+    ("layanan apa saja?", 'layanan'),
+    ("instagram resmi apa?", 'website'),
+    ("ada promo bulan ini?", 'promo'),
+])
+def test_single_topic_questions_use_template(message, topic):
+    assert _topic(message) == topic
+
+
+@pytest.mark.parametrize('message', [
+    # Kata benda saja bukan pertanyaan info perusahaan
+    "kantor buka jam berapa?",
+    "hp saya rusak",
+    "nomor rumah saya 12",
+    # Cocok topik, tapi yang ditanya hal lain
+    "alamat kantor buka jam berapa?",
+    "email saya tidak dibalas",
+    "promo berlaku sampai kapan?",
+    "lokasi proyek saya jauh, bisa survei?",
+    # Gabungan / butuh penjelasan / topik pekerjaan
+    "alamat dan nomor WA?",
+    "bagaimana cara menghubungi tim desain?",
+    "berapa harga renovasi dapur?",
+])
+def test_near_misses_go_to_llm(message):
+    assert _topic(message) is None
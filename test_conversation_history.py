@@ -0,0 +1,142 @@
+# test_conversation_history.py
+# Test ConversationHistory: budget token, ringkasan bergulir, replace, dan akses dari banyak thread
+
+import threading
+
+from conversation_history import ConversationHistory, SUMMARY_LINE_CHARS, estimate_tokens
+
+
+def _message(i: int, words: int = 20) -> str:
+    return f"pesan {i} " + "kata " * words
+
+
+def test_recent_turns_kept_until_budget_exceeded():
+    history = ConversationHistory(token_budget=1000, keep_recent=2)
+    history.add_turn("Halo", "Halo, ada yang bisa dibantu?")
+
+    assert len(history) == 2
+    assert history.summary == ""
+    assert history.messages() == [
+        {"role": "user", "content": "Halo"},
+        {"role": "assistant", "content": "Halo, ada yang bisa dibantu?"},
+    ]
+    assert history.token_count() == estimate_tokens("Halo") + estimate_tokens("Halo, ada yang bisa dibantu?")
+
+
+def test_compaction_moves_old_turns_into_summary_within_budget():
+    history = ConversationHistory(token_budget=120, keep_recent=2, summary_budget=1000)
+    for i in range(10):
+        history.add("user" if i % 2 == 0 else "assistant", _message(i))
+        assert history.token_count() <= history.token_budget or len(history) == history.keep_recent
+
+    assert len(history) < 10
+    assert len(history) >= history.keep_recent
+    assert history.get_turns()[-1]["content"] == _message(9)
+    assert history.summary_lines[0].startswith("- User: pesan 0")
+    assert history.summary_lines[1].startswith("- Asisten: pesan 1")
+    assert len(history.summary_lines) + len(history) == 10
+
+
+def test_summary_injected_as_first_system_message():
+    history = ConversationHistory(token_budget=60, keep_recent=2)
+    for i in range(6):
+        history.add("user", _message(i))
+
+    messages = history.messages()
+    assert messages[0]["role"] == "system"
+    assert messages[0]["content"].startswith("Ringkasan percakapan sebelumnya:\n- User: pesan 0")
+    assert [m["role"] for m in messages[1:]] == ["user"] * len(history)
+    assert messages[1:] == history.get_turns()
+
+
+def test_summary_lines_are_truncated_and_summary_budget_enforced():
+    history = ConversationHistory(token_budget=50, keep_recent=1, summary_budget=60)
+    for i in range(20):
+        history.add("assistant", _message(i, words=200))
+
+    assert all(len(line) <= SUMMARY_LINE_CHARS + len("- Asisten: ") for line in history.summary_lines)
+    assert history.summary_lines[0].endswith("...")
+    assert estimate_tokens(history.summary) <= history.summary_budget
+    # Baris ringkasan paling lama yang dibuang
+    assert history.summary_lines[-1].startswith("- Asisten: pesan 18")
+
+
+def test_replace_updates_latest_match_and_token_count():
+    history = ConversationHistory(token_budget=1000)
+    history.add_turn("Harga cat?", "draft")
+    history.add_turn("Lagi?", "draft")
+
+    before = history.token_count()
+    assert history.replace("assistant", "draft", "Jawaban yang sudah dirapikan dan lebih panjang")
+    turns = history.get_turns()
+    assert turns[1]["content"] == "draft"
+    assert turns[3]["content"] == "Jawaban yang sudah dirapikan dan lebih panjang"
+    assert history.token_count() == before - estimate_tokens("draft") + estimate_tokens(turns[3]["content"])
+
+    assert not history.replace("assistant", "tidak ada", "x")
+    assert not history.replace("user", "draft", "x")
+
+
+def test_replace_can_trigger_compaction():
+    history = ConversationHistory(token_budget=40, keep_recent=1)
+    history.add_turn("Halo", "draft")
+    history.replace("assistant", "draft", _message(0, words=60))
+
+    assert len(history) == 1
+    assert history.summary_lines == ["- User: Halo"]
+
+
+def test_clear_resets_everything():
+    history = ConversationHistory(token_budget=30, keep_recent=1)
+    for i in range(5):
+        history.add("user", _message(i))
+    history.clear()
+
+    assert len(history) == 0
+    assert history.messages() == []
+    assert history.token_count() == 0
+
+
+def test_concurrent_add_and_replace_keep_token_count_consistent():
+    history = ConversationHistory(token_budget=400, keep_recent=4, summary_budget=10000)
+    history.add("assistant", "draft")
+
+    def writer(start):
+        for i in range(start, start + 200):
+            history.add_turn(f"tanya {i}", f"jawab {i} " + "x " * (i % 7))
+
+    def polisher():
+        for i in range(200):
+            history.replace("assistant", f"jawab {i} " + "x " * (i % 7), f"jawab rapi {i}")
+
+    threads = [threading.Thread(target=writer, args=(n * 200,)) for n in range(4)]
+    threads.append(threading.Thread(target=polisher))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    turns = history.get_turns()
+    assert history._turn_tokens == sum(estimate_tokens(m["content"]) for m in turns)
+    assert len(turns) + len(history.summary_lines) == 1 + 4 * 200 * 2
+
+
+def test_writes_from_other_threads_wait_for_lock():
+    history = ConversationHistory(token_budget=1000)
+    history.add_turn("Halo", "draft")
+    done = threading.Event()
+
+    def polish():
+        history.replace("assistant", "draft", "rapi")
+        history.add("assistant", "tambahan")
+        done.set()
+
+    with history._lock:
+        thread = threading.Thread(target=polish)
+        thread.start()
+        assert not done.wait(0.05)
+        assert history.get_turns()[-1]["content"] == "draft"
+
+    thread.join(1)
+    assert done.is_set()
+    assert [m["content"] for m in history.get_turns()] == ["Halo", "rapi", "tambahan"]
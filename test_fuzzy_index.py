@@ -0,0 +1,86 @@
+# test_fuzzy_index.py
+# Test FuzzyIndex: typo, sinonim, dan pencocokan judul produk ke nama item
+
+import threading
+
+from fuzzy_index import FuzzyIndex, edit_distance
+from price_scraper import InteriorPriceScraper
+
+
+def _best(scraper, query):
+    matches = scraper.fuzzy_index.search(query, limit=1)
+    return scraper.catalog.names[matches[0][0]] if matches else None
+
+
+def test_search_handles_typos_and_synonyms():
+    scraper = InteriorPriceScraper()
+    expected = {
+        'kramik': 'keramik',
+        'granite': 'granit',
+        'wall paper': 'wallpaper',
+        'westafel': 'wastafel',
+        'parquet': 'parket',
+        'pntu': 'pintu',
+        'vinil': 'vinyl',
+        'kitchenset': 'kitchen set',
+        'toilet duduk': 'closet',
+        'plafond gipsum': 'plafon gypsum',
+    }
+    for query, name in expected.items():
+        assert _best(scraper, query) == name, query
+
+    assert scraper.fuzzy_index.search('xyzzy') == []
+    assert scraper.fuzzy_index.search('harga dan biaya') == []
+
+
+def test_search_scores_and_order():
+    index = FuzzyIndex(['plafon gypsum', 'plafon pvc', 'keramik'])
+
+    assert index.search('plafon gypsum') == [(0, 1.0), (1, 0.5)]
+    # Seri → row id kecil duluan
+    assert [row for row, _ in index.search('plafon')] == [0, 1]
+    assert index.search('plafon', limit=1) == [(0, 2 / 3)]
+
+    row, score = index.search('kramik')[0]
+    assert row == 2
+    assert score == 1 - 1 / 7
+
+
+def test_short_tokens_are_stricter():
+    index = FuzzyIndex(['cat', 'kayu'])
+
+    # Token ≤ 2 huruf harus sama persis, ≤ 4 huruf maksimal 1 edit
+    assert index.search('ca') == []
+    assert index.search('cit')[0][0] == 0
+    assert index.search('kyau')[0][0] == 1
+    assert index.search('kxyx') == []
+
+
+def test_find_in_matches_product_titles():
+    index = FuzzyIndex(['granit', 'keramik', 'keramik dinding', 'lampu'])
+
+    assert index.find_in('Granite Tile Indogress 60x60') == [0, 1]
+    assert index.find_in('Keramik Dinding Roman 30x60') == [2, 1]
+    # Tanpa toleransi typo
+    assert index.find_in('Kramik Lantai') == []
+
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance('keramik', 'keramik', 2) == 0
+    assert edit_distance('kerami', 'keramik', 2) == 1
+    assert edit_distance('kearmik', 'keramik', 2) == 1
+    assert edit_distance('abc', 'xyzabc', 2) == 3
+
+
+def test_token_memo_is_written_under_lock():
+    index = FuzzyIndex(['keramik', 'granit'])
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (index.search('kramik'), done.set()))
+
+    with index._memo_lock:
+        thread.start()
+        assert not done.wait(0.2)
+    thread.join(5)
+
+    assert done.is_set()
+    assert index.search('kramik')[0][0] == 0
@@ -0,0 +1,134 @@
+# test_groq_stub_server.py
+# Test stub server Groq: streaming, injeksi error/429, dan fallback engine saat Groq gagal
+
+import time
+
+import httpx
+import pytest
+from groq import Groq
+
+from call_policy import DeadlineExceeded, GroqCallPolicy
+from chatbot_engine_ai import COMPANY_INFO, ChatbotIntervisualAI
+from groq_stub_server import COMPLETIONS_PATH, _STUB_WORDS, StubConfig, start_stub_server
+from metrics import ChatMetrics
+
+QUESTION = "Bagaimana cara memilih kontraktor renovasi yang baik?"
+PRICE_QUESTION = "Berapa harga pasang keramik per m2?"
+MESSAGES = [{"role": "user", "content": QUESTION}]
+
+
+@pytest.fixture
+def make_stub():
+    servers = []
+
+    def make(**config):
+        server = start_stub_server(StubConfig(**config))
+        server.random.seed(0)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(server):
+    return Groq(api_key="test", base_url=server.base_url, max_retries=0)
+
+
+def _bot(server, **kwargs):
+    return ChatbotIntervisualAI(groq_api_key="test", base_url=server.base_url, metrics=ChatMetrics(),
+                                use_response_cache=False, use_semantic_cache=False, **kwargs)
+
+
+def test_streaming_sends_tokens_and_usage_in_last_chunk(make_stub):
+    server = make_stub(ttft=0.2, tokens_per_sec=1000, completion_tokens=6)
+
+    start = time.monotonic()
+    stream = _client(server).chat.completions.create(messages=MESSAGES, model="stub", stream=True)
+    first_token_at, parts, last = None, [], None
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta and first_token_at is None:
+            first_token_at = time.monotonic() - start
+        parts.append(delta or "")
+        last = chunk
+
+    assert "".join(parts) == " ".join(_STUB_WORDS[:6])
+    assert first_token_at >= 0.2
+    assert last.choices[0].finish_reason == 'stop'
+    assert last.x_groq.usage.completion_tokens == 6
+    assert server.stats == {'requests': 1, 'streamed': 1, 'errors': 0, 'rate_limited': 0}
+
+
+def test_non_streaming_respects_max_tokens(make_stub):
+    server = make_stub(ttft=0.0, completion_tokens=20)
+
+    completion = _client(server).chat.completions.create(messages=MESSAGES, model="stub", max_tokens=4)
+
+    assert completion.choices[0].message.content == " ".join(_STUB_WORDS[:4])
+    assert completion.usage.completion_tokens == 4
+    assert completion.usage.prompt_tokens == len(QUESTION) // 4
+    assert httpx.get(f"{server.base_url}/stats").json() == server.stats
+
+
+def test_error_injection_returns_500(make_stub):
+    server = make_stub(error_rate=1.0)
+
+    response = httpx.post(f"{server.base_url}{COMPLETIONS_PATH}", json={"messages": MESSAGES})
+
+    assert response.status_code == 500
+    assert response.json()['error']['code'] == 'internal_server_error'
+    assert server.stats['errors'] == 1
+
+
+def test_rate_limit_returns_429_with_retry_after(make_stub):
+    server = make_stub(ttft=0.0, requests_per_minute=1)
+    url = f"{server.base_url}{COMPLETIONS_PATH}"
+
+    assert httpx.post(url, json={"messages": MESSAGES}).status_code == 200
+    limited = httpx.post(url, json={"messages": MESSAGES})
+
+    assert limited.status_code == 429
+    assert float(limited.headers['retry-after']) >= 1
+    assert server.stats['rate_limited'] == 1
+
+
+def test_engine_retries_then_reports_error(make_stub):
+    server = make_stub(error_rate=1.0)
+    bot = _bot(server, call_policy=GroqCallPolicy(deadline=5, max_retries=1))
+
+    reply = bot.chat(QUESTION)
+
+    assert reply.startswith("⚠️ Error saat berkomunikasi dengan AI")
+    # Satu request + satu retry, lalu giliran tidak dicatat ke history
+    assert server.stats['errors'] == 2
+    assert bot.metrics.snapshot()['events']['retry'] == 1
+    assert bot.conversation_history == []
+
+
+def test_engine_falls_back_to_price_data_when_groq_fails(make_stub):
+    server = make_stub(error_rate=1.0)
+    bot = _bot(server, call_policy=GroqCallPolicy(deadline=5, max_retries=0), answer_mode='llm')
+
+    reply = bot.chat(PRICE_QUESTION)
+
+    assert server.stats['errors'] == 1
+    assert not reply.startswith("⚠️")
+    assert COMPANY_INFO['kontak']['whatsapp'] in reply
+    assert bot.metrics.snapshot()['events']['fallback'] == 1
+    assert bot.conversation_history[-1] == {"role": "assistant", "content": reply}
+
+
+def test_engine_falls_back_when_stub_is_too_slow(make_stub):
+    server = make_stub(ttft=2.0)
+    bot = _bot(server, call_policy=GroqCallPolicy(deadline=0.3, max_retries=0), answer_mode='llm')
+
+    start = time.monotonic()
+    reply = bot.chat(PRICE_QUESTION)
+
+    assert time.monotonic() - start < 1.5
+    assert isinstance(bot.last_error, DeadlineExceeded)
+    assert COMPANY_INFO['kontak']['whatsapp'] in reply
+    assert bot.metrics.snapshot()['events']['fallback'] == 1
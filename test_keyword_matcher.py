@@ -0,0 +1,88 @@
+# test_keyword_matcher.py
+# Test KeywordMatcher: hasil sama dengan cek `keyword in text` lama untuk setiap grup keyword
+
+import random
+
+import pytest
+
+from chatbot_engine_ai import (
+    ALLOWED_KEYWORDS, BLOCKED_KEYWORDS, GREETING_KEYWORDS, INTERIOR_KEYWORDS, KEYWORD_MATCHER,
+    PACKAGE_KEYWORDS, PRICE_KEYWORDS, RAB_KEYWORDS,
+)
+from keyword_matcher import KeywordMatcher
+
+GROUPS = {
+    'allowed': ALLOWED_KEYWORDS,
+    'blocked': BLOCKED_KEYWORDS,
+    'greeting': GREETING_KEYWORDS,
+    'rab': RAB_KEYWORDS,
+    'interior': INTERIOR_KEYWORDS,
+    'package': PACKAGE_KEYWORDS,
+    'price': PRICE_KEYWORDS,
+}
+
+# Pesan dengan keyword yang saling tumpang tindih (mis. "hi" di "hijau", "cat" di "catatan")
+MESSAGES = [
+    "hi", "hijau", "warna hijau untuk kamar tidur", "hiasan dinding", "hai kak, berapa harga cat?",
+    "catatan pekerjaan plafon", "pengecatan dinding eksterior", "kamar mandi dan kamar tidur",
+    "total biaya paket dapur", "harga kitchen set minimalis", "shower dan wastafel", "selamat pagi",
+    "assalamualaikum, mau tanya budget renovasi", "main game sambil makan", "politik", "",
+    "granit atau marmer untuk lantai?", "hallo hello halo", "biayanya berapa ya", "wallpaperwallpaper",
+]
+
+
+def _old_match(groups, text):
+    """Cara lama: any(kw in text) per keyword, per grup"""
+    return {group: {kw for kw in keywords if kw in text} for group, keywords in groups.items()}
+
+
+def _messages():
+    rng = random.Random(6)
+    keywords = sorted({kw for keywords in GROUPS.values() for kw in keywords})
+    messages = list(MESSAGES) + keywords
+    # Keyword ditempel tanpa spasi / dengan potongan, supaya banyak keyword overlap di satu posisi
+    for _ in range(300):
+        parts = rng.sample(keywords, rng.randint(1, 4))
+        if rng.random() < 0.5:
+            parts = [part[rng.randint(0, len(part) - 1):] for part in parts]
+        messages.append(rng.choice(['', ' ']).join(parts))
+    return messages
+
+
+def test_engine_groups_cover_all_keywords():
+    assert set(KEYWORD_MATCHER.groups) == set(GROUPS)
+
+
+@pytest.mark.parametrize("group", sorted(GROUPS))
+def test_engine_matcher_equals_substring_checks(group):
+    for text in _messages():
+        expected = {kw for kw in GROUPS[group] if kw in text}
+        assert KEYWORD_MATCHER.match(text)[group] == expected, text
+        assert bool(KEYWORD_MATCHER.match(text)[group]) == any(kw in text for kw in GROUPS[group]), text
+
+
+@pytest.mark.parametrize("text, group, expected", [
+    ("hijau", 'greeting', {'hi'}),
+    ("catatan", 'rab', {'cat'}),
+    ("kamar tidur", 'package', {'kamar tidur'}),
+    ("total biaya", 'package', {'total biaya'}),
+    ("total biaya", 'price', {'biaya'}),
+    ("kitchen", 'interior', set()),
+])
+def test_overlapping_keywords(text, group, expected):
+    assert KEYWORD_MATCHER.match(text)[group] == expected
+
+
+def test_adversarial_overlaps_match_substring_checks():
+    # Keyword yang saling prefix / suffix / terkandung, di grup berbeda dan di grup yang sama
+    groups = {
+        'a': ['hi', 'hijau', 'ijau', 'a', 'abc'],
+        'b': ['jau', 'au', 'bc', 'abcd', 'hi'],
+        'c': ['b', 'cab', 'abcabc', 'h'],
+    }
+    matcher = KeywordMatcher(groups)
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        text = ''.join(rng.choice('abchiju ') for _ in range(rng.randint(0, 12)))
+        assert matcher.match(text) == _old_match(groups, text), text
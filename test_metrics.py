@@ -0,0 +1,128 @@
+# test_metrics.py
+# Test Histogram, export Prometheus, dan jalur no-op saat metrics dimatikan
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from metrics import ChatMetrics, Histogram, _NOOP_TIMER
+
+
+def _histogram(*values):
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in values:
+        histogram.observe(value)
+    return histogram
+
+
+def test_histogram_bucket_counts():
+    # Nilai tepat di batas masuk bucket itu (le), di atas batas terakhir masuk +Inf
+    histogram = _histogram(0.5, 1.0, 1.5, 2.0, 3.0, 10.0)
+
+    assert histogram.counts == [2, 2, 1, 1]
+    assert histogram.count == 6
+    assert histogram.sum == pytest.approx(18.0)
+    assert histogram.snapshot()['buckets'] == {'1.0': 2, '2.0': 2, '4.0': 1, '+Inf': 1}
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    histogram = _histogram(0.5, 1.5, 1.5, 3.0)
+
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(0.75) == pytest.approx(2.0)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+
+
+def test_histogram_quantile_edge_cases():
+    assert Histogram((1.0, 2.0)).quantile(0.5) == 0.0
+    # Semua nilai di bucket +Inf: dibatasi ke batas terakhir
+    assert _histogram(100.0, 200.0).quantile(0.99) == 4.0
+
+
+def test_prometheus_histogram_lines():
+    metrics = ChatMetrics(enabled=True)
+    for seconds in (0.003, 0.003, 0.2):
+        metrics.observe_stage('groq', seconds)
+
+    lines = metrics.to_prometheus().splitlines()
+    buckets = [line for line in lines if line.startswith('chat_stage_seconds_bucket{stage="groq",')]
+
+    # Bucket kumulatif dan tidak pernah turun, diakhiri +Inf = count
+    counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert 'chat_stage_seconds_bucket{stage="groq",le="0.005"} 2' in lines
+    assert 'chat_stage_seconds_bucket{stage="groq",le="0.25"} 3' in lines
+    assert buckets[-1] == 'chat_stage_seconds_bucket{stage="groq",le="+Inf"} 3'
+
+    assert 'chat_stage_seconds_count{stage="groq"} 3' in lines
+    sum_line = next(line for line in lines if line.startswith('chat_stage_seconds_sum{stage="groq"}'))
+    assert float(sum_line.rsplit(' ', 1)[1]) == pytest.approx(0.206)
+
+
+def test_prometheus_counters_and_tokens():
+    metrics = ChatMetrics(enabled=True)
+    metrics.record_turn('harga', 'llm')
+    metrics.record_turn('harga', 'llm')
+    metrics.record_error(TimeoutError())
+    metrics.record_event('hedge')
+    metrics.record_usage(SimpleNamespace(prompt_tokens=100, completion_tokens=None))
+
+    text = metrics.to_prometheus()
+
+    assert 'chat_turns_total{intent="harga",source="llm"} 2\n' in text
+    assert 'chat_errors_total{error="TimeoutError"} 1\n' in text
+    assert 'chat_events_total{event="hedge"} 1\n' in text
+    assert 'chat_tokens_count{kind="prompt_tokens"} 1\n' in text
+    assert 'kind="completion_tokens"' not in text
+    assert text.endswith('\n')
+
+
+def test_prometheus_escapes_label_values():
+    metrics = ChatMetrics(enabled=True)
+    metrics.record_turn('tanya "harga"', 'a\\b')
+    metrics.record_route('multi\nline', 'model')
+
+    text = metrics.to_prometheus()
+
+    assert 'chat_turns_total{intent="tanya \\"harga\\"",source="a\\\\b"} 1' in text
+    assert 'chat_routes_total{route="multi\\nline",model="model"} 1' in text
+    # Setiap sample tetap satu baris
+    assert all(line.startswith(('#', 'chat_')) for line in text.splitlines())
+
+
+def test_disabled_metrics_are_noop():
+    metrics = ChatMetrics(enabled=False)
+
+    assert metrics.timer('groq') is _NOOP_TIMER
+    assert metrics.model_timer('llama') is _NOOP_TIMER
+    with metrics.timer('groq'):
+        pass
+    metrics.observe_stage('groq', 0.1)
+    metrics.observe_model('llama', 0.1)
+    metrics.record_route('simple', 'llama')
+    metrics.record_turn('harga', 'llm')
+    metrics.record_usage(SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+    metrics.record_error(ValueError())
+    metrics.record_event('retry')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['enabled'] is False
+    for key in ('stages', 'tokens', 'token_totals', 'errors', 'events', 'models'):
+        assert snapshot[key] == {}
+    assert snapshot['turns'] == [] and snapshot['routes'] == []
+
+    # Export tetap valid (hanya HELP/TYPE)
+    assert all(line.startswith('#') for line in metrics.to_prometheus().splitlines())
+    assert json.loads(metrics.to_json())['enabled'] is False
+
+
+def test_enabled_timer_records_stage():
+    metrics = ChatMetrics(enabled=True)
+    with metrics.timer('parse'):
+        pass
+
+    stage = metrics.snapshot()['stages']['parse']
+    assert stage['count'] == 1
+    assert stage['sum'] >= 0.0
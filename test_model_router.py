@@ -0,0 +1,64 @@
+# test_model_router.py
+# Test ModelRouter: sapaan, pertanyaan harga, dan konsultasi
+
+import pytest
+
+import chatbot_engine_ai
+from chatbot_engine_ai import KEYWORD_MATCHER
+from model_router import FAST_MODEL, GREETING_KEYWORDS, LARGE_MODEL, ModelRouter
+
+
+def _route(message, intent='general'):
+    router = ModelRouter(enabled=True, routing_file=None)
+    matches = KEYWORD_MATCHER.match(message.lower())
+    return router.route({'intent': intent, 'keywords': []}, message, matches)
+
+
+@pytest.mark.parametrize('message', [
+    "Halo",
+    "Hai kak, apa kabar?",
+    "Selamat malam",
+    "selamat pagi min",
+    "Pagi kak",
+    "Hi!",
+    "Hey",
+    "Hallo kak",
+    "Assalamualaikum",
+    "hei min",
+])
+def test_short_greetings_go_to_fast_model(message):
+    route = _route(message)
+    assert route['name'] == 'greeting'
+    assert route['model'] == FAST_MODEL
+
+
+@pytest.mark.parametrize('message', [
+    # Sapaan hanya sebagai substring / kata waktu di tengah kalimat
+    "Tolong hitungkan kebutuhan cat kamar saya",
+    "Ide dekorasi kamar anak tema malam berbintang",
+    "Lampu taman yang bagus untuk sore hari",
+    # Sapaan + minta saran tetap konsultasi
+    "Halo, rekomendasi warna cat ruang tamu?",
+])
+def test_non_greetings_go_to_consultation(message):
+    route = _route(message)
+    assert route['name'] == 'consultation'
+    assert route['model'] == LARGE_MODEL
+
+
+def test_price_routes():
+    assert _route("Harga keramik berapa?", 'interior_price')['name'] == 'price'
+    assert _route("Bandingkan harga granit dan marmer", 'interior_price')['name'] == 'consultation'
+
+
+def test_disabled_router_uses_default_model():
+    router = ModelRouter(enabled=False, routing_file=None)
+    route = router.route({'intent': 'general', 'keywords': []}, "Halo", {'greeting': {'halo'}})
+    assert route['name'] == 'default'
+    assert route['model'] == LARGE_MODEL
+
+
+def test_engine_and_router_share_greeting_vocabulary():
+    assert chatbot_engine_ai.GREETING_KEYWORDS is GREETING_KEYWORDS
+    for word in ('hey', 'hallo', 'assalamualaikum'):
+        assert KEYWORD_MATCHER.match(word)['greeting'] == {word}
@@ -0,0 +1,85 @@
+# test_price_catalog.py
+# Test PriceCatalog: lookup sama dengan scan dict lama, plus perilaku query pendek
+
+import random
+import string
+
+from price_catalog import PriceCatalog
+from price_scraper import InteriorPriceScraper
+
+
+def _scan(database, text):
+    """Lookup lama: item pertama yang namanya ada di query atau query ada di namanya"""
+    text = text.lower().strip()
+    for name in database:
+        if name in text or text in name:
+            return name
+    return None
+
+
+def _lookup(catalog, text):
+    row = catalog.lookup(text)
+    return catalog.names[row] if row is not None else None
+
+
+def test_lookup_matches_dict_scan():
+    database = InteriorPriceScraper().price_database
+    catalog = PriceCatalog.from_database(database)
+
+    queries = list(database) + [
+        'cat', 'plafon', 'kitchen', 'desain interior', 'granit lantai 60x60', 'pasang keramik',
+        'lemari pakaian 3 pintu', 'cat tembok putih', 'pintu kamar', 'lampu gantung', 'sofa',
+        'harga wallpaper dinding kamar', 'tidak ada item ini', 'xyz',
+    ]
+    for query in queries:
+        assert _lookup(catalog, query) == _scan(database, query), query
+
+
+def test_lookup_matches_dict_scan_on_large_catalog():
+    rng = random.Random(0)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 7))) for _ in range(300)]
+    database = {}
+    for i in range(3000):
+        database[' '.join(rng.sample(words, 2)) + f' {i}'] = {'min': 1, 'avg': 2, 'max': 3, 'satuan': 'm²'}
+    catalog = PriceCatalog.from_database(database)
+
+    queries = words[:60] + [' '.join(rng.sample(words, 2)) for _ in range(60)]
+    queries += [name[2:9] for name in list(database)[:60]] + ['tidak ada item ini']
+    for query in queries:
+        assert _lookup(catalog, query) == _scan(database, query), query
+
+
+def test_short_query_only_matches_name_prefix():
+    database = {
+        'marmer': {'min': 1, 'avg': 2, 'max': 3, 'satuan': 'm²'},
+        'meja': {'min': 1, 'avg': 2, 'max': 3, 'satuan': 'unit'},
+        'cat': {'min': 1, 'avg': 2, 'max': 3, 'satuan': 'm²'},
+    }
+    catalog = PriceCatalog.from_database(database)
+
+    # Perubahan yang didokumentasikan: < 3 huruf tidak dicari di tengah nama
+    assert _scan(database, 'ja') == 'meja'
+    assert _lookup(catalog, 'ja') is None
+    assert _lookup(catalog, 'me') == 'meja'
+    assert _lookup(catalog, 'ma') == 'marmer'
+    # Nama di dalam query tetap cocok
+    assert _lookup(catalog, 'cat') == 'cat'
+
+    assert catalog.lookup('') is None
+    assert catalog.lookup('   ') is None
+
+
+def test_entries_share_units_and_keep_prices():
+    catalog = PriceCatalog([
+        {'name': 'Keramik', 'min': 80000, 'avg': 150000, 'max': 300000, 'satuan': 'm²'},
+        {'name': 'Granit', 'min': 200000, 'avg': 400000, 'max': 800000, 'satuan': 'm²', 'source': 'Toko A'},
+        {'name': 'keramik', 'min': 1, 'avg': 1, 'max': 1, 'satuan': 'unit'},
+    ])
+
+    assert len(catalog) == 2
+    assert 'KERAMIK' in catalog
+    assert catalog.units == ['m²']
+    assert catalog.entry(catalog.get('keramik')).avg == 150000
+    assert catalog.entry(catalog.get('granit')).source == 'Toko A'
+    assert catalog.prices['max'].tolist() == [300000, 800000]
+    assert catalog.prefix('gr') == [1]
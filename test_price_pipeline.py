@@ -0,0 +1,184 @@
+# test_price_pipeline.py
+# Test price_pipeline: parsing harga, adapter di scraper_fixtures/, dan filter outlier
+
+import os
+
+import pytest
+
+from fuzzy_index import FuzzyIndex
+from price_catalog import PriceCatalog
+from price_pipeline import (FIXTURE_SOURCES, FIXTURES_DIR, JsonLdAdapter, PoliteFetcher, PricePipeline,
+                            SourceAdapter, build_adapters, normalize_listing_unit, parse_prices, run_sync)
+from price_stub_server import PriceStubConfig, start_price_stub_server
+
+
+def _fixture_listings(name: str, path: str):
+    adapter = {adapter.name: adapter for adapter in build_adapters(FIXTURE_SOURCES, base_url='http://stub')}[name]
+    with open(os.path.join(FIXTURES_DIR, name, path), 'rb') as f:
+        return adapter.parse(f.read(), path)
+
+
+def _pipeline(database, adapters=()):
+    catalog = PriceCatalog.from_database(database)
+    return PricePipeline(adapters, catalog, FuzzyIndex(catalog.names), PoliteFetcher(host_delay=0))
+
+
+def test_parse_prices():
+    assert parse_prices("Rp 1.250.000") == [1250000]
+    assert parse_prices("Rp 3,2 jt") == [3200000]
+    assert parse_prices("Rp 1.5 juta") == [1500000]
+    assert parse_prices("Rp 98rb") == [98000]
+    assert parse_prices("150k") == [150000]
+    assert parse_prices("Rp 285.000 - Rp 310.000") == [285000, 310000]
+    assert parse_prices("Rp 1.250.000,50") == [1250000.5]
+    assert parse_prices("Hubungi penjual") == []
+    assert parse_prices(None) == []
+
+
+def test_normalize_listing_unit():
+    assert normalize_listing_unit('/m²') == 'm2'
+    assert normalize_listing_unit('per m2') == 'm2'
+    assert normalize_listing_unit("m'") == 'm'
+    assert normalize_listing_unit('meter lari') == 'm'
+    assert normalize_listing_unit('/bh') == 'unit'
+    assert normalize_listing_unit('') == 'unit'
+
+
+def test_source_adapter_is_abstract():
+    with pytest.raises(TypeError):
+        SourceAdapter('toko', 'http://toko', ['a.html'])
+
+    class Empty(SourceAdapter):
+        pass
+
+    with pytest.raises(TypeError):
+        Empty('toko', 'http://toko', ['a.html'])
+
+
+def test_xpath_adapter_on_product_grid():
+    listings = _fixture_listings('tokobangunan', 'lantai.html')
+
+    assert len(listings) == 12
+    assert listings[0] == {'name': 'Keramik Lantai Roman 40x40 Putih Glossy', 'prices': [72500],
+                           'unit': '/m²', 'url': 'lantai.html'}
+    assert listings[3]['unit'] == '/dus'
+    assert listings[-1]['prices'] == [27000]
+
+    # Listing tanpa harga tetap dibaca (dibuang saat normalize)
+    wallpaper = _fixture_listings('tokobangunan', 'dinding.html')[5]
+    assert wallpaper['name'] == 'Wallpaper Custom Print Kamar Anak'
+    assert wallpaper['prices'] == []
+
+
+def test_xpath_adapter_on_price_table():
+    listings = _fixture_listings('katalogmaterial', 'material.html')
+
+    assert len(listings) == 11
+    assert listings[0]['name'] == 'Keramik Lantai 40x40 Standar'
+    assert listings[0]['prices'] == [65000, 85000]
+    assert listings[0]['unit'] == 'm2'
+    assert _fixture_listings('katalogmaterial', 'jasa.html')[5]['unit'] == 'meter lari'
+
+
+def test_jsonld_adapter():
+    listings = _fixture_listings('furniturhome', 'lampu.html')
+
+    assert [listing['name'] for listing in listings][:2] == ['Lampu Gantung Industrial Rotan',
+                                                           'Lampu Downlight LED 12W Inbow']
+    assert listings[1]['prices'] == [95000]
+    assert listings[1]['unit'] == 'titik'
+    assert listings[0]['unit'] == ''
+
+    wardrobe = _fixture_listings('furniturhome', 'furniture.html')[2]
+    assert wardrobe['prices'] == [9500000, 14000000]
+
+    # Mata uang lain dan JSON rusak dilewati, @graph / ItemList ikut dibaca
+    page = b'''<html><head>
+    <script type="application/ld+json">{"@graph": [{"@type": "ItemList", "itemListElement": [
+      {"@type": "ListItem", "item": {"@type": "Product", "name": "Sofa  Bed",
+       "offers": [{"lowPrice": "2500000", "highPrice": "3100000", "priceCurrency": "IDR"}]}},
+      {"@type": "ListItem", "item": {"@type": "Product", "name": "Sofa Import",
+       "offers": {"price": "900", "priceCurrency": "USD"}}}]}]}</script>
+    <script type="application/ld+json">{rusak</script>
+    </head><body></body></html>'''
+    listings = JsonLdAdapter('toko', 'http://toko', []).parse(page, 'sofa.html')
+    assert listings == [{'name': 'Sofa Bed', 'prices': [2500000, 3100000], 'unit': '', 'url': 'sofa.html'}]
+
+
+def test_normalize_filters_outliers():
+    database = {
+        'keramik': {'min': 80000, 'avg': 150000, 'max': 300000, 'satuan': 'm²', 'description': 'Keramik lantai'},
+        'granit': {'min': 200000, 'avg': 400000, 'max': 800000, 'satuan': 'm²', 'description': 'Granit'},
+    }
+    pipeline = _pipeline(database)
+
+    def listing(name, prices, unit='/m²', source='toko'):
+        return {'name': name, 'prices': prices, 'unit': unit, 'url': '', 'source': source}
+
+    listings = [
+        listing('Keramik Roman 40x40', [72500]),
+        listing('Keramik Platinum 50x50', [89900], source='katalog'),
+        listing('Keramik Mulia 60x60', [134000]),
+        listing('Keramik Lantai Standar', [85000]),
+        listing('Keramik Promo (salah input)', [1]),             # di bawah min / PLAUSIBLE_RATIO
+        listing('Keramik Premium', [5000000]),                   # di atas max × PLAUSIBLE_RATIO
+        listing('Keramik Dekorasi Handmade', [900000]),          # masuk akal, tapi di luar IQR
+        listing('Keramik KIA 30x30 (1 dus)', [58000], '/dus'),   # satuan beda
+        listing('Semen Nat 1kg', [27000], '/pcs'),               # tidak ada di katalog
+        listing('Keramik Custom', []),                           # tanpa harga
+        listing('Granite Tile 60x60', [285000, 310000]),         # sinonim, < OUTLIER_MIN_LISTINGS
+    ]
+    records, summary = pipeline.normalize(listings, {'toko': 'Toko', 'katalog': 'Katalog'})
+
+    assert summary == {'matched': 8, 'unmatched': 1, 'unit_mismatch': 1, 'no_price': 1, 'outliers': 3,
+                       'matched_by_source': {'toko': 7, 'katalog': 1}}
+
+    keramik, granit = records
+    assert keramik['name'] == 'keramik'
+    assert (keramik['min'], keramik['avg'], keramik['max']) == (72500, 87450, 134000)
+    assert keramik['listings'] == 4
+    assert keramik['satuan'] == 'm²'
+    assert keramik['description'] == 'Keramik lantai'
+    assert keramik['source'].startswith('Scraping Toko, Katalog (')
+
+    assert (granit['min'], granit['avg'], granit['max']) == (285000, 297500, 310000)
+    assert granit['listings'] == 2
+
+
+def test_pipeline_runs_against_fixture_server():
+    server = start_price_stub_server(PriceStubConfig(latency=0.0))
+    try:
+        database = {
+            'keramik': {'min': 80000, 'avg': 150000, 'max': 300000, 'satuan': 'm²', 'description': ''},
+            'lampu': {'min': 100000, 'avg': 500000, 'max': 2000000, 'satuan': 'unit', 'description': ''},
+        }
+        pipeline = _pipeline(database, build_adapters(FIXTURE_SOURCES, base_url=server.base_url))
+        records, report = run_sync(pipeline.run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report['pages'] == 7
+    assert report['failed'] == 0
+    assert report['listings'] == 60
+    assert [record['name'] for record in records] == ['keramik', 'lampu']
+    assert report['sources']['furniturhome']['matched'] == 4
+
+
+def test_jsonld_adapter_reads_shop_formatted_prices():
+    page = b'''<script type="application/ld+json">[
+      {"@type": "Product", "name": "Lemari", "offers": {"price": "Rp 1.250.000", "priceCurrency": "IDR"}},
+      {"@type": "Product", "name": "Meja", "offers": {"price": {"nilai": 1}, "priceCurrency": "IDR"}},
+      {"@type": "Product", "name": "Kursi", "offers": "Hubungi penjual"},
+      {"@type": "Product", "name": "Sofa", "offers": {"price": 1250000.5}},
+      {"@type": "Product", "name": "Rak", "offers": {"lowPrice": "285.000", "highPrice": "310000.00"}}
+    ]</script>'''
+    listings = JsonLdAdapter('toko', 'http://toko', []).parse(page, 'a.html')
+
+    # Offer yang tidak bisa dibaca dilewati, bukan seluruh halaman
+    assert {listing['name']: listing['prices'] for listing in listings} == {
+        'Lemari': [1250000],
+        'Meja': [],
+        'Sofa': [1250000.5],
+        'Rak': [285000, 310000],
+    }
@@ -0,0 +1,270 @@
+# test_rab_parser.py
+# Test RABParser: tipe kolom, agregat harga, pencarian, dan ekstraksi serial vs paralel (tanpa file PDF)
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import rab_parser
+from rab_parser import PARALLEL_MIN_PAGES, RABParser, RAB_COLUMNS
+
+
+def _parser(rows):
+    """RABParser tanpa cache disk, diisi langsung dengan baris RAB"""
+    parser = RABParser(cache_dir=None)
+    parser._append_frame(pd.DataFrame(rows, columns=RAB_COLUMNS))
+    return parser
+
+
+def test_currency_columns_keep_whole_rupiah():
+    # Di atas 2^24: float32 akan membulatkan ke kelipatan 2/4/8 rupiah
+    rows = [
+        ('PEKERJAAN STRUKTUR', 'Beton K-300', 'm3', 12.5, 16777217, 209715212.5),
+        ('PEKERJAAN STRUKTUR', 'Beton K-300', 'm3', 3, 123456789, 370370367),
+    ]
+    parser = _parser(rows)
+    frame = parser.get_frame()
+
+    for col in ('volume', 'harga_satuan', 'total'):
+        assert frame[col].dtype == np.float64
+    assert frame['harga_satuan'].tolist() == [16777217, 123456789]
+    assert frame['total'].sum() == 209715212.5 + 370370367
+
+    stats = parser.get_item_stats('beton k-300')
+    assert stats['min'] == 16777217
+    assert stats['max'] == 123456789
+    assert stats['mean'] == (16777217 + 123456789) / 2
+
+
+
+def test_category_columns_stay_categorical_across_appends():
+    parser = _parser([
+        ('PEKERJAAN LANTAI', 'Pasang keramik', 'm2', 10, 150000, 1500000),
+        ('PEKERJAAN LANTAI', 'Pasang granit', 'm2', 5, 300000, 1500000),
+    ])
+    parser._append_frame(pd.DataFrame([('PEKERJAAN PLAFON', 'Plafon gypsum', 'ls', 1, 900000, 900000),
+                                       (None, 'Nat keramik', 'm2', 10, 5000, 50000)],
+                                      columns=RAB_COLUMNS))
+    frame = parser.get_frame()
+
+    # Dokumen kedua membawa kategori/satuan baru: kolom tetap categorical, bukan object
+    for col in ('kategori', 'satuan'):
+        assert isinstance(frame[col].dtype, pd.CategoricalDtype), col
+    assert set(frame['kategori'].cat.categories) == {'PEKERJAAN LANTAI', 'PEKERJAAN PLAFON', ''}
+    assert set(frame['satuan'].cat.categories) == {'m2', 'ls'}
+    assert frame['kategori'].tolist() == ['PEKERJAAN LANTAI', 'PEKERJAAN LANTAI', 'PEKERJAAN PLAFON', '']
+    assert pd.api.types.is_string_dtype(frame['item_pekerjaan'])
+
+    assert len(parser.get_items_by_category('plafon')) == 1
+    assert parser.get_category_stats('pekerjaan lantai')['count'] == 2
+
+def test_rab_data_is_cached_until_data_changes():
+    parser = _parser([('FINISHING', 'Cat tembok interior', 'm2', 10, 35000, 350000)])
+
+    records = parser.rab_data
+    assert records is parser.rab_data
+    assert records[0]['item_pekerjaan'] == 'Cat tembok interior'
+    assert records[0]['harga_satuan'] == 35000
+
+    parser._append_frame(pd.DataFrame([('FINISHING', 'Plafon gypsum', 'm2', 5, 120000, 600000)],
+                                      columns=RAB_COLUMNS))
+    assert len(parser.rab_data) == 2
+    assert parser.rab_data is not records
+
+
+def _search_rows():
+    return [
+        ('PEKERJAAN PLAFON', 'Pasang plafon gypsum rangka hollow', 'm2', 20, 135000, 2700000),
+        ('PEKERJAAN PLAFON', 'Plafon PVC motif kayu', 'm2', 10, 160000, 1600000),
+        ('PEKERJAAN FINISHING', 'Pengecatan dinding interior 2 lapis', 'm2', 80, 32000, 2560000),
+        ('PEKERJAAN FINISHING', 'Cat tembok eksterior', 'm2', 40, 45000, 1800000),
+        ('PEKERJAAN LANTAI', 'Pasang keramik lantai 60x60', 'm2', 30, 185000, 5550000),
+    ]
+
+
+def test_search_ranks_rows_matching_most_query_tokens():
+    parser = _parser(_search_rows())
+
+    # Baris yang cocok dengan semua token query saja, skor tertinggi dulu
+    assert parser.search_rows('plafon gypsum').tolist() == [0]
+    assert parser.search_rows('plafon').tolist() == [0, 1]
+
+    # Typo & substring tetap ketemu ("plafond" → plafon, "cat" di "pengecatan")
+    assert parser.search_rows('plafond').tolist() == [0, 1]
+    assert set(parser.search_rows('cat').tolist()) == {2, 3}
+    assert parser.search_rows('cat').tolist()[0] == 3
+
+    assert not len(parser.search_rows('xyzzy'))
+    assert not len(parser.search_rows(''))
+
+
+
+def _baseline_search(frame, keyword):
+    """Pencarian lama: substring di nama item atau kategori"""
+    mask = frame['item_pekerjaan'].str.contains(keyword, case=False, regex=False) | \
+        frame['kategori'].astype(str).str.contains(keyword, case=False, regex=False)
+    return set(np.flatnonzero(mask.to_numpy()))
+
+
+def test_search_still_finds_baseline_matches():
+    parser = _parser(_search_rows())
+    frame = parser.get_frame()
+
+    for keyword in ('plafon', 'PLAFON', 'asang', 'cat', 'at', 'ap', '60x60', 'x6', 'tembok eks', 'finishing'):
+        expected = _baseline_search(frame, keyword)
+        assert expected, keyword
+        # Index boleh lebih ketat (hanya baris paling relevan), tapi tetap menemukan baris yang sama
+        assert set(parser.search_rows(keyword)) & expected, keyword
+        assert parser.get_price_estimate(keyword)['found'], keyword
+
+    # Potongan kata pendek tidak cocok dengan token manapun: hasil sama dengan pencarian lama
+    assert set(parser.search_rows('at')) == _baseline_search(frame, 'at') == {2, 3}
+    assert list(parser.search_items('at').index) == [2, 3]
+    estimate = parser.get_price_estimate('at')
+    assert estimate['count'] == 2
+    assert estimate['min_price_per_unit'] == 32000
+    assert not parser.get_price_estimate('zzz')['found']
+
+def test_search_limit_matches_full_ranking():
+    rows = _search_rows() * 40
+    parser = _parser(rows)
+    index = parser._index
+
+    for query in ('pekerjaan plafon', 'cat', 'pasang', 'pekerjaan'):
+        row_ids, scores = index.search(query)
+        for limit in (1, 5, 17, len(row_ids), len(row_ids) + 3):
+            top_ids, top_scores = index.search(query, limit)
+            assert top_ids.tolist() == row_ids[:limit].tolist()
+            assert top_scores.tolist() == scores[:limit].tolist()
+
+    estimate = parser.get_price_estimate('plafon gypsum hollow')
+    assert estimate['count'] == 40
+    assert len(estimate['items']) == 5
+
+
+def test_search_memo_is_bounded():
+    parser = _parser(_search_rows())
+    index = parser._index
+    index.MEMO_SIZE = 8
+
+    for i in range(50):
+        index.search(f'plafon{i} keramik')
+
+    assert len(index._matches) <= 8
+    assert len(index._arrays) <= 8
+    assert parser.search_rows('keramik').tolist() == [4]
+
+
+def _blocks_while_locked(lock, target) -> bool:
+    """True jika target() menunggu selama lock dipegang thread lain"""
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (target(), done.set()))
+    with lock:
+        thread.start()
+        blocked = not done.wait(0.2)
+    thread.join(5)
+    return blocked and done.is_set()
+
+
+def test_shared_memos_are_written_under_lock():
+    parser = _parser(_search_rows())
+    index = parser._index
+
+    assert _blocks_while_locked(index._memo_lock, lambda: index.search('gypsum'))
+    assert _blocks_while_locked(parser._estimates_lock, lambda: parser.get_price_estimate('plafon pvc'))
+
+
+def test_concurrent_searches_keep_memos_bounded():
+    parser = _parser(_search_rows())
+    index = parser._index
+    index.MEMO_SIZE = 4
+    queries = [f'keramik{i} plafon' for i in range(13)]
+    expected = {query: _parser(_search_rows()).search_rows(query).tolist() for query in queries}
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(200):
+                query = queries[(i + offset) % len(queries)]
+                assert parser.search_rows(query).tolist() == expected[query]
+                parser.get_price_estimate(f'cat {i % 7}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(index._matches) <= 4
+    assert len(index._arrays) <= 4
+
+
+class _FakePage:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def extract_tables(self):
+        return self.tables
+
+
+class _FakePdf:
+    """Pengganti objek pdfplumber.open() dengan tabel per halaman yang sudah jadi"""
+
+    def __init__(self, page_tables):
+        self.pages = [_FakePage(tables) for tables in page_tables]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _page_tables():
+    """
+    Tabel per halaman: header kategori hanya di beberapa halaman, halaman lain
+    melanjutkan kategori sebelumnya (termasuk halaman tanpa tabel dan tabel kosong)
+    """
+    categories = {0: 'I PEKERJAAN PERSIAPAN', 4: 'II PEKERJAAN LANTAI', 9: 'III PEKERJAAN PLAFON'}
+    pages = []
+    for page in range(2 * PARALLEL_MIN_PAGES):
+        if page == 6:
+            pages.append([])
+            continue
+        table = []
+        if page in categories:
+            table.append([categories[page], '', '', '', ''])
+        table.append(['1', f'Item halaman {page} a', 'm2', '2', f'{(page + 1) * 1000}'])
+        second = [['2', f'Item halaman {page} b', 'ls', '1', '500']]
+        pages.append([table, [], second])
+    return pages
+
+
+def test_parallel_extraction_matches_serial(monkeypatch):
+    pdf = _FakePdf(_page_tables())
+    monkeypatch.setattr(rab_parser.pdfplumber, 'open', lambda path: pdf)
+    # Worker thread: fake PDF tidak perlu di-pickle, urutan penggabungan tetap diuji
+    monkeypatch.setattr(rab_parser, 'ProcessPoolExecutor', ThreadPoolExecutor)
+
+    parser = RABParser(cache_dir=None)
+    serial = parser._extract_rows('bq.pdf', workers=1)
+    parallel = parser._extract_rows('bq.pdf', workers=3)
+
+    assert parallel == serial
+    assert [row['item_pekerjaan'] for row in serial] == [
+        f'Item halaman {page} {part}'
+        for page in range(2 * PARALLEL_MIN_PAGES) if page != 6 for part in 'ab'
+    ]
+
+    # Kategori dibawa lintas tabel & halaman sampai ada header baru
+    categories = {row['item_pekerjaan']: row['kategori'] for row in serial}
+    assert categories['Item halaman 0 b'] == 'PEKERJAAN PERSIAPAN'
+    assert categories['Item halaman 3 b'] == 'PEKERJAAN PERSIAPAN'
+    assert categories['Item halaman 4 a'] == 'PEKERJAAN LANTAI'
+    assert categories['Item halaman 7 a'] == 'PEKERJAAN LANTAI'
+    assert categories[f'Item halaman {2 * PARALLEL_MIN_PAGES - 1} b'] == 'PEKERJAAN PLAFON'
@@ -0,0 +1,72 @@
+# test_response_cache.py
+# Test ResponseCache: TTL memory + disk, promosi dari disk, dan pembersihan file disk
+
+import json
+import os
+
+import response_cache
+from response_cache import ResponseCache
+
+
+class _Clock:
+    """Pengganti time.time() yang bisa dimajukan manual"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(tmp_path, monkeypatch, ttl=100):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache.time, 'time', clock)
+    return ResponseCache(ttl=ttl, max_entries=8, disk_dir=str(tmp_path)), clock
+
+
+def test_memory_entry_expires_after_ttl(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch)
+    cache.set('k', 'jawaban')
+
+    clock.now += 99
+    assert cache.get('k') == 'jawaban'
+    clock.now += 2
+    assert cache.get('k') is None
+
+
+def test_disk_promotion_keeps_original_expiry(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch)
+    cache.set('k', 'harga lama')
+
+    # Proses baru: memory kosong, entry diambil dari disk
+    clock.now += 60
+    restarted = ResponseCache(ttl=100, max_entries=8, disk_dir=str(tmp_path))
+    assert restarted.get('k') == 'harga lama'
+    assert restarted._entries['k'][0] == 1100.0
+
+    # Promosi tidak memperpanjang umur entry
+    clock.now += 41
+    assert restarted.get('k') is None
+
+
+def test_expired_disk_entry_is_deleted(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch)
+    cache.set('k', 'jawaban')
+    path = cache._disk_path('k')
+
+    clock.now += 101
+    restarted = ResponseCache(ttl=100, max_entries=8, disk_dir=str(tmp_path))
+    assert restarted.get('k') is None
+    assert not os.path.exists(path)
+
+
+def test_corrupt_disk_entry_is_deleted(tmp_path, monkeypatch):
+    cache, _ = _cache(tmp_path, monkeypatch)
+    for key, content in (('rusak', '{bukan json'), ('tanpa_value', json.dumps({'expires': 5000}))):
+        with open(cache._disk_path(key), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        assert cache.get(key) is None
+        assert not os.path.exists(cache._disk_path(key))
+
+    assert cache.get_stats()['misses'] == 2
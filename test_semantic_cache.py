@@ -0,0 +1,76 @@
+# test_semantic_cache.py
+# Test SemanticCache: pertanyaan mirip, scope, ring buffer, dan similarity TF-IDF
+
+import numpy as np
+
+from semantic_cache import SemanticCache
+
+
+def test_similar_question_hits_within_same_scope_only():
+    cache = SemanticCache(threshold=0.85)
+    cache.add("harga keramik per meter berapa?", "interior_price|v1", "KERAMIK")
+
+    assert cache.lookup("berapa harga keramik per meter?", "interior_price|v1") == "KERAMIK"
+    assert cache.lookup("harga granit per meter berapa?", "interior_price|v1") is None
+    assert cache.lookup("berapa harga keramik per meter?", "interior_price|v2") is None
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_ring_buffer_overwrites_oldest_slot():
+    cache = SemanticCache(threshold=0.85, capacity=2)
+    cache.add("harga keramik per meter", "s", "KERAMIK")
+    cache.add("harga granit per meter", "s", "GRANIT")
+    cache.add("harga parket per meter", "s", "PARKET")
+
+    assert cache.lookup("harga keramik per meter", "s") is None
+    assert cache.lookup("harga granit per meter", "s") == "GRANIT"
+    assert cache.lookup("harga parket per meter", "s") == "PARKET"
+    assert cache.get_stats()['size'] == 2
+
+
+def test_similarity_matches_normalized_tfidf():
+    cache = SemanticCache(capacity=8)
+    questions = ["harga keramik per meter", "harga granit per meter", "paket kamar tidur", "cat tembok"]
+    for question in questions:
+        cache.add(question, "s", question)
+
+    query = cache._vectorize("harga keramik permeter")
+    idf = cache._idf()
+    matrix = cache._tf[:len(questions)] * idf
+    expected = (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)) @ (query * idf / np.linalg.norm(query * idf))
+
+    rows = np.arange(len(questions))
+    assert np.allclose(cache._similarity(query, rows), expected, atol=1e-5)
+    assert np.allclose(cache._similarity(query, rows[1:3]), expected[1:3], atol=1e-5)
+
+
+def _scope(intent, keywords, question):
+    return SemanticCache.make_scope(intent, keywords, question, "v1")
+
+
+def test_paraphrase_hits_after_filler_words_are_dropped():
+    cache = SemanticCache()
+    question = "harga granit per meter?"
+    cache.add(question, _scope('interior_price', ['granit'], question), "GRANIT")
+
+    for paraphrase in ("granit permeter berapa ya", "berapa harga granit per meter?", "Harga granit per meter dong"):
+        assert cache.lookup(paraphrase, _scope('interior_price', ['granit'], paraphrase)) == "GRANIT", paraphrase
+
+    other = "harga granit per lembar"
+    assert cache.lookup(other, _scope('interior_price', ['granit'], other)) is None
+
+
+def test_numbers_and_keywords_are_part_of_the_scope():
+    cache = SemanticCache()
+    question = "berapa lama renovasi rumah 3 lantai?"
+    cache.add(question, _scope('rab_query', ['lantai'], question), "TIGA LANTAI")
+
+    two_floors = "berapa lama renovasi rumah 2 lantai?"
+    assert _scope('rab_query', ['lantai'], two_floors) != _scope('rab_query', ['lantai'], question)
+    assert cache.lookup(two_floors, _scope('rab_query', ['lantai'], two_floors)) is None
+    assert cache.lookup("renovasi rumah 3 lantai berapa lama", _scope(
+        'rab_query', ['lantai'], "renovasi rumah 3 lantai berapa lama")) == "TIGA LANTAI"
+
+    # Keyword berbeda → scope berbeda, walau kalimatnya mirip
+    assert _scope('interior_price', ['Granit'], "x") == _scope('interior_price', ['granit', 'granit'], "x")
+    assert _scope('interior_price', ['keramik'], "x") != _scope('interior_price', ['granit'], "x")
@@ -0,0 +1,67 @@
+# test_welcome_message.py
+# Test WelcomeMessageCache: template langsung dipakai, pesan AI di-generate di background
+
+import threading
+
+from welcome_message import WelcomeMessageCache
+
+
+def _wait_for(condition, timeout=2.0):
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        event.wait(0.01)
+    return condition()
+
+
+def test_get_returns_template_without_waiting_for_generate():
+    release = threading.Event()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        release.wait(2)
+        return "Pesan AI"
+
+    cache = WelcomeMessageCache(refresh_interval=0)
+    assert cache.get("v1", generate, lambda: "Template") == "Template"
+    assert cache.get("v1", generate, lambda: "Template") == "Template"
+    assert cache.get_stats()['is_fallback']
+
+    release.set()
+    assert _wait_for(lambda: cache.get("v1", generate, lambda: "Template") == "Pesan AI")
+    assert len(calls) == 1
+    assert not cache.get_stats()['is_fallback']
+
+
+def test_failed_generate_keeps_template():
+    def generate():
+        raise TimeoutError("deadline")
+
+    cache = WelcomeMessageCache(refresh_interval=0)
+    assert cache.get("v1", generate, lambda: "Template") == "Template"
+    assert _wait_for(lambda: not cache._generating)
+    assert cache.get("v1", generate, lambda: "Template") == "Template"
+    assert cache.get_stats()['is_fallback']
+
+
+def test_new_version_during_generate_is_generated_again():
+    release = threading.Event()
+    versions = []
+
+    def generate_for(version):
+        def generate():
+            versions.append(version)
+            if version == "v1":
+                release.wait(2)
+            return f"Pesan {version}"
+        return generate
+
+    cache = WelcomeMessageCache(refresh_interval=0)
+    cache.get("v1", generate_for("v1"), lambda: "Template")
+    assert cache.get("v2", generate_for("v2"), lambda: "Template") == "Template"
+
+    release.set()
+    assert _wait_for(lambda: cache.get("v2", generate_for("v2"), lambda: "Template") == "Pesan v2")
+    assert versions == ["v1", "v2"]
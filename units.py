@@ -0,0 +1,26 @@
+# units.py
+# Normalisasi satuan (m2, m', unit, ls, dll) yang dipakai BoQ estimator & pipeline scraping harga
+
+import re
+from typing import Optional
+
+# Variasi penulisan satuan → satuan baku
+UNIT_ALIASES = {
+    'm2': 'm2', 'm²': 'm2', 'm^2': 'm2', 'meterpersegi': 'm2', 'mpersegi': 'm2',
+    'm3': 'm3', 'm³': 'm3', 'm^3': 'm3', 'meterkubik': 'm3',
+    'm': 'm', 'm1': 'm', "m'": 'm', 'meter': 'm', 'meterlari': 'm', 'mlari': 'm', 'lm': 'm',
+    'unit': 'unit', 'bh': 'unit', 'buah': 'unit', 'pcs': 'unit', 'psc': 'unit',
+    'titik': 'titik', 'ttk': 'titik',
+    'ls': 'ls', 'lumpsum': 'ls', 'lot': 'ls',
+    'set': 'set', 'kg': 'kg', 'lembar': 'lembar', 'lbr': 'lembar',
+}
+
+
+def normalize_unit(unit: Optional[str]) -> str:
+    """Satuan baku ('' jika satuan kosong = terima satuan apapun)"""
+    if not unit:
+        return ''
+    cleaned = re.sub(r'[\s.]', '', str(unit).lower())
+    if cleaned.startswith('per'):
+        cleaned = cleaned[3:]
+    return UNIT_ALIASES.get(cleaned, cleaned)
@@ -0,0 +1,202 @@
+# welcome_message.py
+# Welcome message yang di-generate sekali per proses lalu dipakai semua sesi baru
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+# Pesan yang dipakai untuk minta AI memperkenalkan diri
+WELCOME_PROMPT = "Hai, perkenalkan dirimu singkat dan layanan PT Intervisual"
+
+# Interval refresh di background dalam detik (0 = tidak pernah refresh)
+DEFAULT_REFRESH_INTERVAL = int(os.getenv("WELCOME_REFRESH_INTERVAL", "21600"))
+
+# Jika generate gagal (pakai template), coba lagi lebih cepat
+FALLBACK_RETRY_INTERVAL = 300
+
+
+def render_fallback_welcome(company_info: Mapping) -> str:
+    """Welcome message dari template (dipakai jika Groq belum/tidak bisa dipanggil)"""
+    layanan = "\n".join(f"• {item['nama']}" for item in company_info['layanan_utama'])
+    return (
+        f"Halo! 👋 Saya asisten virtual {company_info['nama_perusahaan']}, "
+        f"{company_info['bidang_usaha'].lower()} dengan {company_info['pengalaman'].lower()}.\n\n"
+        f"Layanan kami:\n{layanan}\n\n"
+        "Silakan tanya seputar harga konstruksi, material interior, atau paket ruangan. "
+        f"Konsultasi GRATIS via WhatsApp {company_info['kontak']['whatsapp']} 😊"
+    )
+
+
+class WelcomeMessageCache:
+    """
+    Cache welcome message per versi data perusahaan
+
+    - Sesi baru langsung dapat pesan dari cache (tanpa panggil Groq)
+    - Cache kosong / versi berubah: template langsung dipakai, pesan AI
+      di-generate sekali di thread background lalu menggantikannya
+    - Thread background me-refresh pesan secara berkala
+    - Jika Groq gagal, template tetap dipakai dan dicoba lagi di refresh berikutnya
+    - `generate` sebaiknya tidak terikat ke sesi (mis. functools.partial dari
+      fungsi modul), karena disimpan selama proses berjalan
+    """
+
+    def __init__(self, refresh_interval: int = DEFAULT_REFRESH_INTERVAL):
+        """
+        Args:
+            refresh_interval: Interval refresh background dalam detik (0 = mati)
+        """
+        self.refresh_interval = refresh_interval
+
+        self._version: Optional[str] = None
+        self._message: Optional[str] = None
+        self._is_fallback = False
+        self._generate: Callable[[], str] = None
+        self._fallback: Callable[[], str] = None
+        self.generated_at = 0.0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread: threading.Thread = None
+        self._generating = False
+
+        self.generations = 0
+
+    def get(self, version: str, generate: Callable[[], str], fallback: Callable[[], str]) -> str:
+        """
+        Ambil welcome message untuk versi data ini
+
+        Tidak pernah menunggu Groq: jika pesan untuk versi ini belum ada,
+        template dari `fallback` langsung dikembalikan dan `generate` dijalankan
+        di thread background.
+
+        Args:
+            version: Versi data perusahaan (pesan di-generate ulang jika berubah)
+            generate: Fungsi yang memanggil AI untuk membuat pesan (tanpa state sesi)
+            fallback: Fungsi template (dipakai selama / jika AI gagal)
+
+        Returns:
+            Welcome message
+        """
+        message = self._message
+        if message is not None and self._version == version:
+            return message
+
+        with self._lock:
+            if self._message is None or self._version != version:
+                self._generate = generate
+                self._fallback = fallback
+                self._message, self._is_fallback = fallback(), True
+                self._version = version
+                self.generated_at = time.time()
+
+            message = self._message
+
+        self._start_generation()
+        self._start_refresh()
+        return message
+
+    def refresh(self):
+        """Generate ulang pesan untuk versi saat ini (dipanggil thread background)"""
+        with self._lock:
+            if self._generating:
+                return
+            self._generating = True
+
+        try:
+            while True:
+                with self._lock:
+                    version, generate, fallback = self._version, self._generate, self._fallback
+                if generate is None or version is None:
+                    return
+
+                message, is_fallback = self._create(generate, fallback)
+
+                with self._lock:
+                    # Versi berubah selama generate: ulangi untuk versi yang baru
+                    if self._version != version:
+                        continue
+                    # Jangan timpa pesan bagus dengan template
+                    if not (is_fallback and not self._is_fallback):
+                        self._message, self._is_fallback = message, is_fallback
+                        self.generated_at = time.time()
+                    return
+        finally:
+            with self._lock:
+                self._generating = False
+
+    def clear(self):
+        """Hapus pesan tersimpan (sesi berikutnya akan generate ulang)"""
+        with self._lock:
+            self._version = None
+            self._message = None
+            self._is_fallback = False
+
+    def stop(self):
+        """Hentikan thread refresh background"""
+        self._stop.set()
+
+    def _create(self, generate: Callable[[], str], fallback: Callable[[], str]):
+        """Generate pesan lewat AI, fallback ke template jika gagal"""
+        try:
+            message = generate()
+            if message and message.strip():
+                self.generations += 1
+                return message, False
+            raise ValueError("Response kosong")
+        except Exception as e:
+            print(f"⚠️ Warning: Gagal generate welcome message, pakai template: {e}")
+            return fallback(), True
+
+    def _start_generation(self):
+        """Generate pesan AI di thread background jika yang dipakai masih template"""
+        with self._lock:
+            if not self._is_fallback or self._generating:
+                return
+        threading.Thread(target=self.refresh, name="welcome-generate", daemon=True).start()
+
+    def _start_refresh(self):
+        """Jalankan thread refresh background (sekali per cache)"""
+        if self.refresh_interval <= 0 or self._refresh_thread is not None:
+            return
+
+        with self._lock:
+            if self._refresh_thread is None:
+                self._refresh_thread = threading.Thread(
+                    target=self._refresh_loop, name="welcome-refresh", daemon=True
+                )
+                self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self._next_wait()):
+            self.refresh()
+
+    def _next_wait(self) -> float:
+        if self._is_fallback:
+            return min(self.refresh_interval, FALLBACK_RETRY_INTERVAL)
+        return self.refresh_interval
+
+    def get_stats(self) -> Dict:
+        """Info pesan yang sedang dipakai"""
+        return {
+            'version': self._version,
+            'is_fallback': self._is_fallback,
+            'generated_at': self.generated_at,
+            'generations': self.generations,
+        }
+
+
+_welcome_cache = None
+_welcome_cache_lock = threading.Lock()
+
+
+def get_welcome_cache() -> WelcomeMessageCache:
+    """Ambil welcome message cache bersama (satu per proses, dipakai semua sesi)"""
+    global _welcome_cache
+
+    if _welcome_cache is None:
+        with _welcome_cache_lock:
+            if _welcome_cache is None:
+                _welcome_cache = WelcomeMessageCache()
+
+    return _welcome_cache